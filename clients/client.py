@@ -5,12 +5,43 @@ The classes do not have privat values and setter and getter methods!
 """
 
 from decimal import Decimal
-import json
+from general import schema
+from general.tracking import Tracked
 
 
-class Client(object):
+class Client(Tracked):
     """This class holds the detailed client information."""
 
+    __slots__ = (
+        'client_id', 'company', 'company_b', 'attention', 'salutation', 'name',
+        'family_name', 'street', 'post_code', 'city', 'country', 'tax_id',
+        'additional_a', 'additional_b', 'additional_c', 'language',
+        '_def_wage', 'def_commodity'
+    )
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('client_id', 'client_id', None),
+        ('company', 'company', None),
+        ('company_b', 'company_b', None),
+        ('attention', 'attention', None),
+        ('salutation', 'salutation', None),
+        ('name', 'name', None),
+        ('family_name', 'family_name', None),
+        ('street', 'street', None),
+        ('post_code', 'post_code', None),
+        ('city', 'city', None),
+        ('country', 'country', None),
+        ('tax_id', 'tax_id', None),
+        ('additional_a', 'additional_a', None),
+        ('additional_b', 'additional_b', None),
+        ('additional_c', 'additional_c', None),
+        ('language', 'language', None),
+        ('def_wage', '_def_wage', 'str'),
+        ('def_commodity', 'def_commodity', None),
+        ('version', 'get_version', None)
+    )
+
     def __init__(
         self,
         client_id=None,
@@ -30,7 +61,8 @@ class Client(object):
         additional_c=None,
         language=None,
         def_wage=None,
-        def_commodity=None
+        def_commodity=None,
+        version=None
     ):
         """Initialize the class."""
         self.client_id = 'no_id' if client_id is None else str(client_id)
@@ -52,6 +84,7 @@ class Client(object):
         self._def_wage = Decimal('0.00')            # set default
         self.set_def_wage(def_wage)                 # try to set arguments value
         self.def_commodity = '$' if def_commodity is None else str(def_commodity)
+        self.set_version(version)                   # try to set arguments value
 
     def set_def_wage(self, value):
         """Set def_wage."""
@@ -73,39 +106,11 @@ class Client(object):
 
     def to_dict(self):
         """Convert object to dict."""
-        out = {}
-
-        # fetch all variables
-        out['type'] = self.__class__.__name__
-        out['client_id'] = self.client_id
-        out['company'] = self.company
-        out['company_b'] = self.company_b
-        out['attention'] = self.attention
-        out['salutation'] = self.salutation
-        out['name'] = self.name
-        out['family_name'] = self.family_name
-        out['street'] = self.street
-        out['post_code'] = self.post_code
-        out['city'] = self.city
-        out['country'] = self.country
-        out['tax_id'] = self.tax_id
-        out['additional_a'] = self.additional_a
-        out['additional_b'] = self.additional_b
-        out['additional_c'] = self.additional_c
-        out['language'] = self.language
-        out['def_wage'] = str(self._def_wage)
-        out['def_commodity'] = self.def_commodity
-
-        return out
+        return schema.encode(self, self.FIELDS)
 
     def to_json(self, indent=2, ensure_ascii=False):
         """Convert variables data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
+        return schema.dumps(self.to_dict(), indent=indent, ensure_ascii=ensure_ascii)
 
     @classmethod
     def from_json(cls, js=None):
@@ -113,127 +118,17 @@ class Client(object):
         if js is None:
             return cls()
 
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
-
-        # create new entry object from json
-        if 'client_id' in js.keys():
-            client_id = js['client_id']
-        else:
-            client_id = None
-
-        if 'company' in js.keys():
-            company = js['company']
-        else:
-            company = None
-
-        if 'company_b' in js.keys():
-            company_b = js['company_b']
-        else:
-            company_b = None
-
-        if 'attention' in js.keys():
-            attention = js['attention']
-        else:
-            attention = None
-
-        if 'salutation' in js.keys():
-            salutation = js['salutation']
-        else:
-            salutation = None
-
-        if 'name' in js.keys():
-            name = js['name']
-        else:
-            name = None
-
-        if 'family_name' in js.keys():
-            family_name = js['family_name']
-        else:
-            family_name = None
-
-        if 'street' in js.keys():
-            street = js['street']
-        else:
-            street = None
-
-        if 'post_code' in js.keys():
-            post_code = js['post_code']
-        else:
-            post_code = None
-
-        if 'city' in js.keys():
-            city = js['city']
-        else:
-            city = None
-
-        if 'country' in js.keys():
-            country = js['country']
-        else:
-            country = None
-
-        if 'tax_id' in js.keys():
-            tax_id = js['tax_id']
-        else:
-            tax_id = None
-
-        if 'additional_a' in js.keys():
-            additional_a = js['additional_a']
-        else:
-            additional_a = None
-
-        if 'additional_b' in js.keys():
-            additional_b = js['additional_b']
-        else:
-            additional_b = None
-
-        if 'additional_c' in js.keys():
-            additional_c = js['additional_c']
-        else:
-            additional_c = None
-
-        if 'language' in js.keys():
-            language = js['language']
-        else:
-            language = None
-
-        if 'def_wage' in js.keys():
-            def_wage = js['def_wage']
-        else:
-            def_wage = None
-
-        if 'def_commodity' in js.keys():
-            def_commodity = js['def_commodity']
-        else:
-            def_commodity = None
-
-        # return new object
-        return cls(
-            client_id=client_id,
-            company=company,
-            company_b=company_b,
-            salutation=salutation,
-            attention=attention,
-            name=name,
-            family_name=family_name,
-            street=street,
-            post_code=post_code,
-            city=city,
-            country=country,
-            tax_id=tax_id,
-            additional_a=additional_a,
-            additional_b=additional_b,
-            additional_c=additional_c,
-            language=language,
-            def_wage=def_wage,
-            def_commodity=def_commodity
-        )
+        # get js as dict or return default object
+        js = schema.load_dict(js)
+        if js is None:
+            return cls()
+
+        # create object from json
+        return cls(**schema.decode(js, cls.FIELDS))
 
     def copy(self):
         """Return copy of own object as new object."""
-        return Client().from_json(js=self.to_json())
+        return self.structural_copy()
+
+
+schema.register(Client)
@@ -6,11 +6,17 @@ for the project_title, while it keeps beeing unique according to the
 project_id.
 """
 
+import bisect
 from clients.client import Client
 from clients.project import Project
+from clients.storage import FileStorage
+from clients.storage import get_storage
+from general.watcher import SHARD_PREFIX
 from general.settings import Settings
+from offer.offerinvoice import get_invoice_revision
+from offer.offerinvoice import Invoice
+from offer.offerinvoice import Offer
 import os
-import shutil
 
 
 class List(object):
@@ -22,7 +28,9 @@ class List(object):
         client_dir='/clients',
         client_list=None,
         project_dir='/projects',
-        project_list=None
+        project_list=None,
+        storage=None,
+        lazy=False
     ):
         """Initialize the class."""
         self.data_path = data_path
@@ -31,36 +39,180 @@ class List(object):
         if not is_dir:
             raise IOError
 
-        self.client_dir = client_dir
-        self.client_list = (self.load_client_list_from_file() if client_list is None
-                            else client_list)
+        # the backend for loading and saving clients and projects
+        self.storage = FileStorage(data_path=data_path) if storage is None else storage
+
+        # load only the projects index and their offers and invoices on demand
+        self.lazy = lazy
 
+        self.client_dir = client_dir
         self.project_dir = project_dir
-        self.project_list = (self.load_project_list_from_file() if project_list is None
-                             else project_list)
+
+        # load both together, so that they fit even while others write
+        if client_list is None or project_list is None:
+            loaded = self.storage.read(load=self.load_lists_from_file)
+
+        self.client_list = loaded[0] if client_list is None else client_list
+        self.project_list = loaded[1] if project_list is None else project_list
 
         self.inactive_list = None
 
+        # unpaid invoices sorted by due date, build on first request
+        self.unpaid_keys = None
+        self.unpaid_items = None
+        self.unpaid_projects = None
+        self.unpaid_counter = 0
+        self.unpaid_revision = None
+
+        # files, which changed outside and conflict with unsaved changes
+        self.file_conflicts = []
+
+        # lazy projects, which could not be loaded on demand
+        self.load_failures = []
+
+        # dicts for finding clients and projects by their ID
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """
+        Build the dicts for finding clients and projects by their ID.
+
+        The methods of the list keep the dicts up to date themselves. Code,
+        which changes client_list or project_list directly, has to call
+        this afterwards.
+        """
+        # the file names (without ending) lead to the IDs as well
+        self.client_index = {}
+        self.client_positions = {}
+        self.client_files = {}
+        for i, c in enumerate(self.client_list):
+            self.client_index.setdefault(c.client_id, c)
+            self.client_positions.setdefault(c.client_id, i)
+            self.client_files.setdefault(self.us(c.client_id), c.client_id)
+
+        self.project_index = {}
+        self.project_positions = {}
+        self.project_files = {}
+        self.client_projects = {}
+        for i, p in enumerate(self.project_list):
+            self.project_index.setdefault(p.project_id(), p)
+            self.project_positions.setdefault(p.project_id(), i)
+            self.project_files.setdefault(self.us(p.project_id()), p.project_id())
+            self.client_projects.setdefault(p.client_id, []).append(p)
+
+        # projects could be replaced or removed
+        self.sync_unpaid()
+
+    def index_client(self, client=None, position=None):
+        """Add the client at the position of the client_list to the dicts."""
+        self.client_index.setdefault(client.client_id, client)
+        self.client_positions.setdefault(client.client_id, position)
+        self.client_files.setdefault(self.us(client.client_id), client.client_id)
+
+    def unindex_client(self, client_id=None):
+        """Remove the client with the ID from the dicts and return its position."""
+        del self.client_index[client_id]
+        if self.client_files.get(self.us(client_id)) == client_id:
+            del self.client_files[self.us(client_id)]
+        return self.client_positions.pop(client_id)
+
+    def pop_client(self, client_id=None):
+        """Pop the client with the ID from the client_list and the dicts."""
+        position = self.unindex_client(client_id)
+        client = self.client_list.pop(position)
+
+        # the clients behind it move up
+        for c in self.client_list[position:]:
+            self.client_positions[c.client_id] -= 1
+
+        return client
+
+    def index_project(self, project=None, position=None):
+        """Add the project at the position of the project_list to the dicts."""
+        self.project_index.setdefault(project.project_id(), project)
+        self.project_positions.setdefault(project.project_id(), position)
+        self.project_files.setdefault(self.us(project.project_id()), project.project_id())
+
+        # keep the projects of the client in the order of the list
+        projects = self.client_projects.setdefault(project.client_id, [])
+        i = len(projects)
+        while i > 0 and self.project_positions[projects[i - 1].project_id()] > position:
+            i -= 1
+        projects.insert(i, project)
+
+        self.refresh_unpaid(project)
+
+    def unindex_project(self, project=None, project_id=None, client_id=None):
+        """Remove the project with its (maybe old) IDs from the dicts."""
+        del self.project_index[project_id]
+        position = self.project_positions.pop(project_id)
+        if self.project_files.get(self.us(project_id)) == project_id:
+            del self.project_files[self.us(project_id)]
+
+        projects = self.client_projects.get(client_id, [])
+        for i, p in enumerate(projects):
+            if p is project:
+                del projects[i]
+                break
+        if not projects:
+            self.client_projects.pop(client_id, None)
+
+        if self.unpaid_keys is not None and id(project) in self.unpaid_projects:
+            self.remove_unpaid(id(project))
+
+        return position
+
+    def pop_project(self, project_id=None):
+        """Pop the project with the ID from the project_list and the dicts."""
+        project = self.project_list[self.project_positions[project_id]]
+        position = self.unindex_project(project, project_id, project.client_id)
+        self.project_list.pop(position)
+
+        # the projects behind it move up
+        for p in self.project_list[position:]:
+            self.project_positions[p.project_id()] -= 1
+
+        return project
+
+    def replace_project(self, position=None, project=None):
+        """Put the project at the position of the project_list."""
+        old = self.project_list[position]
+        self.unindex_project(old, old.project_id(), old.client_id)
+        self.project_list[position] = project
+        self.index_project(project, position)
+
+    def get_owner(self, item=None):
+        """
+        Return (project, client) of the offer / invoice.
+
+        The offers and invoices know their project (see Tracked.get_owner()),
+        which the list methods of the project keep up to date, and the
+        project has to be in this list. Returns (None, None) otherwise.
+        """
+        project = item.get_owner() if isinstance(item, (Offer, Invoice)) else None
+        if project is None or self.project_index.get(project.project_id()) is not project:
+            return (None, None)
+
+        return (project, self.client_index.get(project.client_id))
+
     def client_exists(self, client=None):
         """Check if client exists according to the ID."""
         if type(client) is Client:
-            return client.client_id in [c.client_id for c in self.client_list]
+            return client.client_id in self.client_index
         else:
             return False
 
     def get_client_index(self, client=None):
         """Get the index of the client."""
         if type(client) is Client:
-            for i, c in enumerate(self.client_list):
-                if client.client_id == c.client_id:
-                    return i
+            return self.client_positions.get(client.client_id, False)
 
         return False
 
     def add_client(self, client=None, activate=False):
         """Add a client, if its ID does not already exist."""
         is_client = type(client) is Client
-        id_exists = client.client_id in [c.client_id for c in self.client_list]
+        id_exists = self.client_exists(client)
         id_exists_inactive = (
             self.inactive_list.client_exists(client)
             if not activate
@@ -74,6 +226,7 @@ class List(object):
 
         # append the client and save it immediately
         self.client_list.append(client)
+        self.index_client(client, len(self.client_list) - 1)
         self.save_client_to_file(client=client)
 
         return True
@@ -96,7 +249,10 @@ class List(object):
 
         # only go on, if the ID is possible
         if id_available:
+            # the new client replaces the old one also for merging
+            new_client.take_saved_state(self.client_list[old_index])
             self.client_list[old_index] = new_client
+            self.client_index[new_client.client_id] = new_client
             return True
         else:
             return False
@@ -110,7 +266,7 @@ class List(object):
             return False
 
         # check id
-        id_exists = client_id in [c.client_id for c in self.client_list]
+        id_exists = client_id in self.client_index
         id_is_empty = client_id == ''
         id_is_own = client.client_id == client_id
 
@@ -122,40 +278,85 @@ class List(object):
         if id_exists or id_is_empty:
             return False
 
-        # change every client_id of the projects of the original client
-        for p in self.get_client_projects(client=client):
-            # get old and new project
-            old_p = p.copy()
-            new_p = p.copy()
-            new_p.client_id = client_id
-
-            # set new projects client_id
-            self.set_project_id(
-                old_project=old_p,
-                new_project=new_p
-            )
+        # the client in the list (the given one may be a copy of it)
+        own = self.client_list[self.get_client_index(client)]
+        old_id = own.client_id
+        projects = self.get_client_projects(client=own)
 
-        # rename the file
-        self.rename_client_file(
-            old_client_id=client.client_id,
-            new_client_id=client_id
-        )
+        # cancel if one of the new project IDs does already exist
+        for project in projects:
+            if client_id + '_' + project.title in self.project_index:
+                return False
+
+        # lazy projects have to be loaded, before their files get replaced
+        for project in projects:
+            project.hydrate()
+
+        # remove the old files and write the new ones in one transaction
+        stored = []
+        self.storage.begin()
+        try:
+            current = self.storage.load_client(folder=self.client_dir, client_id=old_id)
+            if not self.check_version(item=own, current=current):
+                raise IOError
+            self.storage.delete_client(folder=self.client_dir, client_id=old_id)
+
+            for project in projects:
+                current = self.storage.load_project(
+                    folder=self.project_dir,
+                    project_id=project.project_id()
+                )
+                if not self.check_version(item=project, current=current):
+                    raise IOError
+                self.storage.delete_project(
+                    folder=self.project_dir,
+                    project_id=project.project_id()
+                )
+
+            own.client_id = client_id
+            for project in projects:
+                project.client_id = client_id
+
+            for obj in [own] + projects:
+                obj.set_version(obj.get_version() + 1)
+                stored.append(obj)
+
+            self.storage.save_client(folder=self.client_dir, client=own)
+            for project in projects:
+                self.storage.save_project(folder=self.project_dir, project=project)
+
+            self.storage.commit()
+        except Exception:
+            self.storage.rollback()
 
-        # get index
-        index = self.get_client_index(client)
+            # nothing got written, so keep everything like it was
+            own.client_id = old_id
+            for project in projects:
+                project.client_id = old_id
 
-        # change the client_id of the original client to the new id
-        self.client_list[index].client_id = client_id
+            for obj in stored:
+                obj.set_version(obj.get_version() - 1)
 
-        # get new client and save it
-        self.save_client_to_file(client=self.client_list[index])
+            return False
+
+        # move the client and its projects to their new IDs in the dicts
+        self.index_client(own, self.unindex_client(old_id))
+        for project in projects:
+            self.index_project(
+                project,
+                self.unindex_project(project, old_id + '_' + project.title, old_id)
+            )
+
+        own.mark_saved()
+        for project in projects:
+            self.saved_project(project)
 
         return True
 
     def remove_client(self, client=None, settings=None):
         """Remove client, if it exists (according to its ID)."""
         is_client = type(client) is Client
-        id_exists = client.client_id in [c.client_id for c in self.client_list]
+        id_exists = self.client_exists(client)
 
         # cancel if it's not client or the client_id does NOT exist
         if not is_client or not id_exists:
@@ -164,7 +365,7 @@ class List(object):
         # try to remove the client and its projects
         try:
             # then delete the client itself
-            self.client_list.pop(self.get_client_index(client))
+            self.pop_client(client.client_id)
             self.delete_client_file(client=client)
 
             # update the inactive_list
@@ -176,14 +377,9 @@ class List(object):
 
     def deactivate_client(self, client=None, inactive_dir=None, settings=None):
         """Pop client and move its file to the inactive dir."""
-        # create absolute path to deactivated_dir and working dir
-        path = self.data_path + self.client_dir
-        path_deact = path + str(inactive_dir)
-
-        # check arguments and directory
+        # check arguments
         one_not_set = client is None or inactive_dir is None
         is_client = type(client) is Client
-        is_dir = os.path.isdir(path_deact)
 
         # cancel if one argument is not set or client isn't Client
         if one_not_set or not is_client:
@@ -197,27 +393,16 @@ class List(object):
             )
 
         # and now the client itself !!!
-        # create dir if it does not exist
-        if not is_dir:
-            os.mkdir(path_deact)
-
-        # generate filenames
-        filename_old = path + '/' + self.us(client.client_id) + '.flclient'
-        filename_old_bu = path + '/' + self.us(client.client_id) + '.flclient_bu'
-        filename_new = path_deact + '/' + self.us(client.client_id) + '.flclient'
-        filename_new_bu = path_deact + '/' + self.us(client.client_id) + '.flclient_bu'
-
         # move the old file to the inactive directory and pop variable from list
         try:
-            # move original file
-            shutil.move(filename_old, filename_new)
-
-            # move backup only if it exists
-            if os.path.isfile(filename_old_bu):
-                shutil.move(filename_old_bu, filename_new_bu)
+            self.storage.move_client(
+                client_id=client.client_id,
+                old_folder=self.client_dir,
+                new_folder=self.client_dir + str(inactive_dir)
+            )
 
             # pop it from the list
-            self.client_list.pop(self.get_client_index(client))
+            self.pop_client(client.client_id)
 
             # update the inactive_list
             self.update_inactive_list(settings=settings)
@@ -232,25 +417,14 @@ class List(object):
         if type(settings) is not Settings:
             return False
 
-        # create absolute path to deactivated_dir and working dir
-        path = self.data_path + self.client_dir
-        path_deact = path + str(settings.inactive_dir)
-
-        # check arguments and directory
+        # check arguments
         one_not_set = client is None or settings is None or inactive_list is None
         is_client = type(client) is Client
-        is_dir = os.path.isdir(path_deact)
 
-        # cancel if one argument is not set or client isn't Client, or dir not exists
-        if one_not_set or not is_client or not is_dir:
+        # cancel if one argument is not set or client isn't Client
+        if one_not_set or not is_client:
             return False
 
-        # generate filenames
-        filename_old = path_deact + '/' + self.us(client.client_id) + '.flclient'
-        filename_old_bu = path_deact + '/' + self.us(client.client_id) + '.flclient_bu'
-        filename_new = path + '/' + self.us(client.client_id) + '.flclient'
-        filename_new_bu = path + '/' + self.us(client.client_id) + '.flclient_bu'
-
         # move the old file to the inactive directory and add variable to list
         try:
             # check if the language exists and adjust it, if not
@@ -265,14 +439,14 @@ class List(object):
                 return False
 
             # remove client form inactive list
-            inactive_list.client_list.pop(inactive_list.get_client_index(client))
+            inactive_list.pop_client(client.client_id)
 
             # move original file
-            shutil.move(filename_old, filename_new)
-
-            # move backup only if it exists
-            if os.path.isfile(filename_old_bu):
-                shutil.move(filename_old_bu, filename_new_bu)
+            self.storage.move_client(
+                client_id=client.client_id,
+                old_folder=self.client_dir + str(settings.inactive_dir),
+                new_folder=self.client_dir
+            )
 
             # update the inactive_list
             self.update_inactive_list(settings=settings)
@@ -284,14 +458,13 @@ class List(object):
     def get_client_projects(self, client=None):
         """Return list with projects for given client."""
         if type(client) is Client:
-            return [p for p in self.project_list if client.client_id == p.client_id]
+            return list(self.client_projects.get(client.client_id, []))
 
     def get_client_by_id(self, client_id=None):
         """Return client object according to found client_id."""
-        # search client_id in list and return the client object
-        for client in self.client_list:
-            if client_id == client.client_id:
-                return client.copy()
+        # search client_id in the index and return the client object
+        if client_id in self.client_index:
+            return self.client_index[client_id].copy()
 
         # return empty client otherwise
         return Client()
@@ -299,17 +472,22 @@ class List(object):
     def get_project_index(self, project=None):
         """Get the index of the project."""
         if type(project) is Project:
-            for i, p in enumerate(self.project_list):
-                if project.project_id() == p.project_id():
-                    return i
+            return self.project_positions.get(project.project_id(), False)
 
         return False
 
+    def project_exists(self, project=None):
+        """Check if project exists according to the ID."""
+        if type(project) is Project:
+            return project.project_id() in self.project_index
+        else:
+            return False
+
     def add_project(self, project=None):
         """Add a project, if its ID does not already exist and the client exist."""
         is_project = type(project) is Project
-        id_exists = project.client_id in [c.client_id for c in self.client_list]
-        pid_exists = project.project_id() in [p.project_id() for p in self.project_list]
+        id_exists = project.client_id in self.client_index
+        pid_exists = self.project_exists(project)
 
         # cancel if it's no project or the client_id does not exist
         #   or the project_id already exists
@@ -318,13 +496,14 @@ class List(object):
 
         # add the project
         self.project_list.append(project)
+        self.index_project(project, len(self.project_list) - 1)
         self.save_project_to_file(project=project)
         return True
 
     def remove_project(self, project=None, settings=None):
         """Remove project, if it exists (according to its ID)."""
         is_project = type(project) is Project
-        pid_exists = project.project_id() in [p.project_id() for p in self.project_list]
+        pid_exists = self.project_exists(project)
 
         # cancel if it's no project or project_id does not exist
         if not is_project or not pid_exists:
@@ -332,7 +511,7 @@ class List(object):
 
         # try to remove the project
         try:
-            self.project_list.pop(self.project_list.index(project))
+            self.pop_project(project.project_id())
             self.delete_project_file(project=project)
 
             # update the inactive_list
@@ -344,42 +523,27 @@ class List(object):
 
     def deactivate_project(self, project=None, inactive_dir=None, settings=None):
         """Pop project and move its file to the inactive dir."""
-        # create absolute path to deactivated_dir and working dir
-        path = self.data_path + self.project_dir
-        path_deact = path + str(inactive_dir)
-
-        # check arguments and directory
+        # check arguments
         one_not_set = project is None or inactive_dir is None
         is_project = type(project) is Project
-        is_dir = os.path.isdir(path_deact)
 
         # cancel if one argument is not set or project isn't Project
         if one_not_set or not is_project:
             return False
 
-        # create dir if it does not exist
-        if not is_dir:
-            os.mkdir(path_deact)
-
-        # generate filenames
-        filename_old = path + '/' + self.us(project.project_id()) + '.flproject'
-        filename_old_bu = path + '/' + self.us(project.project_id()) + '.flproject_bu'
-        filename_new = path_deact + '/' + self.us(project.project_id()) + '.flproject'
-        filename_new_bu = (
-            path_deact + '/' + self.us(project.project_id()) + '.flproject_bu'
-        )
-
         # move the old file to the inactive directory and pop variable from list
         try:
-            # move original file
-            shutil.move(filename_old, filename_new)
+            # a lazy project would not find its file anymore afterwards
+            project.hydrate()
 
-            # move backup only, if it exists
-            if os.path.isfile(filename_old_bu):
-                shutil.move(filename_old_bu, filename_new_bu)
+            self.storage.move_project(
+                project_id=project.project_id(),
+                old_folder=self.project_dir,
+                new_folder=self.project_dir + str(inactive_dir)
+            )
 
             # pop it from list
-            self.project_list.pop(self.project_list.index(project))
+            self.pop_project(project.project_id())
 
             # update the inactive_list
             self.update_inactive_list(settings=settings)
@@ -394,29 +558,19 @@ class List(object):
         if type(settings) is not Settings:
             return False
 
-        # create absolute path to deactivated_dir and working dir
-        path = self.data_path + self.project_dir
-        path_deact = path + str(settings.inactive_dir)
-
-        # check arguments and directory
+        # check arguments
         one_not_set = project is None or settings is None or inactive_list is None
         is_project = type(project) is Project
-        is_dir = os.path.isdir(path_deact)
 
-        # cancel if one argument is not set or project isn't Project, or dir not exists
-        if one_not_set or not is_project or not is_dir:
+        # cancel if one argument is not set or project isn't Project
+        if one_not_set or not is_project:
             return False
 
-        # generate filenames
-        filename_old = path_deact + '/' + self.us(project.project_id()) + '.flproject'
-        filename_old_bu = (
-            path_deact + '/' + self.us(project.project_id()) + '.flproject_bu'
-        )
-        filename_new = path + '/' + self.us(project.project_id()) + '.flproject'
-        filename_new_bu = path + '/' + self.us(project.project_id()) + '.flproject_bu'
-
         # move the old file to the inactive directory and add variable to list
         try:
+            # a lazy project would not find its file anymore afterwards
+            project.hydrate()
+
             # add project to the active list
             added = self.add_project(project=project)
 
@@ -425,14 +579,14 @@ class List(object):
                 return False
 
             # remove project form inactive list
-            inactive_list.project_list.pop(inactive_list.get_project_index(project))
+            inactive_list.pop_project(project.project_id())
 
             # move original file
-            shutil.move(filename_old, filename_new)
-
-            # move backup only if it exists
-            if os.path.isfile(filename_old_bu):
-                shutil.move(filename_old_bu, filename_new_bu)
+            self.storage.move_project(
+                project_id=project.project_id(),
+                old_folder=self.project_dir + str(settings.inactive_dir),
+                new_folder=self.project_dir
+            )
 
             # update the inactive_list
             self.update_inactive_list(settings=settings)
@@ -459,7 +613,9 @@ class List(object):
 
         # only go on change remaining, if the title is possible
         if id_available:
-            self.project_list[old_index] = new_project
+            # the new project replaces the old one also for merging
+            new_project.take_saved_state(self.project_list[old_index])
+            self.replace_project(old_index, new_project)
             return True
         else:
             return False
@@ -474,9 +630,7 @@ class List(object):
             return False
 
         # check id
-        id_exists = new_project.project_id() in [
-            p.project_id() for p in self.project_list
-        ]
+        id_exists = self.project_exists(new_project)
         id_is_own = old_project.project_id() == new_project.project_id()
         title_is_empty = new_project.title == ''
 
@@ -490,6 +644,10 @@ class List(object):
         if id_exists or title_is_empty:
             return False
 
+        # lazy projects have to be loaded, before their file gets renamed
+        self.project_list[self.get_project_index(old_project)].hydrate()
+        new_project.hydrate()
+
         # rename the file
         renamed = self.rename_project_file(
             old_project=old_project,
@@ -503,8 +661,11 @@ class List(object):
         index = self.get_project_index(old_project)
 
         # change the title and client of the original project to the new title
-        self.project_list[index].client_id = new_project.client_id
-        self.project_list[index].title = new_project.title
+        own = self.project_list[index]
+        self.unindex_project(own, own.project_id(), own.client_id)
+        own.client_id = new_project.client_id
+        own.title = new_project.title
+        self.index_project(own, index)
 
         # get new project and save it
         self.save_project_to_file(project=self.project_list[index])
@@ -515,7 +676,7 @@ class List(object):
         """Try to change the projects client_id."""
         is_project = type(project) is Project
         one_not_set = project is None or client_id is None
-        client_exists = client_id in [c.client_id for c in self.client_list]
+        client_exists = client_id in self.client_index
         client_is_self = client_id == project.client_id
 
         # cancel, if either:
@@ -527,72 +688,53 @@ class List(object):
             return False
 
         # assign the project to the new client
+        project.hydrate()
         self.delete_project_file(project=project)
-        project.client_id = client_id
+
+        # the project may be a copy of the one in the list
+        own = self.project_list[self.project_positions[project.project_id()]]
+        position = self.unindex_project(own, own.project_id(), own.client_id)
+        own.client_id = project.client_id = client_id
+        self.index_project(own, position)
         self.save_project_to_file(project=project)
         return True
 
-    def load_client_list_from_file(self):
-        """Load the clients from file and return client_list."""
-        path = self.data_path + self.client_dir
-
-        # check if the data_path/clients directory exists and cancel otherwise
-        if not os.path.isdir(str(path)):
-            return []
+    def load_lists_from_file(self):
+        """Load the clients and projects from the storage and return both."""
+        return (self.load_client_list_from_file(), self.load_project_list_from_file())
 
-        # cycle through the files and append them converted from json to the list
-        out = []
-        for file in sorted(os.listdir(path)):
-            if file.endswith('.flclient'):
-                # load the file
-                f = open(path + '/' + file, 'r')
-                load = f.read()
-                f.close()
+    def load_client_list_from_file(self):
+        """Load the clients from the storage and return client_list."""
+        client_list = self.storage.load_clients(folder=self.client_dir)
 
-                # convert file content to Client object and append it
-                out.append(Client().from_json(js=load))
+        # they are unchanged till now
+        for client in client_list:
+            client.mark_saved()
 
-        return out
+        return client_list
 
     def load_project_list_from_file(self):
-        """Load the projects files and return project list."""
-        # cycle through the files and append them converted from json to the list
-        out = []
-
-        path = self.data_path + self.project_dir
-
-        # check if the data_path/clients directory exists and cancel otherwise
-        if not os.path.isdir(str(path)):
-            return []
-
-        for file in sorted(os.listdir(path)):
-            if file.endswith('.flproject'):
-                # load the file
-                f = open(path + '/' + file, 'r')
-                load = f.read()
-                f.close()
+        """Load the projects from the storage and return project list."""
+        project_list = self.storage.load_projects(
+            folder=self.project_dir,
+            lazy=self.lazy
+        )
 
-                # generate main object
-                out.append(Project().from_json(js=load))
+        # they are unchanged till now
+        for project in project_list:
+            project.mark_saved()
 
-        return out
+        return project_list
 
     def delete_client_file(self, client=None):
         """Delete the file for this client."""
         if type(client) is not Client:
             return False
 
-        path = self.data_path + self.client_dir
-
-        # generate filenames
-        filename = path + '/' + self.us(client.client_id) + '.flclient'
-
-        # check if the file exists and delete it
-        if os.path.isfile(filename):
-            os.remove(filename)
-            return True
-        else:
-            return False
+        return self.storage.delete_client(
+            folder=self.client_dir,
+            client_id=client.client_id
+        )
 
     def rename_client_file(self, old_client_id=None, new_client_id=None):
         """Rename client file (its ID) to new clients ID."""
@@ -602,72 +744,70 @@ class List(object):
         if one_not_set:
             return False
 
-        # generate filenames
-        path = self.data_path + self.client_dir
-        filename = path + '/' + self.us(old_client_id) + '.flclient'
-        filename_bu = path + '/' + self.us(old_client_id) + '.flclient_bu'
-        filename_new = path + '/' + self.us(new_client_id) + '.flclient'
-        filename_new_bu = path + '/' + self.us(new_client_id) + '.flclient_bu'
-
-        # check if the files exist and rename them
-        if os.path.isfile(filename):
-            os.rename(filename, filename_new)
+        return self.storage.rename_client(
+            folder=self.client_dir,
+            old_client_id=old_client_id,
+            new_client_id=new_client_id
+        )
 
-        if os.path.isfile(filename_bu):
-            os.rename(filename_bu, filename_new_bu)
+    def check_version(self, item=None, current=None):
+        """
+        Merge the changes of another program into the item before saving it.
 
-        return True
+        current is the item as it is stored right now (or None). Returns
+        False, if both changed the same values, so that it must not be saved.
+        """
+        if current is None or current.get_version() == item.get_version():
+            return True
 
-    def save_client_to_file(self, client=None):
-        """Save single client to file."""
-        if type(client) is not Client:
+        if not item.merge(current):
             return False
 
-        path = self.data_path + self.client_dir
+        item.set_version(current.get_version())
+        return True
 
-        # create dir if it does not exist
-        is_dir = os.path.isdir(str(path))
-        is_file = os.path.isfile(str(path))
-        if not is_dir and not is_file:
-            os.mkdir(path)
+    def store_client(self, client=None):
+        """Check the version of the client and save it without marking it."""
+        with self.storage.data_lock:
+            current = self.storage.load_client(
+                folder=self.client_dir,
+                client_id=client.client_id
+            )
+            if not self.check_version(item=client, current=current):
+                return False
 
-        # generate filenames
-        filename = path + '/' + self.us(client.client_id) + '.flclient'
-        filename_bu = path + '/' + self.us(client.client_id) + '.flclient_bu'
+            client.set_version(client.get_version() + 1)
+            return self.storage.save_client(folder=self.client_dir, client=client)
 
-        # if it already exists, save a backup
-        if os.path.isfile(filename):
-            shutil.copy2(filename, filename_bu)
+    def save_client_to_file(self, client=None):
+        """Save single client to file or return False on a conflict."""
+        if type(client) is not Client:
+            return False
 
-        # write the file
-        f = open(filename, 'w')
-        f.write(client.to_json())
-        f.close()
+        if not self.store_client(client=client):
+            return False
 
+        client.mark_saved()
         return True
 
     def save_client_list_to_file(self):
         """Save clients from client_list to [data_path]/clients/[client_id].flclient."""
-        # cycle through clients and save each client into its own file
+        # cycle through changed clients and save each client into its own file
+        saved = True
         for client in self.client_list:
-            self.save_client_to_file(client=client)
+            if client.is_changed():
+                saved = self.save_client_to_file(client=client) and saved
+        return saved
 
     def delete_project_file(self, project=None):
         """Delete the file for this project."""
         if type(project) is not Project:
             return False
 
-        path = self.data_path + self.project_dir
-
-        # generate filenames
-        filename = path + '/' + self.us(project.project_id()) + '.flproject'
-
-        # check if the file exists and delete it
-        if os.path.isfile(filename):
-            os.remove(filename)
-            return True
-        else:
-            return False
+        return self.storage.delete_project(
+            folder=self.project_dir,
+            project_id=project.project_id()
+        )
 
     def rename_project_file(self, old_project=None, new_project=None):
         """Rename project file (its ID) to new projects ID."""
@@ -678,79 +818,123 @@ class List(object):
         if not old_is_project or not new_is_project:
             return False
 
-        # generate filenames
-        path = self.data_path + self.project_dir
-        filename = path + '/' + self.us(old_project.project_id()) + '.flproject'
-        filename_bu = path + '/' + self.us(old_project.project_id()) + '.flproject_bu'
-        filename_new = path + '/' + self.us(new_project.project_id()) + '.flproject'
-        filename_new_bu = path + '/' + self.us(new_project.project_id()) + '.flproject_bu'
+        return self.storage.rename_project(
+            folder=self.project_dir,
+            old_project_id=old_project.project_id(),
+            new_project_id=new_project.project_id()
+        )
 
-        # check if the files exist and rename them
-        if os.path.isfile(filename):
-            os.rename(filename, filename_new)
+    def store_project(self, project=None):
+        """Check the version of the project and save it without marking it."""
+        # merging needs the offers and invoices
+        project.hydrate()
 
-        if os.path.isfile(filename_bu):
-            os.rename(filename_bu, filename_new_bu)
+        with self.storage.data_lock:
+            current = self.storage.load_project(
+                folder=self.project_dir,
+                project_id=project.project_id()
+            )
+            if not self.check_version(item=project, current=current):
+                return False
 
-        return True
+            project.set_version(project.get_version() + 1)
+            self.storage.save_project(folder=self.project_dir, project=project)
+            return True
+
+    def saved_project(self, project=None):
+        """Mark the project saved and update the view of unpaid invoices."""
+        project.mark_saved()
+
+        # invoices of the project in the list could have changed
+        if self.project_index.get(project.project_id()) is project:
+            self.refresh_unpaid(project)
 
     def save_project_to_file(self, project=None):
-        """Save single project to file."""
+        """Save single project to file or return False on a conflict."""
         if type(project) is not Project:
             return False
 
-        path = self.data_path + self.project_dir
-
-        # create dir if it does not exist
-        is_dir = os.path.isdir(str(path))
-        is_file = os.path.isfile(str(path))
-        if not is_dir and not is_file:
-            os.mkdir(path)
-
-        # generate filenames
-        filename = path + '/' + self.us(project.project_id()) + '.flproject'
-        filename_bu = path + '/' + self.us(project.project_id()) + '.flproject_bu'
-
-        # if it already exists, save a backup
-        if os.path.isfile(filename):
-            shutil.copy2(filename, filename_bu)
+        if not self.store_project(project=project):
+            return False
 
-        # write the file
-        f = open(filename, 'w')
-        f.write(project.to_json())
-        f.close()
+        self.saved_project(project)
+        return True
 
     def save_project_list_to_file(self):
         """Save projects to [data_path]/projects/[project_id].flproject."""
-        # cycle through projects and save each project into its own file
+        # cycle through changed projects and save each project into its own file
+        saved = True
         for project in self.project_list:
-            self.save_project_to_file(project=project)
+            if project.is_changed():
+                saved = self.save_project_to_file(project=project) and saved
+        return saved
 
     def save_all(self):
-        """Save all the lists."""
-        self.save_client_list_to_file()
-        self.save_project_list_to_file()
+        """
+        Save all the changed clients and projects in one transaction.
+
+        Nothing gets saved, if one of them conflicts with the changes of
+        another program.
+        """
+        clients = [c for c in self.client_list if c.is_changed()]
+        projects = [p for p in self.project_list if p.is_changed()]
 
-    def copy(self):
-        """Copy the own object and return it as a new one."""
-        # get copy of client_list
-        new_client_list = []
+        stored = []
+        self.storage.begin()
+        try:
+            for client in clients:
+                if not self.store_client(client=client):
+                    raise IOError
+                stored.append(client)
+
+            for project in projects:
+                if not self.store_project(project=project):
+                    raise IOError
+                stored.append(project)
 
-        for c in self.client_list:
-            new_client_list.append(Client().from_json(js=c.to_json()))
+            self.storage.commit()
+        except Exception:
+            self.storage.rollback()
 
-        # get copy of project_list
-        new_project_list = []
+            # nothing got written, so the versions stay the stored ones
+            for obj in stored:
+                obj.set_version(obj.get_version() - 1)
+
+            return False
+
+        for client in clients:
+            client.mark_saved()
+
+        for project in projects:
+            self.saved_project(project)
+
+        return True
 
-        for p in self.project_list:
-            new_project_list.append(Project().from_json(js=p.to_json()))
+    def copy(self, shared=False):
+        """
+        Copy the own object and return it as a new one.
+
+        With shared=True only the lists get copied, while the clients and
+        projects are the same objects (copy-on-write): this is cheap for
+        read-only consumers, which may change the lists, but have to copy()
+        a client or project before changing it.
+        """
+        if shared:
+            new_client_list = list(self.client_list)
+            new_project_list = list(self.project_list)
+
+        else:
+            new_client_list = [c.copy() for c in self.client_list]
+            new_project_list = [p.copy() for p in self.project_list]
 
         return List(
             data_path=self.data_path[:],
             client_dir=self.client_dir[:],
             client_list=new_client_list,
             project_dir=self.project_dir[:],
-            project_list=new_project_list
+            project_list=new_project_list,
+            storage=self.storage,
+            lazy=self.lazy
         )
 
     def reload(self, data_path=None):
@@ -760,9 +944,128 @@ class List(object):
         if not is_dir:
             raise IOError
 
+        # get a new storage of the same kind for the new data_path
+        if data_path != self.data_path:
+            self.storage = get_storage(
+                data_path=data_path,
+                backend=self.storage.name,
+                workers=getattr(self.storage, 'workers', None),
+                pool=getattr(self.storage, 'pool', None),
+                snapshot=getattr(self.storage, 'snapshot', False),
+                shard=getattr(self.storage, 'shard', 0)
+            )
+
         self.data_path = data_path
-        self.client_list = self.load_client_list_from_file()
-        self.project_list = self.load_project_list_from_file()
+        self.client_list, self.project_list = self.storage.read(
+            load=self.load_lists_from_file
+        )
+        self.rebuild_index()
+
+    def get_watch_paths(self):
+        """Return the directories, which hold the client and project files."""
+        return [self.data_path + self.client_dir, self.data_path + self.project_dir]
+
+    def apply_file_changes(self, changes=None):
+        """
+        Patch the lists with files changed by other programs.
+
+        changes is a list of (kind, filename) tuples from a watcher. Only
+        these files get loaded again. Files, which were written by the own
+        storage and did not change since, get skipped. Unsaved changes of
+        a client or project are kept: the changes of the file get merged
+        into it, or, if both changed the same value, the file is added to
+        file_conflicts and left out. Returns True, if something changed.
+        """
+        # only the files of the file storage can be watched
+        if self.storage.name != 'file' or not changes:
+            return False
+
+        lists = {
+            os.path.abspath(self.data_path + self.client_dir): 'client',
+            os.path.abspath(self.data_path + self.project_dir): 'project'
+        }
+
+        changed = False
+        for kind, filename in changes:
+            path = os.path.dirname(os.path.abspath(filename))
+
+            # files in shard directories belong to the folder above
+            if os.path.basename(path).startswith(SHARD_PREFIX):
+                path = os.path.dirname(path)
+
+            if path not in lists:
+                continue
+
+            if lists[path] == 'client':
+                item_list, folder, ending, cls = (
+                    self.client_list, self.client_dir, '.flclient', Client
+                )
+                files, positions = self.client_files, self.client_positions
+            else:
+                item_list, folder, ending, cls = (
+                    self.project_list, self.project_dir, '.flproject', Project
+                )
+                files, positions = self.project_files, self.project_positions
+
+            if not filename.endswith(ending):
+                continue
+
+            if kind != 'removed' and self.storage.is_own_write(filename):
+                continue
+
+            # find the loaded object of this file (in any layout)
+            item_id = files.get(os.path.basename(filename)[:-len(ending)])
+            position = positions.get(item_id)
+
+            if kind == 'removed':
+                # it was only moved into the other layout
+                moved = position is not None and os.path.isfile(
+                    self.storage.find_filename(folder, item_id, ending)
+                )
+
+                if position is not None and not moved:
+                    if cls is Client:
+                        self.pop_client(item_id)
+                    else:
+                        self.pop_project(item_id)
+                    changed = True
+                continue
+
+            item = self.storage.load_file(filename=filename, cls=cls)
+            if item is None:
+                continue
+            item.mark_saved()
+
+            if position is not None and item_list[position].is_changed():
+                own = item_list[position]
+                if cls is Project:
+                    own.hydrate()
+                if not own.merge(item):
+                    self.file_conflicts.append(filename)
+                    continue
+
+                # the file is the saved state now, the own changes stay
+                own.take_saved_state(item)
+                own.set_version(item.get_version())
+                if cls is Project:
+                    self.refresh_unpaid(own)
+                changed = True
+                continue
+
+            if cls is Client and position is None:
+                self.client_list.append(item)
+                self.index_client(item, len(self.client_list) - 1)
+            elif cls is Client:
+                self.client_list[position] = item
+                self.client_index[item_id] = item
+            elif position is None:
+                self.project_list.append(item)
+                self.index_project(item, len(self.project_list) - 1)
+            else:
+                self.replace_project(position, item)
+            changed = True
+
+        return changed
 
     def us(self, string=''):
         """Return string with underscores instead of whitespace."""
@@ -785,35 +1088,124 @@ class List(object):
             self.inactive_list = List(
                 data_path=data_path,
                 client_dir=client_dir,
-                project_dir=project_dir
+                project_dir=project_dir,
+                storage=self.storage,
+                lazy=self.lazy
             )
             return self.inactive_list
 
     def get_active_and_inactive_list(self, settings=None):
-        """Get inactive clients and projects and active together."""
+        """
+        Get inactive clients and projects and active together.
+
+        The returned list shares the clients and projects with the active
+        and the inactive list, so it is meant for reading only.
+        """
         # get both lists
-        inact_list = self.get_inactive_list(settings=settings)
-        act_list = self.copy()
+        inact_list = self.get_inactive_list(settings=settings).copy(shared=True)
+        act_list = self.copy(shared=True)
 
         # combine clients and projects
         inact_list.project_list += act_list.project_list
         inact_list.client_list += act_list.client_list
+        inact_list.rebuild_index()
 
         return inact_list
 
-    def get_unpaid_invoices(self):
-        """Return list with unpaid invoices - sorted by due date."""
-        unpaid = []
+    def add_unpaid(self, project=None):
+        """Insert the unpaid invoices of the project into the sorted view."""
+        if self.unpaid_keys is None:
+            return
 
-        # cycle through all (active) projects
-        for project in self.project_list:
-            # cycle through the invoices of the project
-            for invoice in project.get_invoice_list():
-                # append it, if it has no paid_date set (None)
-                if invoice.get_paid_date() is None and invoice.get_date() is not None:
-                    unpaid.append(invoice)
+        keys = []
+
+        # do not load projects from the index, which cannot have unpaid invoices
+        try:
+            invoices = project.get_invoice_list() if project.has_unpaid_invoices() else []
+        except IOError as err:
+            # keep it in the view without invoices, so it is reported once
+            self.load_failures.append(str(err))
+            invoices = []
+
+        for invoice in invoices:
+            # append it, if it has no paid_date set (None)
+            if invoice.get_paid_date() is None and invoice.get_date() is not None:
+                # the counter keeps invoices with the same due date in order
+                self.unpaid_counter += 1
+                key = (invoice.get_due_date(), self.unpaid_counter)
+                i = bisect.bisect(self.unpaid_keys, key)
+                self.unpaid_keys.insert(i, key)
+                self.unpaid_items.insert(i, invoice)
+                keys.append(key)
+
+        self.unpaid_projects[id(project)] = (project, keys, self.invoice_stamp(project))
+
+    def invoice_stamp(self, project=None):
+        """Return the invoice values of the view or None for lazy projects."""
+        if not project.is_hydrated():
+            return None
+
+        return [
+            (id(i), i.get_date(), i.get_due_days(), i.get_paid_date())
+            for i in project.get_invoice_list()
+        ]
+
+    def remove_unpaid(self, project_id=None):
+        """Remove the invoices of the project (by object id) from the view."""
+        project, keys, stamp = self.unpaid_projects.pop(project_id)
 
-        # sort the invoices by due date
-        unpaid = sorted(unpaid, key=lambda x: x.get_due_date())
+        for key in keys:
+            i = bisect.bisect_left(self.unpaid_keys, key)
+            del self.unpaid_keys[i]
+            del self.unpaid_items[i]
 
-        return unpaid
+    def refresh_unpaid(self, project=None):
+        """Update the view for the changed or saved project."""
+        if self.unpaid_keys is None:
+            return
+
+        if id(project) in self.unpaid_projects:
+            self.remove_unpaid(id(project))
+
+        self.add_unpaid(project)
+
+    def sync_unpaid(self):
+        """Update the view for replaced, removed or new projects."""
+        if self.unpaid_keys is None:
+            return
+
+        current = {id(p): p for p in self.project_list}
+
+        for project_id, (project, keys, stamp) in list(self.unpaid_projects.items()):
+            if current.get(project_id) is not project:
+                self.remove_unpaid(project_id)
+
+        for project_id, project in current.items():
+            if project_id not in self.unpaid_projects:
+                self.add_unpaid(project)
+
+    def get_unpaid_invoices(self):
+        """
+        Return list with unpaid invoices - sorted by due date.
+
+        The sorted view gets build on the first request and is kept up to
+        date afterwards by adding, removing, updating and saving projects.
+        Changed dates, due days and paid dates and added or removed
+        invoices count up the invoice revision, then the loaded projects
+        with changed invoices get refreshed.
+        """
+
+        if self.unpaid_keys is None:
+            self.unpaid_keys = []
+            self.unpaid_items = []
+            self.unpaid_projects = {}
+            self.sync_unpaid()
+
+        elif self.unpaid_revision != get_invoice_revision():
+            for project, keys, stamp in list(self.unpaid_projects.values()):
+                if project.is_hydrated() and stamp != self.invoice_stamp(project):
+                    self.refresh_unpaid(project)
+
+        self.unpaid_revision = get_invoice_revision()
+
+        return list(self.unpaid_items)
@@ -5,14 +5,43 @@ The classes do not have privat values and setter and getter methods!
 """
 
 from decimal import Decimal
-import json
+from general import schema
+from general.tracking import Tracked
 from offer.offerinvoice import Offer
 from offer.offerinvoice import Invoice
+from offer.offerinvoice import count_invoice_revision
 
 
-class Project(object):
+class Project(Tracked):
     """This class holds and project information."""
 
+    __slots__ = (
+        '_loader', '_summary', '_source', 'client_id', 'title', '_hours_per_day',
+        '_work_days', '_minimum_days', '_wage', '_offer_list', '_invoice_list',
+        '_archived_offers', '_archived_invoice_ids', 'holiday_file'
+    )
+
+    # the loader of lazy projects is no change
+    UNTRACKED = Tracked.UNTRACKED + ('_loader', '_summary', '_source')
+
+    CHILDREN = {'Offer': '_offer_list', 'Invoice': '_invoice_list'}
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('client_id', 'client_id', None),
+        ('title', 'title', None),
+        ('hours_per_day', '_hours_per_day', None),
+        ('work_days', '_work_days', None),
+        ('wage', '_wage', 'float'),
+        ('minimum_days', '_minimum_days', None),
+        ('holiday_file', 'holiday_file', None),
+        ('archived_offers', '_archived_offers', None),
+        ('archived_invoice_ids', '_archived_invoice_ids', None),
+        ('version', 'get_version', None),
+        ('offer_list', 'get_offer_list', ('Offer',)),
+        ('invoice_list', 'get_invoice_list', ('Invoice',))
+    )
+
     def __init__(
         self,
         client_id=None,
@@ -20,11 +49,18 @@ class Project(object):
         hours_per_day=None,
         work_days=None,
         minimum_days=None,
+        holiday_file=None,
         wage=None,
         offer_list=None,
-        invoice_list=None
+        invoice_list=None,
+        archived_offers=None,
+        archived_invoice_ids=None,
+        version=None
     ):
         """Initialize the class."""
+        self._loader = None                     # set for lazy loaded projects
+        self._summary = None                    # index data of lazy projects
+        self._source = None                     # file or database of the loader
         self.client_id = 'no_id' if client_id is None else str(client_id)
         self.title = '' if title is None else str(title)
         self._hours_per_day = 4                 # set default
@@ -33,12 +69,18 @@ class Project(object):
         self.set_work_days(work_days)           # try to set arguments value
         self._minimum_days = 2                  # set default
         self.set_minimum_days(minimum_days)     # try to set arguments value
+        self.holiday_file = '' if holiday_file is None else str(holiday_file)
         self._wage = Decimal('0.00')            # set default
         self.set_wage(wage)                     # try to set arguments value
         self._offer_list = []                   # set default
         self.set_offer_list(offer_list)         # try to set arguments value
         self._invoice_list = []                 # set default
         self.set_invoice_list(invoice_list)     # try to set arguments value
+        self._archived_offers = 0               # set default
+        self.set_archived_offers(archived_offers)  # try to set arguments value
+        self._archived_invoice_ids = []         # set default
+        self.set_archived_invoice_ids(archived_invoice_ids)  # try to set arguments value
+        self.set_version(version)               # try to set arguments value
 
     def set_hours_per_day(self, value):
         """Set hours_per_day."""
@@ -91,48 +133,206 @@ class Project(object):
         """Get wage."""
         return self._wage
 
+    def set_archived_offers(self, value):
+        """Set archived_offers."""
+        try:
+            self._archived_offers = int(value)
+            if self._archived_offers < 0:
+                self._archived_offers = 0
+        except Exception:
+            pass
+
+    def get_archived_offers(self):
+        """Get archived_offers."""
+        return self._archived_offers
+
+    def set_archived_invoice_ids(self, value):
+        """Set archived_invoice_ids."""
+        if type(value) is list:
+            self._archived_invoice_ids = [str(v) for v in value]
+
+    def get_archived_invoice_ids(self):
+        """Get archived_invoice_ids."""
+        return self._archived_invoice_ids
+
+    def set_loader(self, loader=None, summary=None, source=None):
+        """
+        Make the project a lazy loaded one.
+
+        The loader is a function returning the full project. It will be
+        called the first time the offers or invoices are needed. Till then
+        the summary (offer count and invoice data from the storage index)
+        stands in for them. The source (the file or database the loader
+        reads) is named in the error, if loading fails.
+        """
+        self._loader = loader
+        self._summary = summary
+        self._source = source
+
+    def is_hydrated(self):
+        """Return if offers and invoices are loaded."""
+        return self._loader is None
+
+    def hydrate(self):
+        """Load offers and invoices, if the project was loaded lazily."""
+        if self._loader is None:
+            return
+
+        # do not lose data silently, if the storage cannot give the project
+        full = self._loader()
+        if full is None:
+            raise IOError('Could not load the project from {}'.format(self._source))
+
+        # loading does not change the project, the loaded offers and
+        # invoices are the saved ones
+        self._loader = None
+        self._summary = None
+        self.set_quietly('_offer_list', full.get_offer_list())
+        self.set_quietly('_invoice_list', full.get_invoice_list())
+
+        for item in self._offer_list + self._invoice_list:
+            item.mark_saved()
+
+    def get_summary(self):
+        """Get offer count and invoice data for the storage index."""
+        if self._loader is not None:
+            return self._summary
+
+        invoices = []
+        for invoice in self._invoice_list:
+            invoices.append({
+                'id': invoice.id,
+                'date': (
+                    None if invoice.get_date() is None
+                    else invoice.get_date().strftime('%Y-%m-%d')
+                ),
+                'due_days': invoice.get_due_days(),
+                'paid_date': (
+                    None if invoice.get_paid_date() is None
+                    else invoice.get_paid_date().strftime('%Y-%m-%d')
+                ),
+                'price_total': str(invoice.get_price_total(project=self)),
+                'tax_total': str(invoice.get_price_tax_total(project=self))
+            })
+
+        return {
+            'offer_count': len(self._offer_list),
+            'invoices': invoices
+        }
+
+    def get_offer_count(self):
+        """Get number of offers (archived ones too) without loading a lazy project."""
+        if self._loader is not None:
+            return self._archived_offers + self._summary['offer_count']
+        return self._archived_offers + len(self._offer_list)
+
+    def get_invoice_ids(self):
+        """Get list of invoice ids (archived ones too) without loading a lazy project."""
+        if self._loader is not None:
+            ids = [inv['id'] for inv in self._summary['invoices']]
+        else:
+            ids = [inv.id for inv in self._invoice_list]
+        return self._archived_invoice_ids + ids
+
+    def has_unpaid_invoices(self):
+        """Check for dated, unpaid invoices without loading a lazy project."""
+        if self._loader is not None:
+            return any(
+                inv['paid_date'] is None and inv['date'] is not None
+                for inv in self._summary['invoices']
+            )
+
+        return any(
+            inv.get_paid_date() is None and inv.get_date() is not None
+            for inv in self._invoice_list
+        )
+
     def set_offer_list(self, value):
         """Set offer_list."""
         if type(value) is list:
+            self.hydrate()
             self._offer_list = value
 
     def get_offer_list(self):
         """Get offer_list."""
+        self.hydrate()
         return self._offer_list
 
     def set_invoice_list(self, value):
         """Set invoice_list."""
         if type(value) is list:
+            self.hydrate()
             self._invoice_list = value
+            count_invoice_revision()
 
     def get_invoice_list(self):
         """Get invoice_list."""
+        self.hydrate()
         return self._invoice_list
 
     def append_offer(self, offer=None):
         """Append offer to project."""
         if type(offer) is Offer:
-            self._offer_list.append(offer)
+            self.hydrate()
+            self.append_child('_offer_list', offer)
 
     def pop_offer(self, index=None):
         """Pop offer from project."""
         try:
-            self._offer_list.pop(index)
+            self.hydrate()
+            self.pop_child('_offer_list', index)
+        except Exception:
+            pass
+
+    def replace_offer(self, index=None, offer=None):
+        """Replace offer with the given index."""
+        try:
+            self.hydrate()
+            self.replace_child('_offer_list', index, offer)
         except Exception:
             pass
 
+    def move_offer(self, index=None, direction=None):
+        """Move offer with the given index up (1) or down (-1) and return its index."""
+        try:
+            self.hydrate()
+            return self.move_child('_offer_list', index, direction)
+        except Exception:
+            return None
+
     def append_invoice(self, invoice=None):
         """Append invoice to project."""
         if type(invoice) is Invoice:
-            self._invoice_list.append(invoice)
+            self.hydrate()
+            self.append_child('_invoice_list', invoice)
+            count_invoice_revision()
 
     def pop_invoice(self, index=None):
         """Pop invoice from project."""
         try:
-            self._invoice_list.pop(index)
+            self.hydrate()
+            self.pop_child('_invoice_list', index)
+            count_invoice_revision()
         except Exception:
             pass
 
+    def replace_invoice(self, index=None, invoice=None):
+        """Replace invoice with the given index."""
+        try:
+            self.hydrate()
+            self.replace_child('_invoice_list', index, invoice)
+            count_invoice_revision()
+        except Exception:
+            pass
+
+    def move_invoice(self, index=None, direction=None):
+        """Move invoice with the given index up (1) or down (-1) and return its index."""
+        try:
+            self.hydrate()
+            return self.move_child('_invoice_list', index, direction)
+        except Exception:
+            return None
+
     def project_id(self, title=None):
         """Generate id with [client_id]_[title]."""
         if title is None:
@@ -151,74 +351,11 @@ class Project(object):
 
     def to_dict(self):
         """Convert object to dict."""
-        out = {}
-
-        # fetch the variables
-        out['type'] = self.__class__.__name__
-        out['client_id'] = self.client_id
-        out['title'] = self.title
-        out['hours_per_day'] = self._hours_per_day
-        out['work_days'] = self._work_days
-        out['wage'] = float(self._wage)
-        out['minimum_days'] = self._minimum_days
-
-        # fetch the jsons from the entries
-        out['offer_list'] = []
-        for offer in self._offer_list:
-            try:
-                out['offer_list'].append(offer.to_dict())
-            except Exception:
-                out['offer_list'].append(offer)
-
-        out['invoice_list'] = []
-        for invoice in self._invoice_list:
-            try:
-                out['invoice_list'].append(invoice.to_dict())
-            except Exception:
-                out['invoice_list'].append(invoice)
-
-        return out
+        return schema.encode(self, self.FIELDS)
 
     def to_json(self, indent=2, ensure_ascii=False):
         """Convert variables data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
-
-    def load_offer_list_from_js(self, lis=None):
-        """Convert list to offer object list."""
-        offer_list = []
-        # cycle through the list of dicts
-        for offer in lis:
-            # it should have a type key
-            if 'type' in offer.keys():
-                # this type key should be "Offer"
-                if offer['type'] == 'Offer':
-                    # convert this dict to an offer objetc then!
-                    offer_list.append(Offer().from_json(
-                        js=offer
-                    ))
-
-        return offer_list
-
-    def load_invoice_list_from_js(self, lis=None):
-        """Convert list to invoice object list."""
-        invoice_list = []
-        # cycle through the list of dicts
-        for invoice in lis:
-            # it should have a type key
-            if 'type' in invoice.keys():
-                # this type key should be "Invoice"
-                if invoice['type'] == 'Invoice':
-                    # convert this dict to an invoice objetc then!
-                    invoice_list.append(Invoice().from_json(
-                        js=invoice
-                    ))
-
-        return invoice_list
+        return schema.dumps(self.to_dict(), indent=indent, ensure_ascii=ensure_ascii)
 
     @classmethod
     def from_json(cls, js=None):
@@ -226,69 +363,18 @@ class Project(object):
         if js is None:
             return cls()
 
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
-
-        # create object from variables
-        if 'client_id' in js.keys():
-            client_id = js['client_id']
-        else:
-            client_id = None
-
-        if 'title' in js.keys():
-            title = js['title']
-        else:
-            title = None
-
-        if 'hours_per_day' in js.keys():
-            hours_per_day = js['hours_per_day']
-        else:
-            hours_per_day = None
-
-        if 'work_days' in js.keys():
-            work_days = js['work_days']
-        else:
-            work_days = None
-
-        if 'minimum_days' in js.keys():
-            minimum_days = js['minimum_days']
-        else:
-            minimum_days = None
-
-        if 'wage' in js.keys():
-            wage = js['wage']
-        else:
-            wage = None
-
-        if 'offer_list' in js.keys():
-            offer_list = js['offer_list']
-            offer_list = cls().load_offer_list_from_js(lis=offer_list)
-        else:
-            offer_list = None
+        # get js as dict or return default object
+        js = schema.load_dict(js)
+        if js is None:
+            return cls()
 
-        if 'invoice_list' in js.keys():
-            invoice_list = js['invoice_list']
-            invoice_list = cls().load_invoice_list_from_js(lis=invoice_list)
-        else:
-            invoice_list = None
-
-        # return new object
-        return cls(
-            client_id=client_id,
-            title=title,
-            hours_per_day=hours_per_day,
-            work_days=work_days,
-            minimum_days=minimum_days,
-            wage=wage,
-            offer_list=offer_list,
-            invoice_list=invoice_list
-        )
+        # create object from json
+        return cls(**schema.decode(js, cls.FIELDS))
 
     def copy(self):
         """Return copy of own object as new object."""
-        return Project().from_json(js=self.to_json())
+        # a lazy project stays lazy in its copy, since it shares the loader
+        return self.structural_copy()
+
+
+schema.register(Project)
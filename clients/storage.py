@@ -0,0 +1,941 @@
+"""
+Storage backends for the global list.
+
+The FileStorage keeps one json file per client and per project (the
+classic layout), while the SQLiteStorage keeps everything in one indexed
+database file inside the data_path.
+
+Both backends work with "folders" like '/clients' or '/clients/inactive'.
+This way the active and the inactive list can share the same backend.
+
+Both backends lock the data_path for writing (see general/lock.py), so
+that several programs can use it. Readers load lock-free with read().
+
+The FileStorage can shard big folders: with shard=2 the project
+'ABC01_Project' goes into '/projects/@AB/ABC01_Project.flproject'. Files
+still in the flat layout get found as well and are moved on their next
+save; general/reshard.py moves all existing files at once.
+"""
+
+from clients.client import Client
+from clients.project import Project
+from contextlib import contextmanager
+from functools import partial
+from general import schema
+from general.journal import atomic_write
+from general.journal import Journal
+from general.lock import DataLock
+from general.loader import decode_json_file
+from general.loader import list_files
+from general.loader import load_files
+from general.snapshot import load_files_cached
+from general.watcher import file_stamp
+from general.watcher import SHARD_PREFIX
+from general.watcher import shard_dirs
+import json
+import os
+import shutil
+import sqlite3
+
+
+BACKENDS = ['file', 'sqlite']
+
+# raise it, if the records of the project index (.flindex) change
+INDEX_VERSION = 2
+
+
+def us(string=''):
+    """Return string with underscores instead of whitespace."""
+    return string.replace(' ', '_')
+
+
+def get_storage(
+    data_path=None,
+    backend=None,
+    workers=None,
+    pool=None,
+    snapshot=False,
+    shard=0
+):
+    """Return the storage object for the given backend name."""
+    if backend == 'sqlite':
+        return SQLiteStorage(data_path=data_path)
+    else:
+        return FileStorage(
+            data_path=data_path,
+            workers=workers,
+            pool=pool,
+            snapshot=snapshot,
+            shard=shard
+        )
+
+
+class FileStorage(object):
+    """Storage holding one json file per client and per project."""
+
+    name = 'file'
+
+    def __init__(
+        self,
+        data_path=None,
+        workers=None,
+        pool=None,
+        snapshot=False,
+        shard=0
+    ):
+        """Initialize the class."""
+        self.data_path = data_path
+
+        # length of the ID prefix for the shard directories (0 = flat)
+        self.shard = 0 if shard is None else int(shard)
+
+        # the files get read and decoded by a pool of workers
+        self.workers = 1 if workers is None else workers
+        self.pool = 'thread' if pool is None else pool
+
+        # keep the decoded objects of every folder in a binary snapshot
+        self.snapshot = snapshot
+
+        # filenames, which could not be decoded while loading
+        self.failed_files = []
+
+        # saves between begin() and commit() get written as one transaction
+        self.journal = Journal(path=str(data_path) + '/.fljournal')
+        self.in_transaction = False
+
+        # stamps of the files written by this storage (for the watcher)
+        self.written = {}
+
+        # files in the other layout, which get removed after the commit
+        self.stale_files = []
+
+        # other programs may use the data_path at the same time
+        self.data_lock = DataLock(path=str(data_path))
+
+    def read(self, load=None):
+        """Return load(), which ran while no other program was writing."""
+        return self.data_lock.read(load=load)
+
+    def begin(self):
+        """Start writing the following saves as one transaction."""
+        self.data_lock.acquire()
+        self.in_transaction = True
+
+    def commit(self):
+        """Write the saves since begin() into their files."""
+        self.in_transaction = False
+        filenames = [filename for tmp, filename in self.journal.staged]
+
+        committed = self.journal.commit()
+
+        for filename in filenames:
+            self.written[filename] = file_stamp(filename)
+
+        self.remove_stale_files()
+        self.data_lock.release()
+
+        return committed
+
+    def rollback(self):
+        """Throw away the saves since begin()."""
+        self.in_transaction = False
+        self.journal.rollback()
+        self.stale_files = []
+        self.data_lock.release()
+
+    def gen_path(self, folder=None, name=None, ending=None, shard=None):
+        """Generate the absolute filename for the file name without ending."""
+        shard = self.shard if shard is None else shard
+
+        if shard > 0:
+            return (
+                self.data_path + folder + '/' + SHARD_PREFIX + name[:shard] +
+                '/' + name + ending
+            )
+
+        return self.data_path + folder + '/' + name + ending
+
+    def gen_filename(self, folder=None, item_id=None, ending=None):
+        """Generate the absolute filename for the item."""
+        return self.gen_path(folder=folder, name=us(item_id), ending=ending)
+
+    def gen_filenames(self, folder=None, item_id=None, ending=None):
+        """Generate the filenames of the item in the own and the flat layout."""
+        out = [self.gen_filename(folder, item_id, ending)]
+
+        if self.shard > 0:
+            out.append(
+                self.gen_path(folder=folder, name=us(item_id), ending=ending, shard=0)
+            )
+
+        return out
+
+    def find_filename(self, folder=None, item_id=None, ending=None):
+        """Return the existing filename of the item (or the one to use)."""
+        for filename in self.gen_filenames(folder, item_id, ending):
+            if os.path.isfile(filename):
+                return filename
+
+        return self.gen_filename(folder, item_id, ending)
+
+    def remove_stale_files(self):
+        """Remove the files, which were replaced by files in the own layout."""
+        for filename in self.stale_files:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+        self.stale_files = []
+
+    def list_item_files(self, folder=None, ending=None):
+        """Return the filenames in the folder and its shard directories."""
+        path = self.data_path + folder
+
+        # check if the directory exists and cancel otherwise
+        if not os.path.isdir(str(path)):
+            return []
+
+        out = []
+        for file in os.listdir(path):
+            filename = os.path.join(path, file)
+
+            if file.startswith(SHARD_PREFIX) and os.path.isdir(filename):
+                out += list_files(path=filename, ending=ending)
+            elif file.endswith(ending):
+                out.append(filename)
+
+        return sorted(out, key=os.path.basename)
+
+    def reshard(self, folder=None, ending=None):
+        """Move the files of the folder into the own layout and return count."""
+        with self.data_lock:
+            count = 0
+
+            for filename in self.list_item_files(folder=folder, ending=ending):
+                name = os.path.basename(filename)[:-len(ending)]
+                target = self.gen_path(folder=folder, name=name, ending=ending)
+
+                if target != filename:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(filename, target)
+                    count += 1
+
+            # remove the empty shard directories
+            for shard_path in shard_dirs(self.data_path + folder):
+                if not os.listdir(shard_path):
+                    os.rmdir(shard_path)
+
+            return count
+
+    def load_items(self, folder=None, ending=None, cls=None):
+        """Load all items with the ending from the folder."""
+        filenames = self.list_item_files(folder=folder, ending=ending)
+
+        if self.snapshot:
+            return load_files_cached(
+                filenames=filenames,
+                decode=partial(decode_json_file, cls=cls),
+                snapshot=self.data_path + folder + '/.flsnapshot',
+                workers=self.workers,
+                pool=self.pool,
+                failed=self.failed_files
+            )
+
+        return load_files(
+            filenames=filenames,
+            decode=partial(decode_json_file, cls=cls),
+            workers=self.workers,
+            pool=self.pool,
+            failed=self.failed_files
+        )
+
+    def save_item(self, folder=None, item_id=None, ending=None, content=None):
+        """Save the content into the items file."""
+        with self.data_lock:
+            filenames = self.gen_filenames(folder, item_id, ending)
+            filename = filenames[0]
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+            # the file in the other layout would be loaded twice otherwise
+            self.stale_files += [f for f in filenames[1:] if os.path.isfile(f)]
+
+            # stage it for the transaction or replace the file at once
+            if self.in_transaction:
+                return self.journal.write(filename=filename, content=content)
+
+            atomic_write(filename=filename, content=content)
+            self.written[os.path.abspath(filename)] = file_stamp(filename)
+            self.remove_stale_files()
+
+            return True
+
+    def is_own_write(self, filename=None):
+        """Check if the file is unchanged since this storage wrote it."""
+        stamp = self.written.get(os.path.abspath(filename))
+        return stamp is not None and stamp == file_stamp(filename)
+
+    def load_file(self, filename=None, cls=None):
+        """Load single file or return None, if it cannot be decoded."""
+        out = load_files(
+            filenames=[filename],
+            decode=partial(decode_json_file, cls=cls),
+            failed=self.failed_files
+        )
+
+        return out[0] if out else None
+
+    def delete_item(self, folder=None, item_id=None, ending=None):
+        """Delete the items file."""
+        with self.data_lock:
+            deleted = False
+
+            # check if the file exists (in one of the layouts) and delete it
+            for filename in self.gen_filenames(folder, item_id, ending):
+                if os.path.isfile(filename):
+                    if self.in_transaction:
+                        self.journal.remove(filename=filename)
+                    else:
+                        os.remove(filename)
+                    deleted = True
+
+            return deleted
+
+    def rename_item(self, folder=None, old_id=None, new_id=None, ending=None):
+        """Rename the items file."""
+        with self.data_lock:
+            filename = self.find_filename(folder, old_id, ending)
+            filename_new = self.gen_filename(folder, new_id, ending)
+
+            # cancel if the file does not exist
+            if not os.path.isfile(filename):
+                return True
+
+            os.makedirs(os.path.dirname(filename_new), exist_ok=True)
+
+            # stage it as a copy and a removal, so a rollback undoes it
+            if self.in_transaction:
+                with open(filename, 'r') as f:
+                    self.journal.write(filename=filename_new, content=f.read())
+                return self.journal.remove(filename=filename)
+
+            os.rename(filename, filename_new)
+
+            return True
+
+    def move_item(self, item_id=None, old_folder=None, new_folder=None, ending=None):
+        """Move the items file into another folder."""
+        with self.data_lock:
+            filename_old = self.find_filename(old_folder, item_id, ending)
+            filename_new = self.gen_filename(new_folder, item_id, ending)
+            os.makedirs(os.path.dirname(filename_new), exist_ok=True)
+
+            shutil.move(filename_old, filename_new)
+
+            return True
+
+    def load_clients(self, folder=None):
+        """Load the clients from the folder."""
+        return self.load_items(folder=folder, ending='.flclient', cls=Client)
+
+    def load_client(self, folder=None, client_id=None):
+        """Load single client or return None, if it does not exist."""
+        filename = self.find_filename(folder, client_id, '.flclient')
+
+        if not os.path.isfile(filename):
+            return None
+
+        with open(filename, 'r') as f:
+            return Client.from_json(js=f.read())
+
+    def save_client(self, folder=None, client=None):
+        """Save single client."""
+        return self.save_item(
+            folder=folder,
+            item_id=client.client_id,
+            ending='.flclient',
+            content=client.to_json()
+        )
+
+    def delete_client(self, folder=None, client_id=None):
+        """Delete single client."""
+        return self.delete_item(folder=folder, item_id=client_id, ending='.flclient')
+
+    def rename_client(self, folder=None, old_client_id=None, new_client_id=None):
+        """Rename the client."""
+        return self.rename_item(
+            folder=folder,
+            old_id=old_client_id,
+            new_id=new_client_id,
+            ending='.flclient'
+        )
+
+    def move_client(self, client_id=None, old_folder=None, new_folder=None):
+        """Move the client into another folder."""
+        return self.move_item(
+            item_id=client_id,
+            old_folder=old_folder,
+            new_folder=new_folder,
+            ending='.flclient'
+        )
+
+    def load_projects(self, folder=None, lazy=False):
+        """Load the projects from the folder."""
+        if lazy:
+            return self.load_projects_lazy(folder=folder)
+
+        return self.load_items(folder=folder, ending='.flproject', cls=Project)
+
+    def load_project(self, folder=None, project_id=None):
+        """Load single project or return None, if it does not exist."""
+        filename = self.find_filename(folder, project_id, '.flproject')
+
+        if not os.path.isfile(filename):
+            return None
+
+        with open(filename, 'r') as f:
+            return Project.from_json(js=f.read())
+
+    def load_projects_lazy(self, folder=None):
+        """
+        Load the projects from the folders index, without offers and invoices.
+
+        The index file holds for every project file its modification time
+        and size, the projects own values and its summary (offer count and
+        invoice data). Only files, which changed since the index was written,
+        have to be decoded completely. The index gets rewritten afterwards,
+        if something changed.
+        """
+        path = self.data_path + folder
+
+        # check if the directory exists and cancel otherwise
+        if not os.path.isdir(str(path)):
+            return []
+
+        index_file = path + '/.flindex'
+
+        # load the old index, if possible and of this version
+        try:
+            with open(index_file, 'rb') as f:
+                js = schema.loads(f.read())
+            index = js['files'] if js['version'] == INDEX_VERSION else {}
+        except Exception:
+            index = {}
+        outdated = not index
+
+        # find the files, which changed since the last index
+        filenames = self.list_item_files(folder=folder, ending='.flproject')
+        stamps = {}
+        stale = []
+        for filename in filenames:
+            stat = os.stat(filename)
+            stamps[filename] = [stat.st_mtime_ns, stat.st_size]
+
+            record = index.get(os.path.basename(filename))
+            if record is None or record['stamp'] != stamps[filename]:
+                stale.append(filename)
+
+        # decode them fully with the pool of workers
+        failed = []
+        decoded = load_files(
+            filenames=stale,
+            decode=partial(decode_json_file, cls=Project),
+            workers=self.workers,
+            pool=self.pool,
+            failed=failed
+        )
+        self.failed_files += failed
+        decoded = dict(zip([f for f in stale if f not in failed], decoded))
+
+        out = []
+        new_index = {}
+        changed = len(stale) > 0
+        for filename in filenames:
+            file = os.path.basename(filename)
+
+            # skip files, which could not be decoded
+            if filename in failed:
+                continue
+
+            # it is decoded already, so no need for lazy loading
+            if filename in decoded:
+                project = decoded[filename]
+                new_index[file] = {
+                    'stamp': stamps[filename],
+                    'project': self.project_values(project),
+                    'summary': project.get_summary()
+                }
+                out.append(project)
+
+            else:
+                new_index[file] = index[file]
+                out.append(self.lazy_project(
+                    folder=folder,
+                    values=index[file]['project'],
+                    summary=index[file]['summary'],
+                    filename=filename
+                ))
+
+        # also rewrite it, if files were deleted
+        if changed or outdated or len(new_index) != len(index):
+            try:
+                atomic_write(
+                    filename=index_file,
+                    content=json.dumps({'version': INDEX_VERSION, 'files': new_index})
+                )
+            except Exception:
+                pass
+
+        return out
+
+    def project_values(self, project=None):
+        """Get the projects own values without offers and invoices."""
+        return {
+            'client_id': project.client_id,
+            'title': project.title,
+            'hours_per_day': project.get_hours_per_day(),
+            'work_days': project.get_work_days(),
+            'minimum_days': project.get_minimum_days(),
+            'holiday_file': project.holiday_file,
+            'wage': str(project.get_wage()),
+            'archived_offers': project.get_archived_offers(),
+            'archived_invoice_ids': project.get_archived_invoice_ids(),
+            'version': project.get_version()
+        }
+
+    def lazy_project(self, folder=None, values=None, summary=None, filename=None):
+        """Return project from the index values, which loads the rest lazily."""
+        project = Project(
+            client_id=values['client_id'],
+            title=values['title'],
+            hours_per_day=values['hours_per_day'],
+            work_days=values['work_days'],
+            minimum_days=values['minimum_days'],
+            holiday_file=values.get('holiday_file'),
+            wage=values['wage'],
+            archived_offers=values.get('archived_offers'),
+            archived_invoice_ids=values.get('archived_invoice_ids'),
+            version=values.get('version')
+        )
+        project_id = project.project_id()
+
+        project.set_loader(
+            loader=lambda: self.load_project(folder=folder, project_id=project_id),
+            summary=summary,
+            source=filename
+        )
+
+        return project
+
+    def save_project(self, folder=None, project=None):
+        """Save single project."""
+        return self.save_item(
+            folder=folder,
+            item_id=project.project_id(),
+            ending='.flproject',
+            content=project.to_json()
+        )
+
+    def delete_project(self, folder=None, project_id=None):
+        """Delete single project."""
+        return self.delete_item(folder=folder, item_id=project_id, ending='.flproject')
+
+    def rename_project(self, folder=None, old_project_id=None, new_project_id=None):
+        """Rename the project."""
+        return self.rename_item(
+            folder=folder,
+            old_id=old_project_id,
+            new_id=new_project_id,
+            ending='.flproject'
+        )
+
+    def move_project(self, project_id=None, old_folder=None, new_folder=None):
+        """Move the project into another folder."""
+        return self.move_item(
+            item_id=project_id,
+            old_folder=old_folder,
+            new_folder=new_folder,
+            ending='.flproject'
+        )
+
+
+class SQLiteStorage(object):
+    """
+    Storage holding everything in one SQLite database file.
+
+    Clients and projects get their own tables, offers, invoices and
+    their entries as well. Every table row also holds the remaining
+    values as a json string, so that the classes from_json() methods
+    can still be used for loading.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS clients ('
+        '    folder TEXT NOT NULL,'
+        '    client_id TEXT NOT NULL,'
+        '    data TEXT NOT NULL,'
+        '    PRIMARY KEY (folder, client_id)'
+        ')',
+        'CREATE TABLE IF NOT EXISTS projects ('
+        '    id INTEGER PRIMARY KEY,'
+        '    folder TEXT NOT NULL,'
+        '    project_id TEXT NOT NULL,'
+        '    client_id TEXT NOT NULL,'
+        '    title TEXT NOT NULL,'
+        '    data TEXT NOT NULL,'
+        '    summary TEXT NOT NULL,'
+        '    UNIQUE (folder, project_id)'
+        ')',
+        'CREATE INDEX IF NOT EXISTS projects_client ON projects (folder, client_id)',
+        'CREATE TABLE IF NOT EXISTS offers ('
+        '    id INTEGER PRIMARY KEY,'
+        '    project INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,'
+        '    position INTEGER NOT NULL,'
+        '    title TEXT NOT NULL,'
+        '    date TEXT,'
+        '    data TEXT NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS offers_project ON offers (project, position)',
+        'CREATE TABLE IF NOT EXISTS invoices ('
+        '    id INTEGER PRIMARY KEY,'
+        '    project INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,'
+        '    position INTEGER NOT NULL,'
+        '    invoice_id TEXT NOT NULL,'
+        '    date TEXT,'
+        '    paid_date TEXT,'
+        '    data TEXT NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS invoices_project ON invoices (project, position)',
+        'CREATE INDEX IF NOT EXISTS invoices_unpaid ON invoices (paid_date, date)',
+        'CREATE TABLE IF NOT EXISTS entries ('
+        '    id INTEGER PRIMARY KEY,'
+        '    offer INTEGER REFERENCES offers (id) ON DELETE CASCADE,'
+        '    invoice INTEGER REFERENCES invoices (id) ON DELETE CASCADE,'
+        '    position INTEGER NOT NULL,'
+        '    entry_id TEXT NOT NULL,'
+        '    data TEXT NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS entries_offer ON entries (offer, position)',
+        'CREATE INDEX IF NOT EXISTS entries_invoice ON entries (invoice, position)'
+    ]
+
+    def __init__(self, data_path=None, filename='/freelance.sqlite'):
+        """Initialize the class and create the tables, if needed."""
+        self.data_path = data_path
+        self.filename = filename
+
+        # only for the same interface like the FileStorage
+        self.failed_files = []
+        self.in_transaction = False
+
+        self.connection = sqlite3.connect(self.data_path + self.filename)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+
+        # the checks of the versions need the lock of the data_path as well
+        self.data_lock = DataLock(path=str(data_path))
+
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def read(self, load=None):
+        """Return load(), which ran while no other program was writing."""
+        return self.data_lock.read(load=load)
+
+    def begin(self):
+        """Start writing the following saves as one transaction."""
+        self.data_lock.acquire()
+        self.in_transaction = True
+
+    def commit(self):
+        """Commit the saves since begin()."""
+        self.in_transaction = False
+        self.connection.commit()
+        self.data_lock.release()
+        return True
+
+    def rollback(self):
+        """Throw away the saves since begin()."""
+        self.in_transaction = False
+        self.connection.rollback()
+        self.data_lock.release()
+
+    @contextmanager
+    def transaction(self):
+        """Run a single change (or a part of the running transaction)."""
+        if self.in_transaction:
+            yield
+            return
+
+        with self.data_lock:
+            with self.connection:
+                yield
+
+    def load_clients(self, folder=None):
+        """Load the clients from the folder."""
+        rows = self.connection.execute(
+            'SELECT data FROM clients WHERE folder = ? ORDER BY client_id',
+            (folder,)
+        )
+        return [Client.from_json(js=row[0]) for row in rows]
+
+    def load_client(self, folder=None, client_id=None):
+        """Load single client or return None, if it does not exist."""
+        row = self.connection.execute(
+            'SELECT data FROM clients WHERE folder = ? AND client_id = ?',
+            (folder, client_id)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return Client.from_json(js=row[0])
+
+    def save_client(self, folder=None, client=None):
+        """Save single client."""
+        with self.transaction():
+            self.connection.execute(
+                'INSERT OR REPLACE INTO clients (folder, client_id, data) '
+                'VALUES (?, ?, ?)',
+                (folder, client.client_id, json.dumps(client.to_dict()))
+            )
+        return True
+
+    def delete_client(self, folder=None, client_id=None):
+        """Delete single client."""
+        with self.transaction():
+            cursor = self.connection.execute(
+                'DELETE FROM clients WHERE folder = ? AND client_id = ?',
+                (folder, client_id)
+            )
+        return cursor.rowcount > 0
+
+    def rename_client(self, folder=None, old_client_id=None, new_client_id=None):
+        """Rename the client."""
+        with self.transaction():
+            self.connection.execute(
+                'UPDATE clients SET client_id = ? WHERE folder = ? AND client_id = ?',
+                (new_client_id, folder, old_client_id)
+            )
+        return True
+
+    def move_client(self, client_id=None, old_folder=None, new_folder=None):
+        """Move the client into another folder."""
+        with self.transaction():
+            # the moved client replaces an existing one, like a moved file would
+            self.connection.execute(
+                'DELETE FROM clients WHERE folder = ? AND client_id = ?',
+                (new_folder, client_id)
+            )
+            cursor = self.connection.execute(
+                'UPDATE clients SET folder = ? WHERE folder = ? AND client_id = ?',
+                (new_folder, old_folder, client_id)
+            )
+
+        # behave like the file storage, which cannot move a missing file
+        if cursor.rowcount == 0:
+            raise IOError
+        return True
+
+    def load_entry_dicts(self, column=None, parent=None):
+        """Load the entry dicts for the offer or invoice row."""
+        rows = self.connection.execute(
+            'SELECT data FROM entries WHERE {} = ? ORDER BY position'.format(column),
+            (parent,)
+        )
+        return [schema.loads(row[0]) for row in rows]
+
+    def load_projects(self, folder=None, lazy=False):
+        """Load the projects from the folder."""
+        out = []
+
+        rows = self.connection.execute(
+            'SELECT id, data, summary FROM projects WHERE folder = ? '
+            'ORDER BY project_id',
+            (folder,)
+        ).fetchall()
+
+        for row_id, data, summary in rows:
+            # only get the projects own values and load the rest later
+            if lazy:
+                project = Project.from_json(js=data)
+                project_id = project.project_id()
+                project.set_loader(
+                    loader=(
+                        lambda project_id=project_id:
+                        self.load_project(folder=folder, project_id=project_id)
+                    ),
+                    summary=schema.loads(summary),
+                    source='{}{} ({})'.format(self.data_path, self.filename, project_id)
+                )
+                out.append(project)
+
+            else:
+                out.append(
+                    Project.from_json(js=self.load_project_dict(row_id, data))
+                )
+
+        return out
+
+    def load_project(self, folder=None, project_id=None):
+        """Load single project or return None, if it does not exist."""
+        row = self.connection.execute(
+            'SELECT id, data FROM projects WHERE folder = ? AND project_id = ?',
+            (folder, project_id)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return Project.from_json(js=self.load_project_dict(row[0], row[1]))
+
+    def load_project_dict(self, row_id=None, data=None):
+        """Combine the project row with its offers, invoices and entries."""
+        js = schema.loads(data)
+
+        js['offer_list'] = []
+        for offer_row, offer_data in self.connection.execute(
+            'SELECT id, data FROM offers WHERE project = ? ORDER BY position',
+            (row_id,)
+        ).fetchall():
+            offer = schema.loads(offer_data)
+            offer['entry_list'] = self.load_entry_dicts('offer', offer_row)
+            js['offer_list'].append(offer)
+
+        js['invoice_list'] = []
+        for invoice_row, invoice_data in self.connection.execute(
+            'SELECT id, data FROM invoices WHERE project = ? ORDER BY position',
+            (row_id,)
+        ).fetchall():
+            invoice = schema.loads(invoice_data)
+            invoice['entry_list'] = self.load_entry_dicts('invoice', invoice_row)
+            js['invoice_list'].append(invoice)
+
+        return js
+
+    def insert_entries(self, column=None, parent=None, entry_list=None):
+        """Insert the entry dicts for the offer or invoice row."""
+        for position, entry in enumerate(entry_list):
+            self.connection.execute(
+                'INSERT INTO entries ({}, position, entry_id, data) '
+                'VALUES (?, ?, ?, ?)'.format(column),
+                (parent, position, str(entry.get('id', '')), json.dumps(entry))
+            )
+
+    def save_project(self, folder=None, project=None):
+        """Save single project with its offers, invoices and entries."""
+        js = project.to_dict()
+        offer_list = js.pop('offer_list')
+        invoice_list = js.pop('invoice_list')
+
+        with self.transaction():
+            # replace the old project row; offers, invoices and entries cascade
+            self.connection.execute(
+                'DELETE FROM projects WHERE folder = ? AND project_id = ?',
+                (folder, project.project_id())
+            )
+            row_id = self.connection.execute(
+                'INSERT INTO projects '
+                '(folder, project_id, client_id, title, data, summary) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    folder,
+                    project.project_id(),
+                    project.client_id,
+                    project.title,
+                    json.dumps(js),
+                    json.dumps(project.get_summary())
+                )
+            ).lastrowid
+
+            for position, offer in enumerate(offer_list):
+                entry_list = offer.pop('entry_list', [])
+                offer_row = self.connection.execute(
+                    'INSERT INTO offers (project, position, title, date, data) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (row_id, position, offer['title'], offer['date'], json.dumps(offer))
+                ).lastrowid
+                self.insert_entries('offer', offer_row, entry_list)
+
+            for position, invoice in enumerate(invoice_list):
+                entry_list = invoice.pop('entry_list', [])
+                invoice_row = self.connection.execute(
+                    'INSERT INTO invoices '
+                    '(project, position, invoice_id, date, paid_date, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        row_id,
+                        position,
+                        invoice['id'],
+                        invoice['date'],
+                        invoice['paid_date'],
+                        json.dumps(invoice)
+                    )
+                ).lastrowid
+                self.insert_entries('invoice', invoice_row, entry_list)
+
+        return True
+
+    def delete_project(self, folder=None, project_id=None):
+        """Delete single project."""
+        with self.transaction():
+            cursor = self.connection.execute(
+                'DELETE FROM projects WHERE folder = ? AND project_id = ?',
+                (folder, project_id)
+            )
+        return cursor.rowcount > 0
+
+    def rename_project(self, folder=None, old_project_id=None, new_project_id=None):
+        """Rename the project."""
+        with self.transaction():
+            self.connection.execute(
+                'UPDATE projects SET project_id = ? WHERE folder = ? AND project_id = ?',
+                (new_project_id, folder, old_project_id)
+            )
+        return True
+
+    def move_project(self, project_id=None, old_folder=None, new_folder=None):
+        """Move the project into another folder."""
+        with self.transaction():
+            # the moved project replaces an existing one, like a moved file would
+            self.connection.execute(
+                'DELETE FROM projects WHERE folder = ? AND project_id = ?',
+                (new_folder, project_id)
+            )
+            cursor = self.connection.execute(
+                'UPDATE projects SET folder = ? WHERE folder = ? AND project_id = ?',
+                (new_folder, old_folder, project_id)
+            )
+
+        # behave like the file storage, which cannot move a missing file
+        if cursor.rowcount == 0:
+            raise IOError
+        return True
+
+
+def migrate(source=None, target=None, folders=None):
+    """Copy clients and projects of the folders from one storage to another."""
+    count = 0
+
+    # write everything or nothing
+    target.begin()
+    try:
+        for client_folder, project_folder in folders:
+            for client in source.load_clients(folder=client_folder):
+                target.save_client(folder=client_folder, client=client)
+                count += 1
+
+            for project in source.load_projects(folder=project_folder):
+                target.save_project(folder=project_folder, project=project)
+                count += 1
+    except Exception:
+        target.rollback()
+        raise
+
+    target.commit()
+
+    return count
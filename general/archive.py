@@ -0,0 +1,210 @@
+"""
+Compressed, append-only archive of old paid invoices and offers.
+
+Paid invoices and offers dated before a cutoff can be moved out of the
+project files into yearly segment files (e.g. data_path/archive/2017.flarchive).
+Every archiving run appends a new gzip member with one json line per item
+to the segment of the items year, so archived data never gets rewritten.
+Each line holds the values of the project as well, so that the totals of
+an archived item can be calculated without its project. The projects only
+keep the number of archived offers and the archived invoice ids, so that
+the counters of the replacer stay the same.
+"""
+
+from clients.project import Project
+from general import schema
+import gzip
+import json
+import os
+from offer.offerinvoice import Invoice
+from offer.offerinvoice import Offer
+
+
+ARCHIVE_ENDING = '.flarchive'
+
+
+def project_values(project=None):
+    """Get the projects own values without offers and invoices."""
+    return {
+        'client_id': project.client_id,
+        'title': project.title,
+        'hours_per_day': project.get_hours_per_day(),
+        'work_days': project.get_work_days(),
+        'minimum_days': project.get_minimum_days(),
+        'holiday_file': project.holiday_file,
+        'wage': str(project.get_wage())
+    }
+
+
+def is_archivable(item=None, cutoff=None):
+    """Check if the offer or the paid invoice is dated before the cutoff."""
+    if item.get_date() is None or item.get_date() >= cutoff:
+        return False
+
+    if type(item) is Invoice:
+        return item.get_paid_date() is not None
+
+    return True
+
+
+class Archive(object):
+    """The yearly segment files of archived invoices and offers."""
+
+    def __init__(self, data_path=None, archive_dir='/archive'):
+        """Initialize the class."""
+        self.path = data_path + archive_dir
+
+        # decoded segments: year: list of (project, item) tuples
+        self.segments = {}
+
+    def gen_filename(self, year=None):
+        """Generate the filename of the segment for the year."""
+        return self.path + '/' + str(year) + ARCHIVE_ENDING
+
+    def get_years(self):
+        """Return the years with a segment, newest first."""
+        if not os.path.isdir(self.path):
+            return []
+
+        years = []
+        for file in os.listdir(self.path):
+            try:
+                years.append(int(file[:-len(ARCHIVE_ENDING)]))
+            except Exception:
+                pass
+
+        return sorted(years, reverse=True)
+
+    def append(self, project=None, items=None):
+        """Append the offers and invoices of the project to their segments."""
+        lines = {}
+        for item in items:
+            record = {
+                'kind': 'invoice' if type(item) is Invoice else 'offer',
+                'project': project_values(project),
+                'item': item.to_dict()
+            }
+            lines.setdefault(item.get_date().year, []).append(
+                json.dumps(record, sort_keys=True) + '\n'
+            )
+
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+        # every append is a gzip member of its own, the old ones stay untouched
+        for year, year_lines in lines.items():
+            with open(self.gen_filename(year), 'ab') as f:
+                with gzip.GzipFile(fileobj=f, mode='ab') as g:
+                    g.write(''.join(year_lines).encode('utf-8'))
+
+                # the items get removed from the project after this
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.segments.pop(year, None)
+
+        return True
+
+    def read_lines(self, year=None):
+        """Return the json lines of the segment without duplicates."""
+        lines = []
+        try:
+            with gzip.open(self.gen_filename(year), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    lines.append(line)
+        except Exception:
+            # keep everything before a truncated member
+            pass
+
+        # an interrupted archiving run may have appended items twice
+        return list(dict.fromkeys(line for line in lines if line.endswith('\n')))
+
+    def decode_line(self, line=None):
+        """Return (project, item) of the json line."""
+        record = schema.loads(line)
+        project = Project.from_json(js=record['project'])
+
+        if record['kind'] == 'invoice':
+            return (project, Invoice.from_json(js=record['item']))
+        else:
+            return (project, Offer.from_json(js=record['item']))
+
+    def load_year(self, year=None):
+        """Return list of (project, item) tuples of the year."""
+        if year not in self.segments:
+            out = []
+            for line in self.read_lines(year):
+                try:
+                    out.append(self.decode_line(line))
+                except Exception:
+                    pass
+            self.segments[year] = out
+
+        return self.segments[year]
+
+    def get_invoices(self, year=None):
+        """Return list of (project, invoice) tuples of the year."""
+        return [
+            (project, item) for project, item in self.load_year(year)
+            if type(item) is Invoice
+        ]
+
+    def search(self, text=None):
+        """Return (project, item) tuples, whose json contains the text."""
+        text = str(text).lower()
+        out = []
+
+        for year in self.get_years():
+            # check the raw lines first, so only matches get decoded
+            for line in self.read_lines(year):
+                if text not in line.lower():
+                    continue
+                try:
+                    out.append(self.decode_line(line))
+                except Exception:
+                    pass
+
+        return out
+
+
+def archive_list(global_list=None, archive=None, cutoff=None):
+    """
+    Move old offers and paid invoices of the lists projects into the archive.
+
+    Returns the number of archived items or False on error.
+    """
+    count = 0
+
+    for project in list(global_list.project_list):
+        offers = [o for o in project.get_offer_list() if is_archivable(o, cutoff)]
+        invoices = [i for i in project.get_invoice_list() if is_archivable(i, cutoff)]
+
+        if not offers and not invoices:
+            continue
+
+        # append first: after an interruption items are doubled, not lost
+        try:
+            archive.append(project=project, items=offers + invoices)
+        except Exception:
+            return False
+
+        project.set_archived_offers(project.get_archived_offers() + len(offers))
+        project.set_archived_invoice_ids(
+            project.get_archived_invoice_ids() + [i.id for i in invoices]
+        )
+        project.set_offer_list(
+            [o for o in project.get_offer_list() if o not in offers]
+        )
+        project.set_invoice_list(
+            [i for i in project.get_invoice_list() if i not in invoices]
+        )
+
+        try:
+            if not global_list.save_project_to_file(project=project):
+                return False
+        except Exception:
+            return False
+
+        count += len(offers) + len(invoices)
+
+    return count
@@ -0,0 +1,83 @@
+"""A simple command line program to archive old paid invoices and offers."""
+
+import argparse
+from clients.list import List
+from clients.storage import get_storage
+from datetime import date
+from datetime import datetime
+from general.archive import Archive
+from general.archive import archive_list
+from general.settings import Settings
+import os
+
+
+def archiver(data_path=None, cutoff=None):
+    """Archive the old items of the active and inactive projects."""
+    # cancel if the data_path does not exist
+    if not os.path.isdir(str(data_path)):
+        return False
+
+    settings = Settings(data_path=data_path)
+    global_list = List(
+        data_path=data_path,
+        storage=get_storage(
+            data_path=data_path,
+            backend=settings.storage,
+            shard=settings.get_storage_shard()
+        )
+    )
+    archive = Archive(data_path=data_path)
+
+    count = 0
+    for the_list in [global_list, global_list.get_inactive_list(settings=settings)]:
+        archived = archive_list(global_list=the_list, archive=archive, cutoff=cutoff)
+        if archived is False:
+            return False
+        count += archived
+
+    return count
+
+
+def main():
+    """Main programm, when started directly."""
+    # getting the arguments
+    args = argparse.ArgumentParser(
+        description=(
+            'A simple command line programm for moving paid invoices and '
+            'offers dated before the cutoff into compressed yearly archive files.'
+        )
+    )
+
+    args.add_argument(
+        '-d',
+        '--data_path',
+        default=os.path.expanduser('~') + '/.tagirijus_freelance',
+        help='the data_path of the Freelance database'
+    )
+
+    args.add_argument(
+        '-c',
+        '--cutoff',
+        default=date(date.today().year - 1, 1, 1).strftime('%Y-%m-%d'),
+        help='archive everything dated before this date (YYYY-MM-DD)'
+    )
+
+    args = args.parse_args()
+
+    try:
+        cutoff = datetime.strptime(args.cutoff, '%Y-%m-%d').date()
+    except Exception:
+        print('The cutoff has to be a date like 2017-01-01.')
+        return
+
+    # pass the arguments to the main function
+    count = archiver(data_path=args.data_path, cutoff=cutoff)
+
+    if count is False:
+        print('Something went wrong while archiving.')
+    else:
+        print('Successfully archived {} invoices and offers!'.format(count))
+
+
+if __name__ == '__main__':
+    main()
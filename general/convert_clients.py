@@ -67,7 +67,7 @@ def load_clients(directory=None):
             f.close()
 
             # convert file content to Client object and append it
-            out.append(Client().from_json(js=load))
+            out.append(Client.from_json(js=load))
 
     return out
 
@@ -0,0 +1,100 @@
+"""A simple command line program to move the database between storage backends."""
+
+import argparse
+from clients.storage import BACKENDS
+from clients.storage import get_storage
+from clients.storage import migrate
+import os
+
+
+def converter(
+    data_path=None,
+    source=None,
+    target=None,
+    inactive_dir='/inactive',
+    client_dir='/clients',
+    project_dir='/projects'
+):
+    """Copy active and inactive clients and projects into the target storage."""
+    is_dir = os.path.isdir(str(data_path))
+    backends_ok = source in BACKENDS and target in BACKENDS
+
+    # cancel if the data_path does not exist or the backends are unknown / the same
+    if not is_dir or not backends_ok or source == target:
+        return False
+
+    folders = [
+        (client_dir, project_dir),
+        (client_dir + inactive_dir, project_dir + inactive_dir)
+    ]
+
+    return migrate(
+        source=get_storage(data_path=data_path, backend=source),
+        target=get_storage(data_path=data_path, backend=target),
+        folders=folders
+    )
+
+
+def main():
+    """Main programm, when started directly."""
+    # getting the arguments
+    args = argparse.ArgumentParser(
+        description=(
+            'A simple command line programm for moving the Freelance '
+            'clients and projects from one storage backend to another.'
+        )
+    )
+
+    args.add_argument(
+        '-d',
+        '--data_path',
+        default=os.path.expanduser('~') + '/.tagirijus_freelance',
+        help='the data_path of the Freelance database'
+    )
+
+    args.add_argument(
+        '-s',
+        '--source',
+        default='file',
+        choices=BACKENDS,
+        help='the storage backend to load from'
+    )
+
+    args.add_argument(
+        '-t',
+        '--target',
+        default='sqlite',
+        choices=BACKENDS,
+        help='the storage backend to save into'
+    )
+
+    args.add_argument(
+        '-i',
+        '--inactive_dir',
+        default='/inactive',
+        help='the inactive dir as set in the Freelance settings'
+    )
+
+    args = args.parse_args()
+
+    # pass the arguments to the main function
+    count = converter(
+        data_path=args.data_path,
+        source=args.source,
+        target=args.target,
+        inactive_dir=args.inactive_dir
+    )
+
+    if count is False:
+        print('Something went wrong while converting.')
+    else:
+        print('Successfully moved {} clients and projects!'.format(count))
+        print(
+            'Set "storage" to "{}" in freelance.settings to use it.'.format(
+                args.target
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
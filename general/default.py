@@ -1,7 +1,8 @@
 """The class holding all the default texts."""
 
 from decimal import Decimal
-import json
+from general import schema
+from general.journal import atomic_write
 from offer.quantitytime import QuantityTime
 import os
 
@@ -9,6 +10,71 @@ import os
 class Default(object):
     """Settings class."""
 
+    # json key, attribute (private ones are set with their set_ method), kind
+    FIELDS = (
+        ('language', 'language', None),
+        ('offer_title', 'offer_title', None),
+        ('offer_comment', 'offer_comment', None),
+        ('offer_comment_b', 'offer_comment_b', None),
+        ('offer_filename', 'offer_filename', None),
+        ('offer_round_price', '_offer_round_price', None),
+        ('offer_templates', '_offer_templates', None),
+        ('invoice_title', 'invoice_title', None),
+        ('invoice_id', 'invoice_id', None),
+        ('invoice_comment', 'invoice_comment', None),
+        ('invoice_comment_b', 'invoice_comment_b', None),
+        ('invoice_filename', 'invoice_filename', None),
+        ('invoice_round_price', '_invoice_round_price', None),
+        ('invoice_templates', '_invoice_templates', None),
+        ('invoice_due_days', '_invoice_due_days', None),
+        ('invoice_delivery', 'invoice_delivery', None),
+        ('invoice_ledger_comment', 'invoice_ledger_comment', None),
+        ('date_fmt', 'date_fmt', None),
+        ('commodity', 'commodity', None),
+        ('client_id', 'client_id', None),
+        ('client_company', 'client_company', None),
+        ('client_company_b', 'client_company_b', None),
+        ('client_attention', 'client_attention', None),
+        ('client_salutation', 'client_salutation', None),
+        ('client_name', 'client_name', None),
+        ('client_family_name', 'client_family_name', None),
+        ('client_street', 'client_street', None),
+        ('client_post_code', 'client_post_code', None),
+        ('client_city', 'client_city', None),
+        ('client_country', 'client_country', None),
+        ('client_tax_id', 'client_tax_id', None),
+        ('client_language', 'client_language', None),
+        ('project_title', 'project_title', None),
+        ('project_hours_per_day', '_project_hours_per_day', None),
+        ('project_work_days', '_project_work_days', None),
+        ('project_minimum_days', '_project_minimum_days', None),
+        ('project_wage', '_project_wage', 'float'),
+        ('baseentry_title', 'baseentry_title', None),
+        ('baseentry_comment', 'baseentry_comment', None),
+        ('baseentry_quantity', '_baseentry_quantity', 'str'),
+        ('baseentry_quantity_format', 'baseentry_quantity_format', None),
+        ('baseentry_quantity_b', '_baseentry_quantity_b', 'str'),
+        ('baseentry_quantity_b_format', 'baseentry_quantity_b_format', None),
+        ('baseentry_time', '_baseentry_time', 'str'),
+        ('baseentry_price', '_baseentry_price', 'float'),
+        ('multiplyentry_title', 'multiplyentry_title', None),
+        ('multiplyentry_comment', 'multiplyentry_comment', None),
+        ('multiplyentry_quantity', '_multiplyentry_quantity', 'str'),
+        ('multiplyentry_quantity_format', 'multiplyentry_quantity_format', None),
+        ('multiplyentry_quantity_b', '_multiplyentry_quantity_b', 'str'),
+        ('multiplyentry_quantity_b_format', 'multiplyentry_quantity_b_format', None),
+        ('multiplyentry_hour_rate', '_multiplyentry_hour_rate', 'str'),
+        ('connectentry_title', 'connectentry_title', None),
+        ('connectentry_comment', 'connectentry_comment', None),
+        ('connectentry_quantity', '_connectentry_quantity', 'str'),
+        ('connectentry_quantity_format', 'connectentry_quantity_format', None),
+        ('connectentry_quantity_b', '_connectentry_quantity_b', 'str'),
+        ('connectentry_quantity_b_format', 'connectentry_quantity_b_format', None),
+        ('connectentry_is_time', '_connectentry_is_time', None),
+        ('connectentry_multiplicator', '_connectentry_multiplicator', 'float'),
+        ('ledger_time_def_quantity', 'ledger_time_def_quantity', None)
+    )
+
     def __init__(
         self,
         data_path=None,
@@ -432,278 +498,24 @@ class Default(object):
 
     def to_json(self, indent=2):
         """Convert settings data to json format."""
-        out = {}
-
-        # fetch all setting variables
-        out['language'] = self.language
-
-        out['offer_title'] = self.offer_title
-        out['offer_comment'] = self.offer_comment
-        out['offer_comment_b'] = self.offer_comment_b
-        out['offer_filename'] = self.offer_filename
-        out['offer_round_price'] = self._offer_round_price
-        out['offer_templates'] = self._offer_templates
-
-        out['invoice_title'] = self.invoice_title
-        out['invoice_id'] = self.invoice_id
-        out['invoice_comment'] = self.invoice_comment
-        out['invoice_comment_b'] = self.invoice_comment_b
-        out['invoice_filename'] = self.invoice_filename
-        out['invoice_round_price'] = self._invoice_round_price
-        out['invoice_templates'] = self._invoice_templates
-        out['invoice_due_days'] = self._invoice_due_days
-        out['invoice_delivery'] = self.invoice_delivery
-        out['invoice_ledger_comment'] = self.invoice_ledger_comment
-
-        out['date_fmt'] = self.date_fmt
-        out['commodity'] = self.commodity
-
-        out['client_id'] = self.client_id
-        out['client_company'] = self.client_company
-        out['client_company_b'] = self.client_company_b
-        out['client_attention'] = self.client_attention
-        out['client_salutation'] = self.client_salutation
-        out['client_name'] = self.client_name
-        out['client_family_name'] = self.client_family_name
-        out['client_street'] = self.client_street
-        out['client_post_code'] = self.client_post_code
-        out['client_city'] = self.client_city
-        out['client_country'] = self.client_country
-        out['client_tax_id'] = self.client_tax_id
-        out['client_language'] = self.client_language
-
-        out['project_title'] = self.project_title
-        out['project_hours_per_day'] = self._project_hours_per_day
-        out['project_work_days'] = self._project_work_days
-        out['project_minimum_days'] = self._project_minimum_days
-        out['project_wage'] = float(self._project_wage)
-
-        out['baseentry_title'] = self.baseentry_title
-        out['baseentry_comment'] = self.baseentry_comment
-        out['baseentry_quantity'] = str(self._baseentry_quantity)
-        out['baseentry_quantity_format'] = self.baseentry_quantity_format
-        out['baseentry_quantity_b'] = str(self._baseentry_quantity_b)
-        out['baseentry_quantity_b_format'] = self.baseentry_quantity_b_format
-        out['baseentry_time'] = str(self._baseentry_time)
-        out['baseentry_price'] = float(self._baseentry_price)
-
-        out['multiplyentry_title'] = self.multiplyentry_title
-        out['multiplyentry_comment'] = self.multiplyentry_comment
-        out['multiplyentry_quantity'] = str(self._multiplyentry_quantity)
-        out['multiplyentry_quantity_format'] = self.multiplyentry_quantity_format
-        out['multiplyentry_quantity_b'] = str(self._multiplyentry_quantity_b)
-        out['multiplyentry_quantity_b_format'] = self.multiplyentry_quantity_b_format
-        out['multiplyentry_hour_rate'] = str(self._multiplyentry_hour_rate)
-
-        out['connectentry_title'] = self.connectentry_title
-        out['connectentry_comment'] = self.connectentry_comment
-        out['connectentry_quantity'] = str(self._connectentry_quantity)
-        out['connectentry_quantity_format'] = self.connectentry_quantity_format
-        out['connectentry_quantity_b'] = str(self._connectentry_quantity_b)
-        out['connectentry_quantity_b_format'] = self.connectentry_quantity_b_format
-        out['connectentry_is_time'] = self._connectentry_is_time
-        out['connectentry_multiplicator'] = float(self._connectentry_multiplicator)
-
-        out['ledger_time_def_quantity'] = self.ledger_time_def_quantity
-
-        # return the json
-        return json.dumps(out, indent=indent, sort_keys=True)
+        return schema.dumps(
+            schema.encode(self, self.FIELDS, typed=False),
+            indent=indent,
+            ensure_ascii=True
+        )
 
     def feed_json(self, js=None):
         """Feed settings variables from json string."""
         if js is None:
             return
 
-        # get js as dict
-        try:
-            js = json.loads(js)
-        except Exception:
-            # do not load it
+        # get js as dict or do not load it
+        js = schema.load_dict(js)
+        if js is None:
             return
 
         # feed settings variables
-        if 'language' in js.keys():
-            self.language = js['language']
-
-        if 'offer_title' in js.keys():
-            self.offer_title = js['offer_title']
-
-        if 'offer_comment' in js.keys():
-            self.offer_comment = js['offer_comment']
-
-        if 'offer_comment_b' in js.keys():
-            self.offer_comment_b = js['offer_comment_b']
-
-        if 'offer_filename' in js.keys():
-            self.offer_filename = js['offer_filename']
-
-        if 'offer_round_price' in js.keys():
-            self.set_offer_round_price(js['offer_round_price'])
-
-        if 'offer_templates' in js.keys():
-            self._offer_templates = js['offer_templates']
-
-        if 'invoice_title' in js.keys():
-            self.invoice_title = js['invoice_title']
-
-        if 'invoice_id' in js.keys():
-            self.invoice_id = js['invoice_id']
-
-        if 'invoice_comment' in js.keys():
-            self.invoice_comment = js['invoice_comment']
-
-        if 'invoice_comment_b' in js.keys():
-            self.invoice_comment_b = js['invoice_comment_b']
-
-        if 'invoice_filename' in js.keys():
-            self.invoice_filename = js['invoice_filename']
-
-        if 'invoice_round_price' in js.keys():
-            self.set_invoice_round_price(js['invoice_round_price'])
-
-        if 'invoice_templates' in js.keys():
-            self._invoice_templates = js['invoice_templates']
-
-        if 'invoice_due_days' in js.keys():
-            self.set_invoice_due_days(js['invoice_due_days'])
-
-        if 'invoice_delivery' in js.keys():
-            self.invoice_delivery = js['invoice_delivery']
-
-        if 'invoice_ledger_comment' in js.keys():
-            self.invoice_ledger_comment = js['invoice_ledger_comment']
-
-        if 'date_fmt' in js.keys():
-            self.date_fmt = js['date_fmt']
-
-        if 'commodity' in js.keys():
-            self.commodity = js['commodity']
-
-        if 'client_id' in js.keys():
-            self.client_id = js['client_id']
-
-        if 'client_company' in js.keys():
-            self.client_company = js['client_company']
-
-        if 'client_company_b' in js.keys():
-            self.client_company_b = js['client_company_b']
-
-        if 'client_attention' in js.keys():
-            self.client_attention = js['client_attention']
-
-        if 'client_salutation' in js.keys():
-            self.client_salutation = js['client_salutation']
-
-        if 'client_name' in js.keys():
-            self.client_name = js['client_name']
-
-        if 'client_family_name' in js.keys():
-            self.client_family_name = js['client_family_name']
-
-        if 'client_street' in js.keys():
-            self.client_street = js['client_street']
-
-        if 'client_post_code' in js.keys():
-            self.client_post_code = js['client_post_code']
-
-        if 'client_city' in js.keys():
-            self.client_city = js['client_city']
-
-        if 'client_country' in js.keys():
-            self.client_country = js['client_country']
-
-        if 'client_tax_id' in js.keys():
-            self.client_tax_id = js['client_tax_id']
-
-        if 'client_language' in js.keys():
-            self.client_language = js['client_language']
-
-        if 'project_title' in js.keys():
-            self.project_title = js['project_title']
-
-        if 'project_hours_per_day' in js.keys():
-            self.set_project_hours_per_day(js['project_hours_per_day'])
-
-        if 'project_work_days' in js.keys():
-            self.set_project_work_days(js['project_work_days'])
-
-        if 'project_minimum_days' in js.keys():
-            self.set_project_minimum_days(js['project_minimum_days'])
-
-        if 'project_wage' in js.keys():
-            self.set_project_wage(js['project_wage'])
-
-        if 'baseentry_title' in js.keys():
-            self.baseentry_title = js['baseentry_title']
-
-        if 'baseentry_comment' in js.keys():
-            self.baseentry_comment = js['baseentry_comment']
-
-        if 'baseentry_quantity' in js.keys():
-            self.set_baseentry_quantity(js['baseentry_quantity'])
-
-        if 'baseentry_quantity_format' in js.keys():
-            self.baseentry_quantity_format = js['baseentry_quantity_format']
-
-        if 'baseentry_quantity_b' in js.keys():
-            self.set_baseentry_quantity_b(js['baseentry_quantity_b'])
-
-        if 'baseentry_quantity_b_format' in js.keys():
-            self.baseentry_quantity_b_format = js['baseentry_quantity_b_format']
-
-        if 'baseentry_time' in js.keys():
-            self.set_baseentry_time(js['baseentry_time'])
-
-        if 'baseentry_price' in js.keys():
-            self.set_baseentry_price(js['baseentry_price'])
-
-        if 'multiplyentry_title' in js.keys():
-            self.multiplyentry_title = js['multiplyentry_title']
-
-        if 'multiplyentry_comment' in js.keys():
-            self.multiplyentry_comment = js['multiplyentry_comment']
-
-        if 'multiplyentry_quantity' in js.keys():
-            self.set_multiplyentry_quantity(js['multiplyentry_quantity'])
-
-        if 'multiplyentry_quantity_format' in js.keys():
-            self.multiplyentry_quantity_format = js['multiplyentry_quantity_format']
-
-        if 'multiplyentry_quantity_b' in js.keys():
-            self.set_multiplyentry_quantity_b(js['multiplyentry_quantity_b'])
-
-        if 'multiplyentry_quantity_b_format' in js.keys():
-            self.multiplyentry_quantity_b_format = js['multiplyentry_quantity_b_format']
-
-        if 'multiplyentry_hour_rate' in js.keys():
-            self.set_multiplyentry_hour_rate(js['multiplyentry_hour_rate'])
-
-        if 'connectentry_title' in js.keys():
-            self.connectentry_title = js['connectentry_title']
-
-        if 'connectentry_comment' in js.keys():
-            self.connectentry_comment = js['connectentry_comment']
-
-        if 'connectentry_quantity' in js.keys():
-            self.set_connectentry_quantity(js['connectentry_quantity'])
-
-        if 'connectentry_quantity_format' in js.keys():
-            self.connectentry_quantity_format = js['connectentry_quantity_format']
-
-        if 'connectentry_quantity_b' in js.keys():
-            self.set_connectentry_quantity_b(js['connectentry_quantity_b'])
-
-        if 'connectentry_quantity_b_format' in js.keys():
-            self.connectentry_quantity_b_format = js['connectentry_quantity_b_format']
-
-        if 'connectentry_is_time' in js.keys():
-            self.set_connectentry_is_time(js['connectentry_is_time'])
-
-        if 'connectentry_multiplicator' in js.keys():
-            self.set_connectentry_multiplicator(js['connectentry_multiplicator'])
-
-        if 'ledger_time_def_quantity' in js.keys():
-            self.ledger_time_def_quantity = js['ledger_time_def_quantity']
+        schema.feed(self, js, self.FIELDS)
 
     def gen_abs_path_to_default_file(self, data_path, lang=None):
         """Generate the absolut path to the settings file."""
@@ -720,9 +532,10 @@ class Default(object):
 
     def save_defaults_to_file(self, data_path):
         """Save the default to file in data_path."""
-        f = open(self.gen_abs_path_to_default_file(data_path), 'w')
-        f.write(self.to_json())
-        f.close()
+        atomic_write(
+            filename=self.gen_abs_path_to_default_file(data_path),
+            content=self.to_json()
+        )
 
     def load_settings_from_file(self, data_path):
         """Load the settings from file in data_path."""
@@ -0,0 +1,195 @@
+"""
+Crash-safe file writing.
+
+Single files get written into a temp file next to them, which gets
+flushed to disk and renamed over the original afterwards. This way a
+file is always either the old or the new version, never a half written
+one.
+
+Several files can be written (or removed) as one transaction with the
+Journal. Their new contents are staged in a journal folder first. When all of them are
+on disk, a commit record gets written and the files are renamed into
+place. If the program dies in between, recover() on the next start either
+finishes the renames (commit record exists) or throws the staged files
+away (no commit record).
+"""
+
+import json
+import os
+import tempfile
+
+
+def fsync_dir(path=None):
+    """Flush the directory entry (renames) to disk, if the system allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except Exception:
+        return
+
+    try:
+        os.fsync(fd)
+    except Exception:
+        pass
+    finally:
+        os.close(fd)
+
+
+def get_umask():
+    """Return the umask of the process (it can only be read by setting it)."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# read once, since setting it is not thread safe
+UMASK = get_umask()
+
+
+def set_mode(fd=None, filename=None):
+    """
+    Give the temp file of fd the permissions, filename gets.
+
+    mkstemp() creates files, only the owner can read. The file keeps the
+    mode of the file it replaces, new files get the usual 0666 & ~umask,
+    so shared data paths stay readable for the others.
+    """
+    try:
+        mode = os.stat(filename).st_mode & 0o7777
+    except Exception:
+        mode = 0o666 & ~UMASK
+
+    # not every system has fchmod
+    try:
+        os.fchmod(fd, mode)
+    except Exception:
+        pass
+
+
+def write_synced(filename=None, content=None):
+    """Write the content into the file and flush it to disk."""
+    with open(filename, 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def atomic_write(filename=None, content=None):
+    """Write the content into a temp file and rename it to filename."""
+    path = os.path.dirname(os.path.abspath(filename))
+
+    fd, tmp = tempfile.mkstemp(dir=path, prefix='.', suffix='.tmp')
+    set_mode(fd, filename)
+    os.close(fd)
+
+    try:
+        write_synced(filename=tmp, content=content)
+        os.replace(tmp, filename)
+    except Exception:
+        if os.path.isfile(tmp):
+            os.remove(tmp)
+        raise
+
+    fsync_dir(path)
+
+    return True
+
+
+class Journal(object):
+    """Transaction for writing several files at once."""
+
+    def __init__(self, path=None):
+        """Initialize the class."""
+        self.path = path
+        self.commit_file = path + '/commit.json'
+        self.staged = []
+
+        # finish or throw away the last transaction, if it was interrupted
+        self.recover()
+
+    def make_folder(self):
+        """Create the journal folder, if it does not exist."""
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def write(self, filename=None, content=None):
+        """Stage the new content for the file."""
+        self.make_folder()
+
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.staged')
+        set_mode(fd, filename)
+        os.close(fd)
+
+        write_synced(filename=tmp, content=content)
+        self.staged.append([tmp, os.path.abspath(filename)])
+
+        return True
+
+    def remove(self, filename=None):
+        """Stage the removal of the file."""
+        self.staged.append([None, os.path.abspath(filename)])
+
+        return True
+
+    def commit(self):
+        """Write the commit record and rename the staged files into place."""
+        if not self.staged:
+            return True
+
+        # from now on the transaction counts as done
+        self.make_folder()
+        atomic_write(filename=self.commit_file, content=json.dumps(self.staged))
+
+        self.apply()
+        self.staged = []
+
+        return True
+
+    def rollback(self):
+        """Throw away the staged files."""
+        for tmp, filename in self.staged:
+            if tmp is not None and os.path.isfile(tmp):
+                os.remove(tmp)
+
+        self.staged = []
+
+    def apply(self):
+        """Rename the files of the commit record and remove the record."""
+        with open(self.commit_file, 'r') as f:
+            staged = json.load(f)
+
+        dirs = set()
+        for tmp, filename in staged:
+            # staged removal (maybe done already before an interruption)
+            if tmp is None:
+                if os.path.isfile(filename):
+                    os.remove(filename)
+                    dirs.add(os.path.dirname(filename))
+                continue
+
+            # already renamed before an interruption
+            if not os.path.isfile(tmp):
+                continue
+
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+
+            os.replace(tmp, filename)
+            dirs.add(os.path.dirname(filename))
+
+        for path in dirs:
+            fsync_dir(path)
+
+        os.remove(self.commit_file)
+
+    def recover(self):
+        """Finish a committed transaction and clean up staged files."""
+        if not os.path.isdir(self.path):
+            return
+
+        if os.path.isfile(self.commit_file):
+            self.apply()
+
+        # everything left over was never committed
+        for file in os.listdir(self.path):
+            if file.endswith('.staged') or file.endswith('.tmp'):
+                os.remove(os.path.join(self.path, file))
@@ -61,13 +61,10 @@ def generate_parameter(
     # get name and price into list of tuples, if single_account == ''
     entries = []
     if single_account == '':
-        for e in invoice.get_entry_list():
+        for row in invoice.evaluate_entries(project=project):
+            e = row['entry']
             name = e.title.replace('"', '\\"')
-            price = e.get_price(
-                entry_list=invoice.get_entry_list(),
-                wage=invoice.get_wage(project=project),
-                round_price=invoice.get_round_price()
-            )
+            price = row['price']
 
             entries.append(
                 (
@@ -81,11 +78,7 @@ def generate_parameter(
 
             # also add a posting for the tax, if it exists
 
-            tax = e.get_price_tax(
-                entry_list=invoice.get_entry_list(),
-                wage=invoice.get_wage(project=project),
-                round_prive=invoice.get_round_price()
-            )
+            tax = row['tax']
 
             if tax != 0:
                 # append a posting for tax as well
@@ -0,0 +1,102 @@
+"""A simple command line program measuring the json conversion of a synthetic database."""
+
+import argparse
+from clients.client import Client
+from clients.project import Project
+from general.memory_benchmark import make_database
+from general import schema
+import time
+
+
+def best_time(run=None, repeat=3):
+    """Return the fastest of repeat runs in seconds."""
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        run()
+        needed = time.perf_counter() - start
+        best = needed if best is None else min(best, needed)
+    return best
+
+
+def benchmark(clients=10, projects=10, entries=50, repeat=3):
+    """Return dict with the seconds for writing and loading the database json."""
+    client_list, project_list = make_database(
+        clients=clients,
+        projects=projects,
+        entries=entries
+    )
+
+    client_texts = [c.to_json() for c in client_list]
+    project_texts = [p.to_json() for p in project_list]
+
+    def load():
+        for text in client_texts:
+            Client.from_json(js=text)
+        for text in project_texts:
+            Project.from_json(js=text)
+
+    def write():
+        for client in client_list:
+            client.to_json()
+        for project in project_list:
+            project.to_json()
+
+    return {
+        'entries': clients * projects * entries * 2,
+        'json_library': 'orjson' if schema.orjson is not None else 'json',
+        'load_seconds': best_time(load, repeat),
+        'write_seconds': best_time(write, repeat)
+    }
+
+
+def main():
+    """Main programm, when started directly."""
+    # getting the arguments
+    args = argparse.ArgumentParser(
+        description=(
+            'A simple command line programm for measuring the json loading '
+            'and writing of a synthetic Freelance database.'
+        )
+    )
+
+    args.add_argument(
+        '-c',
+        '--clients',
+        default=10,
+        type=int,
+        help='number of clients'
+    )
+
+    args.add_argument(
+        '-p',
+        '--projects',
+        default=10,
+        type=int,
+        help='number of projects per client'
+    )
+
+    args.add_argument(
+        '-e',
+        '--entries',
+        default=50,
+        type=int,
+        help='number of entries per offer and invoice'
+    )
+
+    args = args.parse_args()
+
+    result = benchmark(
+        clients=args.clients,
+        projects=args.projects,
+        entries=args.entries
+    )
+
+    print('Entries:      {}'.format(result['entries']))
+    print('JSON library: {}'.format(result['json_library']))
+    print('Loading:      {:.3f} s'.format(result['load_seconds']))
+    print('Writing:      {:.3f} s'.format(result['write_seconds']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Functions for reading and decoding many files concurrently."""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from general import schema
+import os
+
+
+POOLS = ['thread', 'process']
+
+
+def list_files(path=None, ending=None):
+    """Return the sorted filenames in path with the given ending."""
+    # check if the directory exists and cancel otherwise
+    if not os.path.isdir(str(path)):
+        return []
+
+    return [
+        os.path.join(path, file)
+        for file in sorted(os.listdir(path))
+        if file.endswith(ending)
+    ]
+
+
+def decode_json_file(filename=None, cls=None):
+    """Read the file and convert its json content with the from_json of cls."""
+    with open(filename, 'rb') as f:
+        load = f.read()
+
+    # check the json here already, since from_json falls back to a default
+    return cls.from_json(js=schema.loads(load))
+
+
+def decode_safe(decode=None, filename=None):
+    """Decode the file and return (True, object) or (False, None) on error."""
+    try:
+        out = decode(filename)
+    except Exception:
+        return (False, None)
+
+    return (out is not False, out)
+
+
+def load_files(filenames=None, decode=None, workers=None, pool='thread', failed=None):
+    """
+    Decode the files with a pool of workers and return the objects.
+
+    The objects are returned in the order of the filenames. Files which
+    cannot be decoded are skipped and their filenames are appended to the
+    failed list, if one is given. With workers <= 1 everything is done in
+    the current thread. The 'process' pool needs decode to be picklable.
+    """
+    filenames = [] if filenames is None else filenames
+    workers = 1 if workers is None else int(workers)
+
+    run = partial(decode_safe, decode)
+
+    # load them one by one, if there is no need for a pool
+    if workers <= 1 or len(filenames) <= 1:
+        results = [run(filename) for filename in filenames]
+
+    else:
+        executor = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+        with executor(max_workers=min(workers, len(filenames))) as ex:
+            results = list(ex.map(run, filenames))
+
+    out = []
+    for filename, (ok, obj) in zip(filenames, results):
+        if ok:
+            out.append(obj)
+        elif failed is not None:
+            failed.append(filename)
+
+    return out
@@ -0,0 +1,117 @@
+"""
+Advisory locking of the data_path, so that several programs can use it.
+
+Writers hold an exclusive lock on data_path/.fllock while they check the
+version of an object and save it. They also count the generation in
+data_path/.flgeneration up: to an odd number before writing and to an
+even number afterwards. Readers do not lock at all: they read the
+generation before and after loading and load again, if a writer was busy
+in the meantime. Only if that keeps failing (e.g. a writer died in the
+middle), they wait for a shared lock.
+
+The locks use fcntl and are only advisory. Without fcntl (Windows)
+only the generation is used.
+"""
+
+from general.journal import set_mode
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class DataLock(object):
+    """Reentrant lock of a data_path with a generation counter."""
+
+    def __init__(self, path=None):
+        """Initialize the class."""
+        self.lock_file = path + '/.fllock'
+        self.generation_file = path + '/.flgeneration'
+        self.fd = None
+        self.depth = 0
+        self.shared = False
+
+    def get_generation(self):
+        """Get the generation of the data_path."""
+        try:
+            with open(self.generation_file, 'r') as f:
+                return int(f.read())
+        except Exception:
+            return 0
+
+    def set_generation(self, value=None):
+        """Set the generation of the data_path."""
+        # readers only compare it, so there is no need to sync it to disk
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(self.generation_file),
+            prefix='.',
+            suffix='.tmp'
+        )
+        set_mode(fd, self.generation_file)
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(value))
+        os.replace(tmp, self.generation_file)
+
+    def acquire(self, shared=False):
+        """Wait for the lock (or just count up, if it is held already)."""
+        if self.depth == 0:
+            self.fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT)
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self.shared = shared
+
+            # readers have to load again from now on
+            if not shared:
+                self.set_generation(self.get_generation() | 1)
+
+        self.depth += 1
+
+    def release(self):
+        """Release the lock, if it was acquired as often as released."""
+        if self.depth == 0:
+            return
+
+        self.depth -= 1
+        if self.depth > 0:
+            return
+
+        try:
+            if not self.shared:
+                self.set_generation(self.get_generation() + 1)
+        finally:
+            # closing the file releases the lock
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        """Acquire the exclusive lock."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        """Release the lock."""
+        self.release()
+
+    def read(self, load=None, retries=20, wait=0.05):
+        """Return load(), which ran while no writer was busy."""
+        # the own writes are consistent already
+        if self.depth > 0:
+            return load()
+
+        for i in range(retries):
+            before = self.get_generation()
+            if before % 2 == 0:
+                out = load()
+                if self.get_generation() == before:
+                    return out
+            time.sleep(wait)
+
+        self.acquire(shared=True)
+        try:
+            return load()
+        finally:
+            self.release()
@@ -0,0 +1,161 @@
+"""
+A simple command line program measuring the memory of a synthetic database.
+
+The database gets measured twice: as built in memory and as loaded from
+the files again, like the program does it (with the saved state of the
+objects), since this is what the program needs at runtime.
+"""
+
+import argparse
+from clients.client import Client
+from clients.list import List
+from clients.project import Project
+from datetime import date
+from offer.entries import BaseEntry
+from offer.entries import ConnectEntry
+from offer.entries import MultiplyEntry
+from offer.offerinvoice import Invoice
+from offer.offerinvoice import Offer
+import tempfile
+import tracemalloc
+
+
+def make_entries(count=None):
+    """Return list with count entries of all types."""
+    out = []
+    for i in range(count):
+        if i % 3 == 0:
+            out.append(BaseEntry(title='Base', quantity=i, time='1:30', price=100))
+        elif i % 3 == 1:
+            out.append(MultiplyEntry(title='Multiply', quantity=i, hour_rate=0.5))
+        else:
+            out.append(ConnectEntry(title='Connect', quantity=1, multiplicator=0.1))
+    return out
+
+
+def make_database(clients=None, projects=None, entries=None):
+    """Return clients and projects with offers and invoices full of entries."""
+    client_list = []
+    project_list = []
+
+    for c in range(clients):
+        client_id = 'C{:04d}'.format(c)
+        client_list.append(Client(client_id=client_id, company='Company'))
+
+        for p in range(projects):
+            project = Project(client_id=client_id, title='Project {}'.format(p))
+            offer = Offer(title='Offer', date=date(2017, 1, 1))
+            offer.set_entry_list(make_entries(entries))
+            project.append_offer(offer)
+            invoice = Invoice(title='Invoice', id=str(p), date=date(2017, 2, 1))
+            invoice.set_entry_list(make_entries(entries))
+            project.append_invoice(invoice)
+            project_list.append(project)
+
+    return client_list, project_list
+
+
+def measure(build=None):
+    """Return the object build() returns and the bytes allocated for it."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    out = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return out, after - before
+
+
+def benchmark(clients=10, projects=10, entries=50):
+    """
+    Return dict with the bytes per entry and the bytes of the whole database.
+
+    'built' are the values of the new objects, 'loaded' the ones of the
+    objects, which the List loaded from the saved files.
+    """
+    count = clients * projects * entries * 2
+
+    (client_list, project_list), built_bytes = measure(
+        lambda: make_database(clients=clients, projects=projects, entries=entries)
+    )
+
+    with tempfile.TemporaryDirectory() as data_path:
+        List(
+            data_path=data_path,
+            client_list=client_list,
+            project_list=project_list
+        ).save_all()
+        del client_list, project_list
+
+        loaded, loaded_bytes = measure(lambda: List(data_path=data_path))
+
+    return {
+        'entries': count,
+        'built': {
+            'bytes_per_entry': built_bytes / count,
+            'database_bytes': built_bytes
+        },
+        'loaded': {
+            'bytes_per_entry': loaded_bytes / count,
+            'database_bytes': loaded_bytes
+        }
+    }
+
+
+def main():
+    """Main programm, when started directly."""
+    # getting the arguments
+    args = argparse.ArgumentParser(
+        description=(
+            'A simple command line programm for measuring the memory of '
+            'a synthetic Freelance database.'
+        )
+    )
+
+    args.add_argument(
+        '-c',
+        '--clients',
+        default=10,
+        type=int,
+        help='number of clients'
+    )
+
+    args.add_argument(
+        '-p',
+        '--projects',
+        default=10,
+        type=int,
+        help='number of projects per client'
+    )
+
+    args.add_argument(
+        '-e',
+        '--entries',
+        default=50,
+        type=int,
+        help='number of entries per offer and invoice'
+    )
+
+    args = args.parse_args()
+
+    result = benchmark(
+        clients=args.clients,
+        projects=args.projects,
+        entries=args.entries
+    )
+
+    built = result['built']
+    loaded = result['loaded']
+    print('Entries:         {}'.format(result['entries']))
+    print('                 {:>10} {:>10}'.format('built', 'loaded'))
+    print('Bytes per entry: {:>10.0f} {:>10.0f}'.format(
+        built['bytes_per_entry'],
+        loaded['bytes_per_entry']
+    ))
+    print('Whole database:  {:>7.1f} MB {:>7.1f} MB'.format(
+        built['database_bytes'] / 1e6,
+        loaded['database_bytes'] / 1e6
+    ))
+
+
+if __name__ == '__main__':
+    main()
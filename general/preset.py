@@ -1,5 +1,11 @@
 """Class for preset management."""
 
+from general.journal import atomic_write
+from general.loader import list_files
+from general.lock import DataLock
+from general.loader import load_files
+from general.snapshot import load_files_cached
+from general.watcher import file_stamp
 import json
 from offer.offerinvoice import Offer
 from offer.offerinvoice import Invoice
@@ -7,7 +13,6 @@ from offer.entries import BaseEntry
 from offer.entries import MultiplyEntry
 from offer.entries import ConnectEntry
 import os
-import shutil
 
 
 class Preset(object):
@@ -23,7 +28,10 @@ class Preset(object):
         invoice_dir='/presets_invoice',
         invoice_list=None,
         invoice_entry_dir='/presets_invoice_entry',
-        invoice_entry_list=None
+        invoice_entry_list=None,
+        workers=None,
+        pool=None,
+        snapshot=False
     ):
         """Initialize the class."""
         self.data_path = data_path
@@ -32,6 +40,22 @@ class Preset(object):
         if not is_dir:
             raise IOError
 
+        # the files get read and decoded by a pool of workers
+        self.workers = 1 if workers is None else workers
+        self.pool = 'thread' if pool is None else pool
+
+        # keep the decoded presets of every folder in a binary snapshot
+        self.snapshot = snapshot
+
+        # filenames, which could not be decoded while loading
+        self.failed_files = []
+
+        # stamps of the files written by the presets (for the watcher)
+        self.written = {}
+
+        # other programs may use the data_path at the same time
+        self.data_lock = DataLock(path=str(data_path))
+
         self.offer_dir = offer_dir
         self.offer_list = (
             self.load_offer_list_from_file()
@@ -299,22 +323,18 @@ class Preset(object):
         if not is_dir and not is_file:
             os.mkdir(path)
 
-        # generate filenames
+        # generate filename
         filename = path + '/' + self.us(str(name)) + ending
-        filename_bu = path + '/' + self.us(str(name)) + ending + '_bu'
-
-        # if it already exists, save a backup
-        if os.path.isfile(filename):
-            shutil.copy2(filename, filename_bu)
 
         try:
             # generate file content
             content = item.copy()
             content['item'] = content['item'].to_dict()
 
-            # write the file
-            with open(filename, 'w') as f:
-                f.write(json.dumps(content, indent=2))
+            # replace the file crash-safe
+            with self.data_lock:
+                atomic_write(filename=filename, content=json.dumps(content, indent=2))
+            self.written[os.path.abspath(filename)] = file_stamp(filename)
 
             return True
         except Exception:
@@ -347,23 +367,23 @@ class Preset(object):
 
         # convert item json to Offer
         if typ == 'Offer':
-            dic['item'] = Offer().from_json(js=dic['item'])
+            dic['item'] = Offer.from_json(js=dic['item'])
 
         # convert item json to Invoice
         elif typ == 'Invoice':
-            dic['item'] = Invoice().from_json(js=dic['item'])
+            dic['item'] = Invoice.from_json(js=dic['item'])
 
         # convert item json to BaseEntry
         elif typ == 'BaseEntry':
-            dic['item'] = BaseEntry().from_json(js=dic['item'])
+            dic['item'] = BaseEntry.from_json(js=dic['item'])
 
         # convert item json to MultiplyEntry
         elif typ == 'MultiplyEntry':
-            dic['item'] = MultiplyEntry().from_json(js=dic['item'])
+            dic['item'] = MultiplyEntry.from_json(js=dic['item'])
 
         # convert item json to ConnectEntry
         elif typ == 'ConnectEntry':
-            dic['item'] = ConnectEntry().from_json(js=dic['item'])
+            dic['item'] = ConnectEntry.from_json(js=dic['item'])
 
         # otherwise cancel
         else:
@@ -380,17 +400,16 @@ class Preset(object):
         except Exception:
             return False
 
-        # generate filenames
+        # generate filename
         filename = path + '/' + self.us(str(name)) + ending
-        filename_bu = path + '/' + self.us(str(name)) + ending + '_bu'
 
-        # if it exists, backup and delete
-        if os.path.isfile(filename):
-            shutil.copy2(filename, filename_bu)
-            os.remove(filename)
-            return True
-        else:
-            return False
+        # if it exists, delete it
+        with self.data_lock:
+            if os.path.isfile(filename):
+                os.remove(filename)
+                return True
+            else:
+                return False
 
     def remove_item(self, item_list=None, path=None, ending=None, name=None):
         """Remove item from list and delete file."""
@@ -479,21 +498,24 @@ class Preset(object):
 
     def load_item_list_from_file(self, path=None, ending=None):
         """Load item list from file and return list."""
-        # check if the directory exists and cancel otherwise
-        if not os.path.isdir(str(path)):
-            return []
-
-        # cycle through the files and append them converted from json to the list
-        out = []
-        for file in sorted(os.listdir(path)):
-            if file.endswith(ending):
-                # load and convert file content to item and append it
-                out.append(
-                    self.load_item_from_file(filename=os.path.join(path, file))
-                )
-
-        # return filtered list - filter out the failed loaded data
-        return list(filter(lambda x: x is not False, out))
+        # the failed loaded data gets filtered out and reported
+        if self.snapshot:
+            return load_files_cached(
+                filenames=list_files(path=path, ending=ending),
+                decode=self.load_item_from_file,
+                snapshot=path + '/.flsnapshot' + ending,
+                workers=self.workers,
+                pool=self.pool,
+                failed=self.failed_files
+            )
+
+        return load_files(
+            filenames=list_files(path=path, ending=ending),
+            decode=self.load_item_from_file,
+            workers=self.workers,
+            pool=self.pool,
+            failed=self.failed_files
+        )
 
     def save_offer_list_to_file(self):
         """Save offer list to file."""
@@ -550,6 +572,79 @@ class Preset(object):
         self.save_invoice_list_to_file()
         self.save_invoice_entry_list_to_file()
 
+    def get_watch_paths(self):
+        """Return the directories, which hold the preset files."""
+        return [
+            self.data_path + self.offer_dir,
+            self.data_path + self.offer_entry_dir,
+            self.data_path + self.invoice_dir,
+            self.data_path + self.invoice_entry_dir
+        ]
+
+    def apply_file_changes(self, changes=None):
+        """
+        Patch the preset lists with files changed by other programs.
+
+        changes is a list of (kind, filename) tuples from a watcher. Only
+        these files get loaded again. Returns True, if something changed.
+        """
+        if not changes:
+            return False
+
+        lists = {
+            os.path.abspath(self.data_path + self.offer_dir): (
+                self.offer_list, '.floffer'
+            ),
+            os.path.abspath(self.data_path + self.offer_entry_dir): (
+                self.offer_entry_list, '.flentry'
+            ),
+            os.path.abspath(self.data_path + self.invoice_dir): (
+                self.invoice_list, '.flinvoice'
+            ),
+            os.path.abspath(self.data_path + self.invoice_entry_dir): (
+                self.invoice_entry_list, '.flentry'
+            )
+        }
+
+        changed = False
+        for kind, filename in changes:
+            path = os.path.dirname(os.path.abspath(filename))
+            if path not in lists or not filename.endswith(lists[path][1]):
+                continue
+
+            # skip own saves
+            stamp = self.written.get(os.path.abspath(filename))
+            if kind != 'removed' and stamp is not None and stamp == file_stamp(filename):
+                continue
+
+            item_list, ending = lists[path]
+
+            # find the loaded preset of this file
+            position = None
+            for i, item in enumerate(item_list):
+                if self.us(str(item['name'])) + ending == os.path.basename(filename):
+                    position = i
+                    break
+
+            if kind == 'removed':
+                if position is not None:
+                    item_list.pop(position)
+                    changed = True
+                continue
+
+            item = self.load_item_from_file(filename=filename)
+            if item is False:
+                self.failed_files.append(filename)
+                continue
+
+            if position is None:
+                item_list.append(item)
+            else:
+                item_list[position] = item
+            changed = True
+
+        return changed
+
     def reload(self, data_path=None):
         """Reload the presets."""
         is_dir = os.path.isdir(str(data_path))
@@ -94,25 +94,25 @@ def replacer(
         all_clients = all_list.client_list
         all_projects = all_list.project_list
 
-        # get all offers
-        all_offers = set([off for o in all_projects for off in o.get_offer_list()])
+        # count all offers (without loading lazy projects completely)
+        offer_count = sum([o.get_offer_count() for o in all_projects])
 
-        # get all invoices
-        all_invoices = set([inv for i in all_projects for inv in i.get_invoice_list()])
+        # get all invoice ids
+        all_invoice_ids = [inv_id for i in all_projects for inv_id in i.get_invoice_ids()]
 
         # general count stuff
         replace_me['CLIENT_COUNT'] = str(len(all_clients) + 1)
         replace_me['PROJECT_COUNT'] = str(len(all_projects) + 1)
         replace_me['OFFER_COUNT'] = str(
-            settings.get_offer_count_offset() + len(all_offers) + 1
+            settings.get_offer_count_offset() + offer_count + 1
         )
         replace_me['INVOICE_COUNT'] = str(
-            settings.get_invoice_count_offset() + len(all_invoices) + 1
+            settings.get_invoice_count_offset() + len(all_invoice_ids) + 1
         )
 
         # try to get highest invoice id from existing ID strings
         got_ids = [0]
-        for inv_id in [inv.id for inv in all_invoices]:
+        for inv_id in all_invoice_ids:
             try:
                 got_ids.append(int(inv_id))
             except Exception:
@@ -125,8 +125,8 @@ def replacer(
     # project related
     if is_project:
         replace_me['PROJECT_TITLE'] = project.title
-        replace_me['PROJECT_OFFER_COUNT'] = str(len(project.get_offer_list()) + 1)
-        replace_me['PROJECT_INVOICE_COUNT'] = str(len(project.get_invoice_list()) + 1)
+        replace_me['PROJECT_OFFER_COUNT'] = str(project.get_offer_count() + 1)
+        replace_me['PROJECT_INVOICE_COUNT'] = str(len(project.get_invoice_ids()) + 1)
 
     # client related
     if is_client:
@@ -221,7 +221,8 @@ def replacer(
         # finish date and days
         replace_me['FINISH_DATE'], replace_me['FINISH_DAYS'] = (
             offerinvoice.get_finish_date_and_days(
-                project=project
+                project=project,
+                settings=settings
             )
         )
 
@@ -0,0 +1,91 @@
+"""A simple command line program to move the files into another shard layout."""
+
+import argparse
+from clients.storage import get_storage
+import os
+
+
+def resharder(
+    data_path=None,
+    shard=0,
+    inactive_dir='/inactive',
+    client_dir='/clients',
+    project_dir='/projects'
+):
+    """Move active and inactive client and project files into the layout."""
+    # cancel if the data_path does not exist or the shard is invalid
+    if not os.path.isdir(str(data_path)) or shard < 0:
+        return False
+
+    storage = get_storage(data_path=data_path, backend='file', shard=shard)
+
+    folders = [
+        (client_dir, '.flclient'),
+        (project_dir, '.flproject'),
+        (client_dir + inactive_dir, '.flclient'),
+        (project_dir + inactive_dir, '.flproject')
+    ]
+
+    try:
+        return sum(
+            storage.reshard(folder=folder, ending=ending)
+            for folder, ending in folders
+        )
+    except Exception:
+        return False
+
+
+def main():
+    """Main programm, when started directly."""
+    # getting the arguments
+    args = argparse.ArgumentParser(
+        description=(
+            'A simple command line programm for moving the Freelance '
+            'client and project files into shard directories (or back).'
+        )
+    )
+
+    args.add_argument(
+        '-d',
+        '--data_path',
+        default=os.path.expanduser('~') + '/.tagirijus_freelance',
+        help='the data_path of the Freelance database'
+    )
+
+    args.add_argument(
+        '-s',
+        '--shard',
+        default=2,
+        type=int,
+        help='the length of the ID prefix for the shard directories (0 = flat)'
+    )
+
+    args.add_argument(
+        '-i',
+        '--inactive_dir',
+        default='/inactive',
+        help='the inactive dir as set in the Freelance settings'
+    )
+
+    args = args.parse_args()
+
+    # pass the arguments to the main function
+    count = resharder(
+        data_path=args.data_path,
+        shard=args.shard,
+        inactive_dir=args.inactive_dir
+    )
+
+    if count is False:
+        print('Something went wrong while resharding.')
+    else:
+        print('Successfully moved {} client and project files!'.format(count))
+        print(
+            'Set "storage_shard" to {} in freelance.settings to use it.'.format(
+                args.shard
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
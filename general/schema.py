@@ -0,0 +1,181 @@
+"""
+Table-driven conversion between the objects and their json dicts.
+
+Every class describes its json keys in a FIELDS table of (key, attribute,
+kind) tuples. The key is the json key and also the name of the constructor
+argument, the attribute is read for encoding (methods like get_id get
+called) and the kind tells how the value gets converted:
+
+    None            the value as it is
+    'str'           str() on encoding (Decimal, QuantityTime)
+    'float'         float() on encoding (Decimal)
+    'date'          ISO date string <-> datetime.date, invalid ones are None
+    'set'           sorted list on encoding, set on decoding
+    tuple of names  list of objects with one of these 'type' values
+
+The classes register themselves with register(), so that lists of objects
+can be decoded without importing their modules here. If orjson is
+installed, it is used for parsing and writing the json.
+"""
+
+from datetime import date
+from datetime import datetime
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# registered classes: type name: class
+TYPES = {}
+
+
+def register(cls=None):
+    """Register the class for decoding lists of its objects."""
+    TYPES[cls.__name__] = cls
+    return cls
+
+
+def loads(text=None):
+    """Parse the json text (str or bytes)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumps(data=None, indent=2, ensure_ascii=False):
+    """Return the json text with sorted keys, like json.dumps() does."""
+    # orjson only writes the same text for indent=2 and unescaped unicode
+    if orjson is not None and indent == 2 and not ensure_ascii:
+        try:
+            return orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+            ).decode('utf-8')
+        except Exception:
+            pass
+
+    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, sort_keys=True)
+
+
+def load_dict(js=None):
+    """Return js as dict, parse it if needed or return None on error."""
+    if type(js) is dict:
+        return js
+
+    try:
+        js = loads(js)
+    except Exception:
+        return None
+
+    return js if type(js) is dict else None
+
+
+def parse_date(value=None):
+    """Convert 'YYYY-MM-DD' into a date or return None."""
+    try:
+        # slicing is much faster than strptime for the format, we write
+        if len(value) == 10 and value[4] == '-' and value[7] == '-':
+            return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except Exception:
+        return None
+
+
+def format_date(value=None):
+    """Convert the date into 'YYYY-MM-DD' or return None."""
+    try:
+        return value.strftime('%Y-%m-%d')
+    except Exception:
+        return None
+
+
+def decode_list(value=None, types=None):
+    """Convert list of dicts into list of objects of the allowed types."""
+    out = []
+    for item in value:
+        # items without or with an unknown type are skipped
+        if item.get('type') in types:
+            out.append(TYPES[item['type']].from_json(js=item))
+    return out
+
+
+def encode_list(value=None):
+    """Convert list of objects into list of dicts."""
+    out = []
+    for item in value:
+        try:
+            out.append(item.to_dict())
+        except Exception:
+            out.append(item)
+    return out
+
+
+DECODERS = {
+    'date': parse_date,
+    'set': set
+}
+
+ENCODERS = {
+    'str': str,
+    'float': float,
+    'date': format_date,
+    'set': sorted
+}
+
+
+def decode_value(kind=None, value=None):
+    """Convert the json value according to the kind."""
+    if kind is None or kind == 'str' or kind == 'float':
+        return value
+    if type(kind) is tuple:
+        return decode_list(value, kind)
+    return DECODERS[kind](value)
+
+
+def encode_value(kind=None, value=None):
+    """Convert the value into a json value according to the kind."""
+    if kind is None:
+        return value
+    if type(kind) is tuple:
+        return encode_list(value)
+    return ENCODERS[kind](value)
+
+
+def decode(js=None, fields=None):
+    """Return dict of constructor arguments for the keys, which exist in js."""
+    out = {}
+    for key, attribute, kind in fields:
+        if key in js:
+            out[key] = decode_value(kind, js[key])
+    return out
+
+
+def encode(obj=None, fields=None, typed=True):
+    """Return the json dict of the object, if typed with its class name as 'type'."""
+    out = {'type': obj.__class__.__name__} if typed else {}
+    for key, attribute, kind in fields:
+        value = getattr(obj, attribute)
+        if callable(value):
+            value = value()
+        out[key] = encode_value(kind, value)
+    return out
+
+
+def feed(obj=None, js=None, fields=None):
+    """
+    Set the attributes of obj for the keys, which exist in js.
+
+    Private attributes are set with their set_ method.
+    """
+    for key, attribute, kind in fields:
+        if key not in js:
+            continue
+
+        value = decode_value(kind, js[key])
+        if attribute.startswith('_'):
+            getattr(obj, 'set' + attribute)(value)
+        else:
+            setattr(obj, attribute, value)
@@ -1,6 +1,7 @@
 """The class holding all the settings (language, paths, etc.)."""
 
 from general.default import Default
+from general.journal import atomic_write
 import json
 import os
 
@@ -23,7 +24,14 @@ class Settings(object):
         ledgeradd_def_payee=None,
         ledger_alias_file=None,
         ledger_alias_default_account=None,
-        ledger_time_command=None
+        ledger_time_command=None,
+        storage=None,
+        load_workers=None,
+        load_pool=None,
+        watch_files=None,
+        snapshot_cache=None,
+        storage_shard=None,
+        holiday_file=None
     ):
         """Initialize the class and hard code defaults, if no file is given."""
         self.BASE_PATH = os.path.dirname(os.path.realpath(__file__))[
@@ -44,6 +52,15 @@ class Settings(object):
         self.generate_data_path()
 
         self.inactive_dir = '/inactive' if inactive_dir is None else inactive_dir
+        self.storage = 'file' if storage is None else str(storage)
+        self._load_workers = 8                  # set default
+        self.set_load_workers(load_workers)     # try to set arguments value
+        self.load_pool = 'thread' if load_pool is None else str(load_pool)
+        self.watch_files = False if watch_files is None else bool(watch_files)
+        self.snapshot_cache = True if snapshot_cache is None else bool(snapshot_cache)
+        self._storage_shard = 0                 # set default
+        self.set_storage_shard(storage_shard)   # try to set arguments value
+        self.holiday_file = '' if holiday_file is None else str(holiday_file)
         self._languages = ['en']                # set default
         self.set_languages(languages)           # try to set arguments value
         self._def_language = 'en'               # set default
@@ -148,6 +165,32 @@ class Settings(object):
         """Get invoice_count_offset."""
         return self._invoice_count_offset
 
+    def set_load_workers(self, value):
+        """Set load_workers."""
+        try:
+            self._load_workers = int(value)
+            if self._load_workers <= 0:
+                self._load_workers = 1
+        except Exception:
+            pass
+
+    def get_load_workers(self):
+        """Get load_workers."""
+        return self._load_workers
+
+    def set_storage_shard(self, value):
+        """Set storage_shard."""
+        try:
+            self._storage_shard = int(value)
+            if self._storage_shard < 0:
+                self._storage_shard = 0
+        except Exception:
+            pass
+
+    def get_storage_shard(self):
+        """Get storage_shard."""
+        return self._storage_shard
+
     def remove_default(self, language=None, client_list=None):
         """Remove the default."""
         one_not_set = language is None or client_list is None
@@ -227,6 +270,13 @@ class Settings(object):
         # fetch all setting variables
         out['data_path'] = self.data_path
         out['inactive_dir'] = self.inactive_dir
+        out['storage'] = self.storage
+        out['load_workers'] = self._load_workers
+        out['load_pool'] = self.load_pool
+        out['watch_files'] = self.watch_files
+        out['snapshot_cache'] = self.snapshot_cache
+        out['storage_shard'] = self._storage_shard
+        out['holiday_file'] = self.holiday_file
         out['languages'] = self._languages
         out['def_language'] = self._def_language
         out['offer_count_offset'] = self._offer_count_offset
@@ -266,6 +316,27 @@ class Settings(object):
         if 'inactive_dir' in js.keys():
             self.inactive_dir = js['inactive_dir']
 
+        if 'storage' in js.keys():
+            self.storage = js['storage']
+
+        if 'load_workers' in js.keys():
+            self.set_load_workers(js['load_workers'])
+
+        if 'load_pool' in js.keys():
+            self.load_pool = js['load_pool']
+
+        if 'watch_files' in js.keys():
+            self.watch_files = bool(js['watch_files'])
+
+        if 'snapshot_cache' in js.keys():
+            self.snapshot_cache = bool(js['snapshot_cache'])
+
+        if 'storage_shard' in js.keys():
+            self.set_storage_shard(js['storage_shard'])
+
+        if 'holiday_file' in js.keys():
+            self.holiday_file = str(js['holiday_file'])
+
         if 'languages' in js.keys():
             self.set_languages(js['languages'])
 
@@ -322,14 +393,16 @@ class Settings(object):
         self.generate_data_path()
 
         # save the path to BASE_PATH/data_path.flsettings
-        f = open(self.BASE_PATH + '/data_path.flsettings', 'w')
-        f.write(self.data_path)
-        f.close()
+        atomic_write(
+            filename=self.BASE_PATH + '/data_path.flsettings',
+            content=self.data_path
+        )
 
         # save settings to the data_path
-        f = open(self.gen_abs_path_to_settings_file(), 'w')
-        f.write(self.to_json())
-        f.close()
+        atomic_write(
+            filename=self.gen_abs_path_to_settings_file(),
+            content=self.to_json()
+        )
 
         # save defaults
         try:
@@ -0,0 +1,174 @@
+"""
+Binary snapshot of decoded files for a fast start.
+
+A snapshot file holds the decoded objects of a folder (pickled) together
+with a manifest of the modification time and size of their source files.
+On loading only the files, which changed since the snapshot was written,
+get decoded from json again. The snapshot gets rewritten in a background
+thread afterwards, if something changed.
+"""
+
+from general import schema
+from general.journal import set_mode
+from general.loader import load_files
+from general.watcher import file_stamp
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+
+# raise it, if the pickled classes change in a way, get_layout() does not see
+SNAPSHOT_VERSION = 2
+
+# running writer threads
+writers = []
+
+
+def get_layout():
+    """
+    Return the version of the snapshots with a hash of the pickled classes.
+
+    These are the registered classes (see general/schema.py) and the
+    QuantityTime of the entries. A new slot or json field changes the
+    hash, so older snapshots do not give objects without it.
+    """
+    from offer.quantitytime import QuantityTime
+
+    classes = sorted(
+        list(schema.TYPES.values()) + [QuantityTime],
+        key=lambda cls: (cls.__module__, cls.__name__)
+    )
+
+    layout = []
+    for cls in classes:
+        slots = []
+        for parent in cls.__mro__:
+            slots += list(getattr(parent, '__slots__', ()))
+        fields = [field[0] for field in getattr(cls, 'FIELDS', ())]
+        layout.append((cls.__module__, cls.__name__, slots, fields))
+
+    return '{}-{}'.format(
+        SNAPSHOT_VERSION,
+        hashlib.sha1(repr(layout).encode('utf-8')).hexdigest()
+    )
+
+
+def read_snapshot(filename=None):
+    """Return the manifest and the objects of the snapshot or empty dicts."""
+    try:
+        with open(filename, 'rb') as f:
+            snapshot = pickle.load(f)
+
+        if snapshot['version'] == get_layout():
+            return snapshot['stamps'], snapshot['items']
+    except Exception:
+        pass
+
+    return {}, {}
+
+
+def write_snapshot(filename=None, data=None):
+    """Write the pickled snapshot data into the file."""
+    # it is only a cache, so no need for syncing it to disk
+    try:
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(filename),
+            prefix='.',
+            suffix='.tmp'
+        )
+        set_mode(fd, filename)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, filename)
+    except Exception:
+        pass
+
+
+def write_snapshot_in_background(filename=None, stamps=None, items=None):
+    """Pickle the snapshot now and write it in a background thread."""
+    # pickle it here, so that later changes of the objects do not interfere
+    data = pickle.dumps(
+        {'version': get_layout(), 'stamps': stamps, 'items': items},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+    writer = threading.Thread(target=write_snapshot, args=(filename, data))
+    writer.daemon = True
+    writer.start()
+    writers.append(writer)
+
+    return writer
+
+
+def wait_for_snapshots():
+    """Wait till all snapshots are written."""
+    while writers:
+        writers.pop().join()
+
+
+def load_files_cached(
+    filenames=None,
+    decode=None,
+    snapshot=None,
+    workers=None,
+    pool='thread',
+    failed=None
+):
+    """
+    Like load_files(), but take unchanged objects from the snapshot file.
+
+    The filenames should be in the same folder as the snapshot.
+    """
+    old_stamps, old_items = read_snapshot(snapshot)
+
+    stamps = {}
+    stale = []
+    for filename in filenames:
+        file = os.path.basename(filename)
+        stamps[file] = file_stamp(filename)
+
+        if file not in old_items or old_stamps.get(file) != stamps[file]:
+            stale.append(filename)
+
+    # decode the changed files
+    failed_now = []
+    decoded = load_files(
+        filenames=stale,
+        decode=decode,
+        workers=workers,
+        pool=pool,
+        failed=failed_now
+    )
+    decoded = dict(zip(
+        [os.path.basename(f) for f in stale if f not in failed_now],
+        decoded
+    ))
+
+    if failed is not None:
+        failed += failed_now
+
+    out = []
+    items = {}
+    for filename in filenames:
+        file = os.path.basename(filename)
+
+        if file in decoded:
+            items[file] = decoded[file]
+        elif file in old_items and filename not in failed_now:
+            items[file] = old_items[file]
+        else:
+            continue
+
+        out.append(items[file])
+
+    # rewrite it, if files changed or got removed
+    if decoded or len(items) != len(old_items):
+        write_snapshot_in_background(
+            filename=snapshot,
+            stamps={f: stamps[f] for f in items},
+            items=items
+        )
+
+    return out
@@ -0,0 +1,403 @@
+"""
+Change tracking and copying for the objects, which get saved into files.
+
+The objects keep their attributes in __slots__ to save memory, so the
+functions here get the attributes with get_fields() instead of vars().
+"""
+
+import copy
+
+
+# the slot names of every class, collected on first use
+SLOTS = {}
+
+# the saved state of saved objects without changes
+CLEAN = ()
+
+
+def slot_names(cls=None):
+    """Return the names of the slots of the class and its bases."""
+    if cls not in SLOTS:
+        names = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get('__slots__', ())
+            if type(slots) is str:
+                slots = (slots,)
+            names += [n for n in slots if n not in ['__dict__', '__weakref__']]
+        SLOTS[cls] = tuple(names)
+
+    return SLOTS[cls]
+
+
+def get_fields(obj=None):
+    """Return dict with the set attributes of the object (slots and __dict__)."""
+    out = {}
+    for name in slot_names(type(obj)):
+        try:
+            out[name] = getattr(obj, name)
+        except AttributeError:
+            pass
+
+    if hasattr(obj, '__dict__'):
+        out.update(vars(obj))
+
+    return out
+
+
+def has_fields(value=None):
+    """Check if the value is an object with own attributes (like QuantityTime)."""
+    if callable(value):
+        return False
+
+    return hasattr(value, '__dict__') or len(slot_names(type(value))) > 0
+
+
+def snapshot_value(value=None):
+    """
+    Return a comparable snapshot of the value.
+
+    Tracked objects stay themselves (they are compared by identity and
+    check their own changes), containers and other mutable objects (like
+    QuantityTime) get converted into tuples of their content.
+    """
+    if isinstance(value, Tracked):
+        return value
+
+    if type(value) in [list, tuple]:
+        return tuple(snapshot_value(v) for v in value)
+
+    if type(value) in [set, frozenset]:
+        return frozenset(value)
+
+    if type(value) is dict:
+        return tuple((k, snapshot_value(v)) for k, v in value.items())
+
+    if has_fields(value):
+        # caches (like the fixed-point value of QuantityTime) are no changes
+        untracked = getattr(type(value), 'UNTRACKED', ())
+        return (type(value), snapshot_value({
+            k: v for k, v in get_fields(value).items() if k not in untracked
+        }))
+
+    return value
+
+
+def copy_value(value=None):
+    """
+    Return a copy of the value for a structural copy.
+
+    Tracked objects get copied with their own copy() method, containers
+    get copied with copied content and other mutable objects (like
+    QuantityTime) get a shallow copy. Immutable values (like str, Decimal
+    or date) and functions are shared.
+    """
+    if isinstance(value, Tracked):
+        return value.copy()
+
+    if type(value) is list:
+        return [copy_value(v) for v in value]
+
+    if type(value) is set:
+        return set(value)
+
+    if type(value) is dict:
+        return {k: copy_value(v) for k, v in value.items()}
+
+    if has_fields(value):
+        return copy.copy(value)
+
+    return value
+
+
+def matches_saved(value=None, saved=None):
+    """
+    Check if the value (e.g. of an object loaded again) equals the snapshot.
+
+    Tracked objects in the snapshot stand for their own saved state, so
+    the value gets compared with that state recursively.
+    """
+    if isinstance(saved, Tracked):
+        state = saved.get_saved_state()
+        if type(value) is not type(saved) or state is None:
+            return False
+
+        values = {
+            k: v for k, v in get_fields(value).items()
+            if k not in saved.UNTRACKED
+        }
+        return values.keys() == state.keys() and all(
+            matches_saved(values[k], state[k]) for k in state
+        )
+
+    if type(saved) is tuple and type(value) in [list, tuple, dict]:
+        if type(value) is dict:
+            value = list(value.items())
+        return len(value) == len(saved) and all(
+            matches_saved(v, s) for v, s in zip(value, saved)
+        )
+
+    return snapshot_value(value) == saved
+
+
+def tracked_children(value=None):
+    """Return the Tracked objects in the value (or in its list)."""
+    if isinstance(value, Tracked):
+        return [value]
+
+    if type(value) in [list, tuple]:
+        return [v for v in value if isinstance(v, Tracked)]
+
+    return []
+
+
+class Tracked(object):
+    """
+    Base class for objects, which know if they changed since the last save.
+
+    mark_saved() marks the object and its children as saved after loading
+    or saving. Every change afterwards goes through __setattr__() or
+    touch(), which remembers the saved value of the attribute before it
+    changes, the first time only. So unchanged objects keep no copy of
+    their values, the remembered ones are only needed for merge().
+
+    The Tracked children (like the offers of a project or the entries of
+    an offer) know their owner and tell it about their changes, so
+    is_changed() does not need to look at them. Objects, which were never
+    marked, count as changed.
+
+    The version gets counted up by the storage on every save. It is no part
+    of the state, so that saving alone does not change the object.
+    """
+
+    __slots__ = ('_owner', '_saved_state', '_version')
+
+    UNTRACKED = ('_owner', '_saved_state', '_version')
+
+    # the list attributes holding Tracked children: class name: attribute
+    CHILDREN = {}
+
+    def __new__(cls, *args, **kwargs):
+        """Create the object as not saved and without owner."""
+        out = object.__new__(cls)
+        object.__setattr__(out, '_owner', None)
+        object.__setattr__(out, '_saved_state', None)
+        return out
+
+    def __setattr__(self, name, value):
+        """Set the attribute and count it as a change."""
+        if name not in self.UNTRACKED:
+            if self._saved_state is not None or self._owner is not None:
+                self.touch(name)
+            if type(value) is list:
+                self.disown(getattr(self, name, None))
+                self.adopt(value)
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        """Unpickle the attributes without counting them as changes."""
+        for k, v in state[1].items():
+            object.__setattr__(self, k, v)
+
+    def set_version(self, value):
+        """Set version."""
+        try:
+            self._version = int(value)
+        except Exception:
+            pass
+
+    def get_version(self):
+        """Get version."""
+        return getattr(self, '_version', 0)
+
+    def get_owner(self):
+        """Get the Tracked object, which holds this one in a list, or None."""
+        return self._owner
+
+    def adopt(self, value=None):
+        """Become the owner of the Tracked objects in the list."""
+        for child in value:
+            if isinstance(child, Tracked):
+                object.__setattr__(child, '_owner', self)
+
+    def disown(self, value=None):
+        """Stop being the owner of the Tracked objects in the list."""
+        for child in value if type(value) is list else ():
+            if isinstance(child, Tracked) and child._owner is self:
+                object.__setattr__(child, '_owner', None)
+
+    def set_quietly(self, name=None, value=None):
+        """Set the attribute without counting it as a change (like loading it)."""
+        if type(value) is list:
+            self.disown(getattr(self, name, None))
+            self.adopt(value)
+        object.__setattr__(self, name, value)
+
+    def touch(self, name=None):
+        """
+        Count the attribute as changed, before it gets changed.
+
+        Attributes, which get changed in place (like a QuantityTime or a
+        list), have to be touched by their setters first.
+        """
+        state = self._saved_state
+        if state is not None and name not in state:
+            if state == CLEAN:
+                state = {}
+                object.__setattr__(self, '_saved_state', state)
+            state[name] = snapshot_value(getattr(self, name, None))
+
+        if self._owner is not None:
+            self._owner.touch_child(self)
+
+    def touch_child(self, child=None):
+        """Count the list holding the child as changed."""
+        name = self.CHILDREN.get(type(child).__name__)
+        if name is not None:
+            self.touch(name)
+
+    def append_child(self, name=None, child=None):
+        """Append the child to the list attribute as a change."""
+        self.touch(name)
+        getattr(self, name).append(child)
+        if isinstance(child, Tracked):
+            object.__setattr__(child, '_owner', self)
+
+    def replace_child(self, name=None, index=None, child=None):
+        """Replace the child at the index of the list attribute as a change."""
+        items = getattr(self, name)
+        self.disown([items[index]])
+        self.touch(name)
+        items[index] = child
+        if isinstance(child, Tracked):
+            object.__setattr__(child, '_owner', self)
+
+    def move_child(self, name=None, index=None, direction=None):
+        """
+        Move the child with the index up (1) or down (-1) in the list attribute.
+
+        It goes round at the ends of the list. Returns the new index.
+        """
+        items = getattr(self, name)
+        items[index]
+        self.touch(name)
+        new_index = (index + direction) % len(items)
+        items.insert(new_index, items.pop(index))
+        return new_index
+
+    def pop_child(self, name=None, index=None):
+        """Pop the child with the index from the list attribute as a change."""
+        items = getattr(self, name)
+        item = items[index]
+        self.touch(name)
+        items.pop(index)
+        self.disown([item])
+        return item
+
+    def get_saved_state(self):
+        """Get dict with the snapshots of the attributes of the last save or None."""
+        state = self._saved_state
+        if state is None:
+            return None
+
+        out = {
+            k: snapshot_value(v)
+            for k, v in get_fields(self).items()
+            if k not in self.UNTRACKED
+        }
+        out.update(state)
+        return out
+
+    def get_changed_names(self):
+        """Get the names of the attributes, which changed since the last save."""
+        state = self._saved_state
+        return list(state) if state else []
+
+    def mark_saved(self):
+        """Mark the object and its children as saved."""
+        for k, value in get_fields(self).items():
+            if k not in self.UNTRACKED:
+                for child in tracked_children(value):
+                    child.mark_saved()
+
+        object.__setattr__(self, '_saved_state', CLEAN)
+
+    def structural_copy(self):
+        """
+        Return a copy of the object without a json round trip.
+
+        The copy counts as changed, since it was never saved.
+        """
+        out = Tracked.__new__(type(self))
+
+        for k, v in get_fields(self).items():
+            if k not in ('_owner', '_saved_state'):
+                setattr(out, k, copy_value(v))
+
+        return out
+
+    def mark_changed(self):
+        """Forget the saved state, so that the object counts as changed."""
+        object.__setattr__(self, '_saved_state', None)
+
+    def take_saved_state(self, other=None):
+        """
+        Take the saved state of the object, which this one replaces.
+
+        Tracked children take the saved state of the children at the
+        same position, so a copy with unchanged children is unchanged.
+        """
+        state = other.get_saved_state()
+        if state is None:
+            self.mark_changed()
+            return
+
+        ours = get_fields(self)
+        changed = {}
+        for k, saved in state.items():
+            value = ours.get(k)
+            if type(value) is list and type(saved) is tuple:
+                for mine, theirs in zip(value, saved):
+                    if isinstance(mine, Tracked) and type(mine) is type(theirs):
+                        mine.take_saved_state(theirs)
+
+            if not matches_saved(value, saved):
+                changed[k] = saved
+
+        object.__setattr__(self, '_saved_state', changed or CLEAN)
+
+    def merge(self, theirs=None):
+        """
+        Take over the changes of another version of the object.
+
+        theirs is the object as another program saved it. Its values,
+        which differ from the saved state, replace the own ones. Returns
+        False without changing anything, if both changed the same value.
+        """
+        saved_state = self.get_saved_state()
+        if saved_state is None:
+            return False
+
+        changed = self.get_changed_names()
+        ours = get_fields(self)
+        take = {}
+        for k, v in get_fields(theirs).items():
+            if k in self.UNTRACKED or matches_saved(v, saved_state.get(k)):
+                continue
+
+            # the same value on both sides is no conflict
+            if matches_saved(v, snapshot_value(ours.get(k))):
+                continue
+
+            if k in changed:
+                return False
+
+            take[k] = v
+
+        for k, v in take.items():
+            setattr(self, k, v)
+
+        return True
+
+    def is_changed(self):
+        """Check if the object or one of its children changed."""
+        return self._saved_state != CLEAN
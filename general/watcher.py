@@ -0,0 +1,219 @@
+"""
+Watching the data directories for files changed by other programs.
+
+The InotifyWatcher uses the optional inotify_simple module (Linux only),
+the PollingWatcher compares modification time and size of the files on
+every poll. get_watcher() returns the best one available.
+
+poll() returns a list of (kind, filename) tuples with kind being 'added',
+'changed' or 'removed'. Hidden files (like temp files of atomic writes or
+the project index) are ignored. Shard directories (starting with '@')
+inside a watched path get watched as well.
+"""
+
+import os
+
+
+# the names of shard directories start with it
+SHARD_PREFIX = '@'
+
+
+def file_stamp(filename=None):
+    """Return (modification time, size) of the file or None."""
+    try:
+        stat = os.stat(filename)
+    except Exception:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def is_watched_file(file=None):
+    """Check if the filename is not hidden or a backup."""
+    return not file.startswith('.') and not file.endswith('_bu')
+
+
+def is_shard_dir(filename=None):
+    """Check if the filename is a shard directory."""
+    return (
+        os.path.basename(filename).startswith(SHARD_PREFIX) and
+        os.path.isdir(filename)
+    )
+
+
+def shard_dirs(path=None):
+    """Return the shard directories in path."""
+    if not os.path.isdir(str(path)):
+        return []
+
+    return [
+        os.path.join(path, file)
+        for file in sorted(os.listdir(path))
+        if is_shard_dir(os.path.join(path, file))
+    ]
+
+
+def scan_path(path=None):
+    """Return dict with filename: stamp for the files in path."""
+    out = {}
+
+    if not os.path.isdir(str(path)):
+        return out
+
+    for file in os.listdir(path):
+        filename = os.path.join(path, file)
+
+        if file.startswith(SHARD_PREFIX) and os.path.isdir(filename):
+            out.update(scan_path(filename))
+
+        elif is_watched_file(file):
+            stamp = file_stamp(filename)
+            if stamp is not None:
+                out[filename] = stamp
+
+    return out
+
+
+def compare_stamps(old=None, new=None):
+    """Return the changes between two dicts with filename: stamp."""
+    changes = []
+
+    for filename in sorted(new.keys()):
+        if filename not in old:
+            changes.append(('added', filename))
+        elif old[filename] != new[filename]:
+            changes.append(('changed', filename))
+
+    for filename in sorted(old.keys()):
+        if filename not in new:
+            changes.append(('removed', filename))
+
+    return changes
+
+
+class PollingWatcher(object):
+    """Watcher comparing modification time and size of the files."""
+
+    def __init__(self, paths=None):
+        """Initialize the class."""
+        self.paths = [] if paths is None else paths
+        self.stamps = self.scan()
+
+    def scan(self):
+        """Get the stamps of all files in the paths."""
+        out = {}
+        for path in self.paths:
+            out.update(scan_path(path))
+        return out
+
+    def poll(self):
+        """Return the changes since the last poll."""
+        new = self.scan()
+        changes = compare_stamps(old=self.stamps, new=new)
+        self.stamps = new
+        return changes
+
+    def close(self):
+        """Stop watching."""
+        pass
+
+
+class InotifyWatcher(object):
+    """Watcher getting the changes from the kernel."""
+
+    def __init__(self, paths=None, inotify_simple=None):
+        """Initialize the class."""
+        self.inotify_simple = inotify_simple
+        self.inotify = inotify_simple.INotify()
+        self.flags = (
+            inotify_simple.flags.CLOSE_WRITE |
+            inotify_simple.flags.CREATE |
+            inotify_simple.flags.DELETE |
+            inotify_simple.flags.MOVED_FROM |
+            inotify_simple.flags.MOVED_TO
+        )
+        self.paths = [] if paths is None else paths
+        self.watches = {}
+        self.stamps = {}
+        self.add_watches()
+
+    def add_watch(self, path=None):
+        """Watch the path and its shard directories."""
+        self.watches[self.inotify.add_watch(path, self.flags)] = path
+
+        for shard_path in shard_dirs(path):
+            if shard_path not in self.watches.values():
+                self.add_watch(shard_path)
+
+    def add_watches(self):
+        """Watch the paths, which exist now, and return the new files."""
+        new = {}
+        for path in self.paths:
+            if path in self.watches.values() or not os.path.isdir(path):
+                continue
+
+            self.add_watch(path)
+            new.update(scan_path(path))
+
+        self.stamps.update(new)
+        return new
+
+    def add_shard_watch(self, path=None):
+        """Watch a new shard directory and return its new files."""
+        if path in self.watches.values() or not os.path.isdir(path):
+            return {}
+
+        self.add_watch(path)
+        new = {
+            f: stamp for f, stamp in scan_path(path).items()
+            if f not in self.stamps
+        }
+
+        self.stamps.update(new)
+        return new
+
+    def poll(self):
+        """Return the changes since the last poll."""
+        # directories created in the meantime bring all their files with them
+        new = self.add_watches()
+
+        touched = set()
+        for event in self.inotify.read(timeout=0):
+            if event.wd not in self.watches:
+                continue
+
+            filename = os.path.join(self.watches[event.wd], event.name)
+
+            if event.name.startswith(SHARD_PREFIX):
+                new.update(self.add_shard_watch(filename))
+            elif is_watched_file(event.name):
+                touched.add(filename)
+
+        changes = [('added', f) for f in sorted(new.keys())]
+
+        # compare the touched files only
+        old = {f: self.stamps[f] for f in touched if f in self.stamps}
+        new = {}
+        for filename in touched:
+            stamp = file_stamp(filename)
+            if stamp is not None:
+                new[filename] = stamp
+
+        for filename in old:
+            self.stamps.pop(filename)
+        self.stamps.update(new)
+
+        return changes + compare_stamps(old=old, new=new)
+
+    def close(self):
+        """Stop watching."""
+        self.inotify.close()
+
+
+def get_watcher(paths=None):
+    """Return an InotifyWatcher, if possible, or a PollingWatcher otherwise."""
+    try:
+        import inotify_simple
+        return InotifyWatcher(paths=paths, inotify_simple=inotify_simple)
+    except Exception:
+        return PollingWatcher(paths=paths)
@@ -1,6 +1,7 @@
 """List all the unpaid invoices in a list."""
 
 from datetime import date
+from general.archive import Archive
 import npyscreen
 
 
@@ -14,6 +15,11 @@ class AllInvoicesList(npyscreen.MultiLineAction):
         # set up additional multiline options
         self.slow_scroll = True
 
+        # archived invoices get loaded year by year while scrolling down
+        self.archive = None
+        self.archived_years = []
+        self.archived_owners = {}
+
     def update_values(self):
         """Update the values."""
         # get inactive and active as new list combined
@@ -38,18 +44,77 @@ class AllInvoicesList(npyscreen.MultiLineAction):
             key=lambda x: x.get_date(), reverse=True
         )
 
+        # the archive segments are loaded on scrolling to the end only
+        self.archive = Archive(data_path=self.parent.parentApp.S.data_path)
+        self.archived_years = self.archive.get_years()
+        self.archived_owners = {}
+
         self.display()
 
         # clear filter for not showing doubled entries (npyscreen bug?)
         self.clear_filter()
 
+    def load_archived_year(self):
+        """Add the invoices of the next archived year to the list."""
+        if not self.archived_years:
+            return False
+
+        invoices = []
+        for project, invoice in self.archive.get_invoices(
+            year=self.archived_years.pop(0)
+        ):
+            if invoice.get_date() is not None:
+                self.archived_owners[invoice] = project
+                invoices.append(invoice)
+
+        self.values = sorted(
+            self.values + invoices,
+            key=lambda x: x.get_date(), reverse=True
+        )
+
+        return True
+
+    def load_archived(self, all_years=False):
+        """Load archived years, when the cursor reached the end."""
+        loaded = False
+        while self.archived_years and (
+            all_years or self.cursor_line >= len(self.values) - 1
+        ):
+            loaded = self.load_archived_year() or loaded
+
+            # one year is enough, if it brought invoices
+            if not all_years and self.cursor_line < len(self.values) - 1:
+                break
+
+        if loaded:
+            self.display()
+
+    def load_all_archived(self):
+        """Load all archived years, e.g. for searching them."""
+        self.load_archived(all_years=True)
+
+    def h_cursor_line_down(self, ch):
+        """Overwrite the method for key pressed down."""
+        super(AllInvoicesList, self).h_cursor_line_down(ch)
+        self.load_archived()
+
+    def h_cursor_page_down(self, ch):
+        """Overwrite the method for key pressed page down."""
+        super(AllInvoicesList, self).h_cursor_page_down(ch)
+        self.load_archived()
+
+    def h_cursor_end(self, ch):
+        """Overwrite the method for key pressed end."""
+        self.load_all_archived()
+        super(AllInvoicesList, self).h_cursor_end(ch)
+
     def display_value(self, vl):
         """Display values."""
-        # get project of actual invoice
-        project = vl.get_project(global_list=self.parent.the_list)
-
-        # get client of actual invoice
-        client = vl.get_client(global_list=self.parent.the_list, project=project)
+        # get project and client of actual invoice
+        if vl in self.archived_owners:
+            project = self.archived_owners[vl]
+        else:
+            project, client = self.parent.the_list.get_owner(item=vl)
 
         # get commodity
         commodity = vl.commodity
@@ -104,6 +169,10 @@ class AllInvoicesForm(npyscreen.ActionFormWithMenus):
         self.parentApp.setNextForm('Help')
         self.parentApp.switchFormNow()
 
+    def load_archive(self):
+        """Load all archived invoices into the list."""
+        self.allinvoices_list.load_all_archived()
+
     def exit(self):
         """Exit the programm."""
         self.parentApp.setNextForm(None)
@@ -114,6 +183,11 @@ class AllInvoicesForm(npyscreen.ActionFormWithMenus):
         # the menu
         self.m = self.new_menu(name='Menu')
         self.m.addItem(text='Help', onSelect=self.switch_to_help, shortcut='h')
+        self.m.addItem(
+            text='Load archive',
+            onSelect=self.load_archive,
+            shortcut='a'
+        )
         self.m.addItem(text='Exit', onSelect=self.exit, shortcut='e')
 
         # the list
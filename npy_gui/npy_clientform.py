@@ -283,7 +283,7 @@ class ClientForm(npyscreen.ActionFormWithMenus):
             i = self.parentApp.L.get_client_index(
                 client=self.parentApp.tmpClient
             )
-            self.parentApp.L.save_client_to_file(
+            self.parentApp.save_client_to_file(
                 client=self.parentApp.L.client_list[i]
             )
 
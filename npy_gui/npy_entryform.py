@@ -225,9 +225,10 @@ class BaseEntryForm(npyscreen.ActionFormWithMenus):
         else:
             # get its id and modify it, if it exists
             if self.parentApp.tmpEntry_index < len(offerinvoice.get_entry_list()):
-                offerinvoice.get_entry_list()[
-                    self.parentApp.tmpEntry_index
-                ] = self.parentApp.tmpEntry
+                offerinvoice.replace(
+                    index=self.parentApp.tmpEntry_index,
+                    entry=self.parentApp.tmpEntry
+                )
                 return True
             else:
                 # entry index is out of range
@@ -247,7 +248,7 @@ class BaseEntryForm(npyscreen.ActionFormWithMenus):
             project = self.parentApp.tmpProject
 
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=project
             )
 
@@ -491,9 +492,10 @@ class MultiplyEntryForm(npyscreen.ActionFormWithMenus):
         else:
             # get its id and modify it, if it exists
             if self.parentApp.tmpEntry_index < len(offerinvoice.get_entry_list()):
-                offerinvoice.get_entry_list()[
-                    self.parentApp.tmpEntry_index
-                ] = self.parentApp.tmpEntry
+                offerinvoice.replace(
+                    index=self.parentApp.tmpEntry_index,
+                    entry=self.parentApp.tmpEntry
+                )
                 return True
             else:
                 # entry index is out of range
@@ -513,7 +515,7 @@ class MultiplyEntryForm(npyscreen.ActionFormWithMenus):
             project = self.parentApp.tmpProject
 
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=project
             )
 
@@ -821,9 +823,10 @@ class ConnectEntryForm(npyscreen.ActionFormWithMenus):
         else:
             # get its id and modify it, if it exists
             if self.parentApp.tmpEntry_index < len(offerinvoice.get_entry_list()):
-                offerinvoice.get_entry_list()[
-                    self.parentApp.tmpEntry_index
-                ] = self.parentApp.tmpEntry
+                offerinvoice.replace(
+                    index=self.parentApp.tmpEntry_index,
+                    entry=self.parentApp.tmpEntry
+                )
                 return True
             else:
                 # entry index is out of range
@@ -843,7 +846,7 @@ class ConnectEntryForm(npyscreen.ActionFormWithMenus):
             project = self.parentApp.tmpProject
 
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=project
             )
 
@@ -3,9 +3,11 @@
 from clients.client import Client
 from clients.project import Project
 from clients.list import List
+from clients.storage import get_storage
 from general.default import Default
 from general.preset import Preset
 from general.settings import Settings
+from general.watcher import get_watcher
 import npyscreen
 from npy_gui.npy_clientform import ClientForm
 from npy_gui.npy_defaultsform import DefaultsForm
@@ -51,13 +53,102 @@ class FreelanceApplication(npyscreen.NPSAppManaged):
         else:
             self.H = 'Helpfile not found ... sorry! Time to learn by doing!'
 
+    def start_watcher(self):
+        """Start watching the client, project and preset directories."""
+        inactive = self.L.get_inactive_list(settings=self.S)
+        self.watcher = get_watcher(
+            paths=(
+                self.L.get_watch_paths() +
+                inactive.get_watch_paths() +
+                self.P.get_watch_paths()
+            )
+        )
+
+        # let the forms call while_waiting() every second
+        self.keypress_timeout_default = 10
+
+    def notify_conflict(self):
+        """Tell the user, that the changes were not saved."""
+        npyscreen.notify_confirm(
+            'Another program changed the same values in the meantime. ' +
+            'Your changes were not saved!',
+            form_color='WARNING'
+        )
+
+    def save_client_to_file(self, client=None):
+        """Save the client and warn, if it conflicts with another program."""
+        saved = self.L.save_client_to_file(client=client)
+        if not saved:
+            self.notify_conflict()
+        return saved
+
+    def save_project_to_file(self, project=None):
+        """Save the project and warn, if it conflicts with another program."""
+        saved = self.L.save_project_to_file(project=project)
+        if not saved:
+            self.notify_conflict()
+        return saved
+
+    def apply_file_changes(self):
+        """Patch lists and presets with changed files and return if any."""
+        if self.watcher is None:
+            return False
+
+        changes = self.watcher.poll()
+        inactive = self.L.get_inactive_list(settings=self.S)
+
+        # do not use "or", every one of them should get the changes
+        changed = [
+            self.L.apply_file_changes(changes=changes),
+            inactive.apply_file_changes(changes=changes),
+            self.P.apply_file_changes(changes=changes)
+        ]
+
+        # files, which changed the same values as unsaved edits
+        if self.L.file_conflicts or inactive.file_conflicts:
+            del self.L.file_conflicts[:]
+            del inactive.file_conflicts[:]
+            npyscreen.notify_confirm(
+                'Another program changed values, which you also changed. ' +
+                'Its changes were not loaded!',
+                form_color='WARNING'
+            )
+
+        return any(changed)
+
     def onStart(self):
         """Create all the forms and variables, which are needed."""
         # get global variables for the app
         self.S = Settings()
-        self.L = List(data_path=self.S.data_path)
+        self.L = List(
+            data_path=self.S.data_path,
+            storage=get_storage(
+                data_path=self.S.data_path,
+                backend=self.S.storage,
+                workers=self.S.get_load_workers(),
+                pool=self.S.load_pool,
+                snapshot=self.S.snapshot_cache,
+                shard=self.S.get_storage_shard()
+            ),
+            lazy=True
+        )
         self.L.update_inactive_list(settings=self.S)
-        self.P = Preset(data_path=self.S.data_path)
+        self.P = Preset(
+            data_path=self.S.data_path,
+            workers=self.S.get_load_workers(),
+            pool=self.S.load_pool,
+            snapshot=self.S.snapshot_cache
+        )
+
+        # files, which could not be loaded, get reported in the main form
+        self.load_failures = (
+            self.L.storage.failed_files + self.P.failed_files
+        )
+
+        # watch the data_path for changes of other programs
+        self.watcher = None
+        if self.S.watch_files:
+            self.start_watcher()
         self.P_what = 'offer'
         self.H = 'Fallback helptext is: learn by doing! (;'
 
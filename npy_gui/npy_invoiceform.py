@@ -2,7 +2,6 @@
 
 import curses
 import npyscreen
-from general.functions import move_list_entry
 from general.functions import NewBaseEntry
 from general.functions import NewMultiplyEntry
 from general.functions import NewConnectEntry
@@ -197,8 +196,7 @@ class EntryList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpInvoice.move(
             index=self.cursor_line,
             direction=1
         )
@@ -216,8 +214,7 @@ class EntryList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpInvoice.move(
             index=self.cursor_line,
             direction=-1
         )
@@ -245,12 +242,18 @@ class EntryList(npyscreen.MultiLineAction):
 
         price_com = self.parent.parentApp.tmpInvoice.commodity
 
-        unit_price = str(vl.get_unit_price(
-            entry_list=self.parent.parentApp.tmpInvoice.get_entry_list(),
-            wage=self.parent.parentApp.tmpInvoice.get_wage(
-                project=self.parent.parentApp.tmpProject,
-            )
-        ))
+        # all entries get calculated at once, when the first row gets displayed
+        row = self.parent.parentApp.tmpInvoice.get_entry_row(
+            entry=vl,
+            project=self.parent.parentApp.tmpProject
+        )
+
+        # the unit price is always shown without the rounding of round_price
+        unit_price = str(self.parent.parentApp.tmpInvoice.get_entry_row(
+            entry=vl,
+            project=self.parent.parentApp.tmpProject,
+            round_price=False
+        )['unit_price'])
 
         unit = '{} {}'.format(
             unit_price,
@@ -259,23 +262,11 @@ class EntryList(npyscreen.MultiLineAction):
 
         quantity = vl.get_quantity_str()[:11]
 
-        price_amt = str(vl.get_price(
-            entry_list=self.parent.parentApp.tmpInvoice.get_entry_list(),
-            wage=self.parent.parentApp.tmpInvoice.get_wage(
-                project=self.parent.parentApp.tmpProject,
-            ),
-            round_price=self.parent.parentApp.tmpInvoice.get_round_price()
-        ))
+        price_amt = str(row['price'])
 
         price = '{} {}'.format(price_amt, price_com)
 
-        price_tax_amt = str(vl.get_price_tax(
-            entry_list=self.parent.parentApp.tmpInvoice.get_entry_list(),
-            wage=self.parent.parentApp.tmpInvoice.get_wage(
-                project=self.parent.parentApp.tmpProject,
-            ),
-            round_price=self.parent.parentApp.tmpInvoice.get_round_price()
-        ))
+        price_tax_amt = str(row['tax'])
 
         price_tax = '({} {})'.format(price_tax_amt, price_com)
 
@@ -546,7 +537,7 @@ class InvoiceForm(npyscreen.FormMultiPageActionWithMenus):
         # check if it's allright
         if allright:
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=self.parentApp.tmpProject
             )
         else:
@@ -953,9 +944,10 @@ class InvoiceForm(npyscreen.FormMultiPageActionWithMenus):
         else:
             # get its id and modify it, if it exists
             if self.parentApp.tmpInvoice_index < len(project.get_invoice_list()):
-                project.get_invoice_list()[
-                    self.parentApp.tmpInvoice_index
-                ] = self.parentApp.tmpInvoice
+                project.replace_invoice(
+                    index=self.parentApp.tmpInvoice_index,
+                    invoice=self.parentApp.tmpInvoice
+                )
                 return True
             else:
                 # invoice index is out of range
@@ -972,7 +964,7 @@ class InvoiceForm(npyscreen.FormMultiPageActionWithMenus):
         # check if it's allright and switch form then
         if allright:
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=self.parentApp.tmpProject
             )
 
@@ -402,6 +402,13 @@ class MainForm(npyscreen.FormBaseNewWithMenus):
             rely=2
         )
 
+    def while_waiting(self):
+        """Show changes of other programs, if the watcher is on."""
+        if self.parentApp.apply_file_changes():
+            self.clients_box.entry_widget.update_values()
+            self.clients_box.entry_widget.refresh_project_list()
+            self.display()
+
     def beforeEditing(self):
         """Get correct lists for clients and projects."""
         # update clients
@@ -409,3 +416,12 @@ class MainForm(npyscreen.FormBaseNewWithMenus):
 
         # update projects (contains the method .update_values())
         self.clients_box.entry_widget.refresh_project_list()
+
+        # report files, which could not be loaded, once
+        if self.parentApp.load_failures:
+            npyscreen.notify_confirm(
+                'Could not load these files:\n\n' +
+                '\n'.join(self.parentApp.load_failures),
+                form_color='WARNING'
+            )
+            self.parentApp.load_failures = []
@@ -2,7 +2,6 @@
 
 import curses
 import npyscreen
-from general.functions import move_list_entry
 from general.functions import NewBaseEntry
 from general.functions import NewMultiplyEntry
 from general.functions import NewConnectEntry
@@ -193,8 +192,7 @@ class EntryList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpOffer.move(
             index=self.cursor_line,
             direction=1
         )
@@ -212,8 +210,7 @@ class EntryList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpOffer.move(
             index=self.cursor_line,
             direction=-1
         )
@@ -243,27 +240,19 @@ class EntryList(npyscreen.MultiLineAction):
 
         quantity = vl.get_quantity_str()[:14]
 
-        time = str(vl.get_time_zero(
-            entry_list=self.parent.parentApp.tmpOffer.get_entry_list()
-        ))
+        # all entries get calculated at once, when the first row gets displayed
+        row = self.parent.parentApp.tmpOffer.get_entry_row(
+            entry=vl,
+            project=self.parent.parentApp.tmpProject
+        )
+
+        time = '-' if row['time'].get() == 0 else str(row['time'])
 
-        price_amt = str(vl.get_price(
-            entry_list=self.parent.parentApp.tmpOffer.get_entry_list(),
-            wage=self.parent.parentApp.tmpOffer.get_wage(
-                project=self.parent.parentApp.tmpProject,
-            ),
-            round_price=self.parent.parentApp.tmpOffer.get_round_price()
-        ))
+        price_amt = str(row['price'])
 
         price = '{} {}'.format(price_amt, price_com)
 
-        price_tax_amt = str(vl.get_price_tax(
-            entry_list=self.parent.parentApp.tmpOffer.get_entry_list(),
-            wage=self.parent.parentApp.tmpOffer.get_wage(
-                project=self.parent.parentApp.tmpProject,
-            ),
-            round_price=self.parent.parentApp.tmpOffer.get_round_price()
-        ))
+        price_tax_amt = str(row['tax'])
 
         price_tax = '({} {})'.format(price_tax_amt, price_com)
 
@@ -489,7 +478,7 @@ class OfferForm(npyscreen.FormMultiPageActionWithMenus):
             project = self.parentApp.tmpProject
 
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=project
             )
         else:
@@ -710,7 +699,8 @@ class OfferForm(npyscreen.FormMultiPageActionWithMenus):
         )
 
         date = self.parentApp.tmpOffer.get_finish_date(
-            project=self.parentApp.tmpProject
+            project=self.parentApp.tmpProject,
+            settings=self.parentApp.S
         ).strftime('%d.%m.%Y')
 
         wage_price_val = self.parentApp.tmpOffer.get_hourly_wage(
@@ -807,9 +797,10 @@ class OfferForm(npyscreen.FormMultiPageActionWithMenus):
         else:
             # get its id and modify it, if it exists
             if self.parentApp.tmpOffer_index < len(project.get_offer_list()):
-                project.get_offer_list()[
-                    self.parentApp.tmpOffer_index
-                ] = self.parentApp.tmpOffer
+                project.replace_offer(
+                    index=self.parentApp.tmpOffer_index,
+                    offer=self.parentApp.tmpOffer
+                )
                 return True
             else:
                 # offer index is out of range
@@ -829,7 +820,7 @@ class OfferForm(npyscreen.FormMultiPageActionWithMenus):
             project = self.parentApp.tmpProject
 
             # save the file
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=project
             )
 
@@ -3,7 +3,6 @@
 import curses
 from general.functions import NewOffer
 from general.functions import NewInvoice
-from general.functions import move_list_entry
 import npyscreen
 
 
@@ -37,8 +36,7 @@ class OfferList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpProject.move_offer(
             index=self.cursor_line,
             direction=1
         )
@@ -56,8 +54,7 @@ class OfferList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpProject.move_offer(
             index=self.cursor_line,
             direction=-1
         )
@@ -192,8 +189,7 @@ class InvoiceList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpProject.move_invoice(
             index=self.cursor_line,
             direction=1
         )
@@ -211,8 +207,7 @@ class InvoiceList(npyscreen.MultiLineAction):
             return False
 
         # move selected item up
-        new_index = move_list_entry(
-            lis=lis,
+        new_index = self.parent.parentApp.tmpProject.move_invoice(
             index=self.cursor_line,
             direction=-1
         )
@@ -369,7 +364,7 @@ class ProjectForm(npyscreen.FormMultiPageActionWithMenus):
             i = self.parentApp.L.get_project_index(
                 project=self.parentApp.tmpProject
             )
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=self.parentApp.L.project_list[i]
             )
         else:
@@ -551,7 +546,7 @@ class ProjectForm(npyscreen.FormMultiPageActionWithMenus):
             i = self.parentApp.L.get_project_index(
                 project=self.parentApp.tmpProject
             )
-            self.parentApp.L.save_project_to_file(
+            self.parentApp.save_project_to_file(
                 project=self.parentApp.L.project_list[i]
             )
 
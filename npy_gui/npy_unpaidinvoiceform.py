@@ -47,6 +47,10 @@ class UnpaidInvoiceList(npyscreen.MultiLineAction):
         # get list of unpaid invoices - sort by due date!
         self.values = self.parent.parentApp.L.get_unpaid_invoices()
 
+        # projects, which could not be loaded, get reported in the main form
+        self.parent.parentApp.load_failures += self.parent.parentApp.L.load_failures
+        self.parent.parentApp.L.load_failures = []
+
         self.display()
 
         # clear filter for not showing doubled entries (npyscreen bug?)
@@ -54,11 +58,8 @@ class UnpaidInvoiceList(npyscreen.MultiLineAction):
 
     def display_value(self, vl):
         """Display values."""
-        # get project of actual invoice
-        project = vl.get_project(global_list=self.parent.parentApp.L)
-
-        # get client of actual invoice
-        client = vl.get_client(global_list=self.parent.parentApp.L, project=project)
+        # get project and client of actual invoice
+        project, client = self.parent.parentApp.L.get_owner(item=vl)
 
         # get commodity
         commodity = vl.commodity
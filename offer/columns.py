@@ -0,0 +1,332 @@
+"""
+Vectorized calculation of very large entry lists with numpy.
+
+The times, prices and taxes of the BaseEntries and MultiplyEntries only
+depend on their own values. EntryColumns packs these values into integer
+columns (the units and places of the fixed-point numbers) and calculates
+all entries at once, with the same half-even rounding as offer.fixedpoint.
+
+The columns are int64, so entries with a value or result beyond 2 ** 61
+(like the quantity '1:20', which has 28 digits) are left out and get
+calculated one by one as before. This way the results are exactly the
+ones of the pure Python calculation. Without numpy, or for short lists,
+get_columns() returns None and nothing changes.
+"""
+
+from offer import fixedpoint
+from offer.entries import BaseEntry
+from offer.entries import MultiplyEntry
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# below this, creating the arrays costs more than it saves
+MIN_ENTRIES = 500
+
+# int64 goes till 2 ** 63, so products below this cannot overflow
+BOUND = 2.0 ** 61
+
+# biggest power of ten, which can be used as an int64 divisor
+MAX_SHIFT = 18
+
+# entry kinds in the columns
+BASE = 0
+MULTIPLY = 1
+
+
+def get_columns(entry_list=None):
+    """Return EntryColumns of the entry_list or None without numpy or for short lists."""
+    if numpy is None or type(entry_list) is not list or len(entry_list) < MIN_ENTRIES:
+        return None
+    return EntryColumns(entry_list)
+
+
+def pack(values=None):
+    """Return int64 array of the ints and bool array, which of them fit."""
+    try:
+        out = numpy.array(values, dtype=numpy.int64)
+        return out, numpy.abs(out) < BOUND
+    except OverflowError:
+        pass
+
+    # the floats are only for checking the size of big ints
+    fits = numpy.abs(numpy.array(values, dtype=numpy.float64)) < BOUND
+
+    return numpy.array(
+        [v if f else 0 for v, f in zip(values, fits.tolist())],
+        dtype=numpy.int64
+    ), fits
+
+
+def check(units=None, factor=None, fits=None):
+    """Mark the rows, in which units * factor would get too big."""
+    fits &= (
+        numpy.abs(units.astype(numpy.float64)) *
+        numpy.abs(factor.astype(numpy.float64)) < BOUND
+    )
+
+
+def multiply(a=None, b=None, fits=None):
+    """Return a * b of the columns (units, places), like fixedpoint.multiply()."""
+    check(a[0], b[0], fits)
+    return (numpy.where(fits, a[0], 0) * numpy.where(fits, b[0], 0), a[1] + b[1])
+
+
+def scale(units=None, shift=None, fits=None):
+    """Return units * 10 ** shift for shifts >= 0."""
+    fits &= shift <= MAX_SHIFT
+    factor = numpy.int64(10) ** numpy.clip(shift, 0, MAX_SHIFT)
+    check(units, factor, fits)
+    return numpy.where(fits, units, 0) * factor
+
+
+def add(a=None, b=None, fits=None):
+    """Return a + b of the columns (units, places), like fixedpoint.add()."""
+    places = numpy.maximum(a[1], b[1])
+    units_a = scale(a[0], places - a[1], fits)
+    units_b = scale(b[0], places - b[1], fits)
+    check(units_a + units_b, numpy.ones_like(places), fits)
+    return (units_a + units_b, places)
+
+
+def round_places(value=None, places=2, fits=None):
+    """Round half-even to the places, like fixedpoint.round_places()."""
+    units, have = value
+    shift = have - places
+
+    # less places: multiply
+    more = scale(units, numpy.maximum(-shift, 0), fits)
+
+    # more places: divide and round half-even
+    divisor = numpy.int64(10) ** numpy.clip(shift, 0, MAX_SHIFT)
+    quotient, remainder = numpy.divmod(numpy.abs(units), divisor)
+    quotient += (2 * remainder > divisor) | (
+        (2 * remainder == divisor) & (quotient % 2 == 1)
+    )
+
+    # the units are smaller than 10 ** MAX_SHIFT, so bigger shifts give 0
+    quotient = numpy.where(shift > MAX_SHIFT, 0, quotient)
+    less = numpy.where(units < 0, -quotient, quotient)
+
+    return (
+        numpy.where(shift <= 0, more, less),
+        numpy.full_like(have, places)
+    )
+
+
+class EntryColumns(object):
+    """The values of the BaseEntries and MultiplyEntries of an entry list as columns."""
+
+    __slots__ = (
+        '_entries', '_fits', '_kind', '_quantity', '_quantity_b', '_time',
+        '_price', '_hour_rate', '_wage_add', '_tax', '_results', '_complete'
+    )
+
+    def __init__(self, entry_list=None):
+        """Initialize the class."""
+        # BaseEntries first, then MultiplyEntries, ConnectEntries stay out
+        bases = [e for e in entry_list if type(e) is BaseEntry]
+        multis = [e for e in entry_list if type(e) is MultiplyEntry]
+        self._entries = bases + multis
+        self._complete = len(self._entries) == len(entry_list)
+
+        self._kind = numpy.array(
+            [BASE] * len(bases) + [MULTIPLY] * len(multis),
+            dtype=numpy.int8
+        )
+
+        # the values, which the other kind does not have, are zero
+        zero_bases = [(0, 0)] * len(bases)
+        zero_multis = [(0, 0)] * len(multis)
+        values = {
+            'quantity': [e.get_quantity().fixed() for e in self._entries],
+            'quantity_b': [e.get_quantity_b().fixed() for e in self._entries],
+            'time': [e.get_time_raw_fixed() for e in bases] + zero_multis,
+            'price': [e.get_price_raw_fixed() for e in bases] + zero_multis,
+            'hour_rate': zero_bases + [e.get_hour_rate().fixed() for e in multis],
+            'wage_add': zero_bases + [e.get_wage_add().fixed() for e in multis],
+            'tax': [e.get_tax_fixed() for e in self._entries]
+        }
+
+        # every value becomes two columns: (units, places),
+        # the fits are kept per value: name: bool array
+        self._fits = {}
+        for name, numbers in values.items():
+            units, fits = pack([n[0] for n in numbers])
+            places, places_fit = pack([n[1] for n in numbers])
+            self._fits[name] = fits & places_fit
+            setattr(self, '_' + name, (units, places))
+
+        # results: key: (units, places, fits)
+        self._results = {}
+
+    def get_size(self):
+        """Get the number of entries in the columns."""
+        return len(self._entries)
+
+    def is_complete(self):
+        """Check if all entries of the list are in the columns (no ConnectEntries)."""
+        return self._complete
+
+    def calculate_times(self):
+        """Return the time columns and the fits of all entries."""
+        if 'time' not in self._results:
+            # the time of BaseEntries and the hour_rate of MultiplyEntries are 0 otherwise
+            fits = (
+                self._fits['quantity'] & self._fits['quantity_b'] &
+                self._fits['time'] & self._fits['hour_rate']
+            )
+            base = multiply(
+                multiply(self._time, self._quantity, fits),
+                self._quantity_b,
+                fits
+            )
+            multi = multiply(
+                multiply(self._quantity, self._quantity_b, fits),
+                self._hour_rate,
+                fits
+            )
+            is_base = self._kind == BASE
+            self._results['time'] = (
+                numpy.where(is_base, base[0], multi[0]),
+                numpy.where(is_base, base[1], multi[1]),
+                fits
+            )
+
+        return self._results['time']
+
+    def calculate_prices(self, wage=None, round_price=False):
+        """Return the price columns and the fits for the fixed-point wage."""
+        key = ('price', wage, bool(round_price))
+        if key not in self._results:
+            units, places, time_fits = self.calculate_times()
+            is_base = self._kind == BASE
+
+            # only the prices of MultiplyEntries need the time
+            fits = (
+                self._fits['quantity'] & self._fits['quantity_b'] &
+                self._fits['price'] & self._fits['wage_add'] &
+                (is_base | time_fits)
+            )
+
+            # a wage, which does not fit, leaves out all entries
+            if abs(wage[0]) >= BOUND:
+                fits[:] = False
+                wage = (0, 0)
+
+            wage = (
+                numpy.full(self.get_size(), wage[0], dtype=numpy.int64),
+                numpy.full(self.get_size(), wage[1], dtype=numpy.int64)
+            )
+            base = multiply(
+                multiply(self._price, self._quantity, fits),
+                self._quantity_b,
+                fits
+            )
+            multi = multiply(
+                (numpy.where(is_base, 0, units), places),
+                add(wage, self._wage_add, fits),
+                fits
+            )
+
+            price = round_places(
+                (
+                    numpy.where(is_base, base[0], multi[0]),
+                    numpy.where(is_base, base[1], multi[1])
+                ),
+                0 if round_price else 2,
+                fits
+            )
+            self._results[key] = price + (fits,)
+
+        return self._results[key]
+
+    def calculate_taxes(self, wage=None, round_price=False):
+        """Return the tax columns and the fits, like get_price_tax_fixed()."""
+        key = ('tax', wage, bool(round_price))
+        if key not in self._results:
+            units, places, fits = self.calculate_prices(wage, round_price)
+            fits = fits & self._fits['tax']
+            tax = round_places(multiply(self._tax, (units, places), fits), 2, fits)
+            self._results[key] = tax + (fits,)
+
+        return self._results[key]
+
+    def to_dict(self, columns=None):
+        """Convert the result columns into dict of id(entry): fixed-point number."""
+        units, places, fits = columns
+        return {
+            id(e): (u, p)
+            for e, u, p, f in zip(
+                self._entries,
+                units.tolist(),
+                places.tolist(),
+                fits.tolist()
+            )
+            if f
+        }
+
+    def get_times(self):
+        """Get dict of id(entry): time of the entries, which fit the columns."""
+        return self.to_dict(self.calculate_times())
+
+    def get_prices(self, wage=None, round_price=False):
+        """Get dict of id(entry): price for the fixed-point wage, like get_times()."""
+        return self.to_dict(self.calculate_prices(wage, round_price))
+
+    def get_taxes(self, wage=None, round_price=False):
+        """Get dict of id(entry): tax for the fixed-point wage, like get_times()."""
+        return self.to_dict(self.calculate_taxes(wage, round_price))
+
+    def add_up(self, columns=None, entry_list=None, value=None):
+        """
+        Return the sum of the values of all entries as fixed-point number.
+
+        The values of the rows, which fit, come from the result columns,
+        value(entry) is called for the other entries. Like in the Decimal
+        context, adding them one by one in list order rounds, when the sum
+        gets more than 28 digits. Otherwise the exact sum is the same and
+        gets calculated at once.
+        """
+        units, places, fits = columns
+
+        # the values of the other entries
+        if self._complete and fits.all():
+            rest = {}
+        else:
+            covered = {id(e) for e, f in zip(self._entries, fits.tolist()) if f}
+            rest = {id(e): value(e) for e in entry_list if id(e) not in covered}
+
+        # sum up the units of all rows with the same places
+        sums = {}
+        for have in numpy.unique(places[fits]).tolist():
+            same = fits & (places == have)
+            sums[have] = (
+                sum(units[same].tolist()),
+                sum(numpy.abs(units[same]).tolist())
+            )
+        for u, p in rest.values():
+            total, total_abs = sums.get(p, (0, 0))
+            sums[p] = (total + u, total_abs + abs(u))
+
+        # adding starts with fixedpoint.ZERO, which has no places
+        out_places = max([0] + list(sums))
+        out = 0
+        out_abs = 0
+        for have, (total, total_abs) in sums.items():
+            out += total * fixedpoint.power(out_places - have)
+            out_abs += total_abs * fixedpoint.power(out_places - have)
+
+        if out_abs < fixedpoint.LIMIT:
+            return (out, out_places)
+
+        # add them one by one
+        values = self.to_dict(columns)
+        values.update(rest)
+        out = fixedpoint.ZERO
+        for e in entry_list:
+            out = fixedpoint.add(out, values[id(e)])
+        return out
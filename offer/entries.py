@@ -5,14 +5,41 @@ The classes have privat values and setter and getter methods.
 """
 
 from decimal import Decimal
-import json
+from general import schema
+from general.tracking import Tracked
+from offer import fixedpoint
+from offer.quantitytime import from_fixed
 from offer.quantitytime import QuantityTime
 import uuid
 
 
-class BaseEntry(object):
+NO_CONNECTIONS = frozenset()
+
+
+class BaseEntry(Tracked):
     """A very simple entry with basic options and FIXED values."""
 
+    # there can be millions of entries, so they have no __dict__
+    __slots__ = (
+        '_id', 'title', 'comment', '_quantity', 'quantity_format',
+        '_quantity_b', 'quantity_b_format', '_tax', '_time', '_price',
+        '_connected'
+    )
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('id', 'get_id', None),
+        ('title', 'title', None),
+        ('comment', 'comment', None),
+        ('quantity', '_quantity', 'str'),
+        ('quantity_format', 'quantity_format', None),
+        ('quantity_b', '_quantity_b', 'str'),
+        ('quantity_b_format', 'quantity_b_format', None),
+        ('tax', 'get_tax', 'float'),
+        ('time', '_time', 'str'),
+        ('price', 'get_price_raw', 'float')
+    )
+
     def __init__(
         self,
         id=None,
@@ -43,17 +70,18 @@ class BaseEntry(object):
         self.quantity_b_format = (
             '' if quantity_b_format is None else str(quantity_b_format)
         )
-        self._tax = Decimal(0)                  # set default
+        self._tax = fixedpoint.ZERO             # set default
         self.set_tax(tax)                       # try to set arguments value
         self._time = QuantityTime(time)
-        self._price = Decimal(0)                # set default
+        self._price = fixedpoint.ZERO_PRICE     # set default
         self.set_price(price)                   # try to set arguments value
 
-        # get the connected list (for ConnectEntry only)
-        if type(connected) is set:
+        # get the connected list (for ConnectEntry only); entries without
+        # connections share one empty frozenset, changes replace it anyway
+        if type(connected) is set and connected:
             self._connected = connected
         else:
-            self._connected = set()
+            self._connected = NO_CONNECTIONS
 
     def get_id(self):
         """Get id."""
@@ -61,6 +89,7 @@ class BaseEntry(object):
 
     def set_quantity(self, value):
         """Set quantity."""
+        self.touch('_quantity')
         self._quantity.set(value)
 
     def get_quantity(self):
@@ -77,6 +106,7 @@ class BaseEntry(object):
 
     def set_quantity_b(self, value):
         """Set quantity_b."""
+        self.touch('_quantity_b')
         self._quantity_b.set(value)
 
     def get_quantity_b(self):
@@ -154,35 +184,51 @@ class BaseEntry(object):
         try:
             # only works, if input is integer, float or string
             if is_percent:
-                self._tax = Decimal(str(value)) / 100
+                self._tax = fixedpoint.from_decimal(Decimal(str(value)) / 100)
             else:
-                self._tax = Decimal(str(value))
+                self._tax = fixedpoint.from_decimal(Decimal(str(value)))
         except Exception:
             # otherwise don't do anything
             pass
 
     def get_tax(self, *args, **kwargs):
         """Get tax."""
+        return fixedpoint.to_decimal(self._tax)
+
+    def get_tax_fixed(self):
+        """Get tax as fixed-point number."""
         return self._tax
 
     def get_tax_percent(self, *args, **kwargs):
         """Get tax."""
-        return self._tax * 100
+        return self.get_tax() * 100
 
     def set_time(self, value):
         """Set time."""
+        self.touch('_time')
         self._time.set(value)
 
     def get_time(self, *args, **kwargs):
         """Get time."""
         self._time.type('time')
-        return self._time * self._quantity * self._quantity_b
+        return from_fixed(self.get_time_fixed(*args, **kwargs), 'time')
+
+    def get_time_fixed(self, *args, **kwargs):
+        """Get time as fixed-point number."""
+        return fixedpoint.multiply(
+            fixedpoint.multiply(self._time.fixed(), self._quantity.fixed()),
+            self._quantity_b.fixed()
+        )
 
     def get_time_raw(self, *args, **kwargs):
         """Get raw time value."""
         self._time.type('time')
         return self._time
 
+    def get_time_raw_fixed(self):
+        """Get raw time value as fixed-point number."""
+        return self._time.fixed()
+
     def get_time_zero(self, *args, **kwargs):
         """Get time as '-' if time is 0, else str of time."""
         if self.get_time(*args, **kwargs) == QuantityTime(0):
@@ -195,18 +241,24 @@ class BaseEntry(object):
         # try to set a new price
         try:
             # only works, if input is integer, float or string
-            self._price = round(Decimal(str(value)), 2)
+            self._price = fixedpoint.from_decimal(round(Decimal(str(value)), 2))
         except Exception:
             # otherwise don't do anything
             pass
 
     def get_price(self, round_price=False, *args, **kwargs):
         """Get price."""
-        if round_price:
-            rounder = 0
-        else:
-            rounder = 2
-        return round(self._price * self._quantity.get() * self._quantity_b.get(), rounder)
+        return fixedpoint.to_decimal(self.get_price_fixed(round_price=round_price))
+
+    def get_price_fixed(self, entry_list=None, wage=None, round_price=False, graph=None):
+        """Get price as fixed-point number, wage has to be one as well."""
+        return fixedpoint.round_places(
+            fixedpoint.multiply(
+                fixedpoint.multiply(self._price, self._quantity.fixed()),
+                self._quantity_b.fixed()
+            ),
+            0 if round_price else 2
+        )
 
     def get_unit_price(self, round_price=False, *args, **kwargs):
         """Get price / quantity."""
@@ -239,14 +291,39 @@ class BaseEntry(object):
 
     def get_price_raw(self):
         """Get raw price value."""
+        return fixedpoint.to_decimal(self._price)
+
+    def get_price_raw_fixed(self):
+        """Get raw price value as fixed-point number."""
         return self._price
 
     def get_price_tax(self, *args, **kwargs):
         """Get tax of the price."""
-        return round(
-            self._tax * self.get_price(
-                *args,
-                **kwargs
+        return fixedpoint.to_decimal(fixedpoint.round_places(
+            fixedpoint.multiply(
+                self._tax,
+                fixedpoint.from_decimal(self.get_price(*args, **kwargs))
+            ),
+            2
+        ))
+
+    def get_price_tax_fixed(
+        self,
+        entry_list=None,
+        wage=None,
+        round_price=False,
+        graph=None
+    ):
+        """Get tax of the price as fixed-point number, like get_price_fixed()."""
+        return fixedpoint.round_places(
+            fixedpoint.multiply(
+                self._tax,
+                self.get_price_fixed(
+                    entry_list=entry_list,
+                    wage=wage,
+                    round_price=round_price,
+                    graph=graph
+                )
             ),
             2
         )
@@ -284,31 +361,11 @@ class BaseEntry(object):
 
     def to_dict(self):
         """Convert all data to a dict."""
-        out = {}
-
-        # fetch all important data for this entry type
-        out['type'] = self.__class__.__name__
-        out['id'] = self.get_id()
-        out['title'] = self.title
-        out['comment'] = self.comment
-        out['quantity'] = str(self._quantity)
-        out['quantity_format'] = self.quantity_format
-        out['quantity_b'] = str(self._quantity_b)
-        out['quantity_b_format'] = self.quantity_b_format
-        out['tax'] = float(self._tax)
-        out['time'] = str(self._time)
-        out['price'] = float(self._price)
-
-        return out
+        return schema.encode(self, self.FIELDS)
 
     def to_json(self, indent=2, ensure_ascii=False):
         """Convert all data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
+        return schema.dumps(self.to_dict(), indent=indent, ensure_ascii=ensure_ascii)
 
     @classmethod
     def from_json(cls, js=None, keep_id=True):
@@ -316,89 +373,33 @@ class BaseEntry(object):
         if js is None:
             return cls()
 
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
+        # get js as dict or return default object
+        js = schema.load_dict(js)
+        if js is None:
+            return cls()
 
         # create new entry object from json
+        values = schema.decode(js, cls.FIELDS)
 
         # get ID if it's no preset_loading
         if not keep_id:
-            id = None
-        elif keep_id is True:
-            if 'id' in js.keys():
-                id = js['id']
-            else:
-                id = None
-        else:
-            id = str(keep_id)
-
-        # get other values
-        if 'title' in js.keys():
-            title = js['title']
-        else:
-            title = None
-
-        if 'comment' in js.keys():
-            comment = js['comment']
-        else:
-            comment = None
-
-        if 'quantity' in js.keys():
-            quantity = js['quantity']
-        else:
-            quantity = None
+            values['id'] = None
+        elif keep_id is not True:
+            values['id'] = str(keep_id)
 
-        if 'quantity_format' in js.keys():
-            quantity_format = js['quantity_format']
-        else:
-            quantity_format = None
-
-        if 'quantity_b' in js.keys():
-            quantity_b = js['quantity_b']
-        else:
-            quantity_b = None
-
-        if 'quantity_b_format' in js.keys():
-            quantity_b_format = js['quantity_b_format']
-        else:
-            quantity_b_format = None
-
-        if 'tax' in js.keys():
-            tax = js['tax']
-        else:
-            tax = None
-
-        if 'time' in js.keys():
-            time = js['time']
-        else:
-            time = None
-
-        if 'price' in js.keys():
-            price = js['price']
-        else:
-            price = None
-
-        return cls(
-            id=id,
-            title=title,
-            comment=comment,
-            quantity=quantity,
-            quantity_format=quantity_format,
-            quantity_b=quantity_b,
-            quantity_b_format=quantity_b_format,
-            tax=tax,
-            time=time,
-            price=price
-        )
+        return cls(**values)
 
     def copy(self, keep_id=True):
         """Return a copy of this object."""
-        return BaseEntry().from_json(js=self.to_json(), keep_id=keep_id)
+        out = self.structural_copy()
+
+        # get new ID if it's a preset_loading or a given one
+        if not keep_id:
+            out._id = str(uuid.uuid1())
+        elif keep_id is not True:
+            out._id = str(keep_id)
+
+        return out
 
     def is_project(self, project=None):
         """
@@ -486,6 +487,23 @@ class MultiplyEntry(BaseEntry):
     by the quantity and thus calculates the time.
     """
 
+    __slots__ = ('_hour_rate', '_wage_add', 'wage_add_explain')
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('id', 'get_id', None),
+        ('title', 'title', None),
+        ('comment', 'comment', None),
+        ('quantity', '_quantity', 'str'),
+        ('quantity_format', 'quantity_format', None),
+        ('quantity_b', '_quantity_b', 'str'),
+        ('quantity_b_format', 'quantity_b_format', None),
+        ('tax', 'get_tax', 'float'),
+        ('hour_rate', '_hour_rate', 'str'),
+        ('wage_add', '_wage_add', 'str'),
+        ('wage_add_explain', 'wage_add_explain', None)
+    )
+
     def __init__(
         self,
         id=None,
@@ -524,9 +542,14 @@ class MultiplyEntry(BaseEntry):
 
     def get_time(self, *args, **kwargs):
         """Get own quantity * own hour as time."""
-        out = self._quantity * self._quantity_b * self._hour_rate
-        out.type('time')
-        return out
+        return from_fixed(self.get_time_fixed(), 'time')
+
+    def get_time_fixed(self, *args, **kwargs):
+        """Get own quantity * own hour as fixed-point number."""
+        return fixedpoint.multiply(
+            fixedpoint.multiply(self._quantity.fixed(), self._quantity_b.fixed()),
+            self._hour_rate.fixed()
+        )
 
     def set_price(self, value):
         """Disable function."""
@@ -534,17 +557,25 @@ class MultiplyEntry(BaseEntry):
 
     def get_price(self, wage=Decimal('0.00'), round_price=False, *args, **kwargs):
         """Get own time * wage as price."""
-        if round_price:
-            rounder = 0
-        else:
-            rounder = 2
-        return round(
-            self.get_time(*args, **kwargs).get() * (wage + self._wage_add.get()),
-            rounder
+        return fixedpoint.to_decimal(self.get_price_fixed(
+            wage=fixedpoint.from_decimal(wage),
+            round_price=round_price
+        ))
+
+    def get_price_fixed(self, entry_list=None, wage=None, round_price=False, graph=None):
+        """Get own time * wage as fixed-point number."""
+        wage = fixedpoint.ZERO_PRICE if wage is None else wage
+        return fixedpoint.round_places(
+            fixedpoint.multiply(
+                self.get_time_fixed(),
+                fixedpoint.add(wage, self._wage_add.fixed())
+            ),
+            0 if round_price else 2
         )
 
     def set_hour_rate(self, value):
         """Set hour_rate."""
+        self.touch('_hour_rate')
         self._hour_rate.set(value)
 
     def get_hour_rate(self):
@@ -553,137 +584,13 @@ class MultiplyEntry(BaseEntry):
 
     def set_wage_add(self, value):
         """Set wage_add."""
+        self.touch('_wage_add')
         self._wage_add.set(value)
 
     def get_wage_add(self):
         """Get wage_add."""
         return self._wage_add
 
-    def to_dict(self):
-        """Convert object to dict."""
-        out = {}
-
-        # fetch all important data for this entry type
-        out['type'] = self.__class__.__name__
-        out['id'] = self.get_id()
-        out['title'] = self.title
-        out['comment'] = self.comment
-        out['quantity'] = str(self._quantity)
-        out['quantity_format'] = self.quantity_format
-        out['quantity_b'] = str(self._quantity_b)
-        out['quantity_b_format'] = self.quantity_b_format
-        out['tax'] = float(self._tax)
-        out['hour_rate'] = str(self._hour_rate)
-        out['wage_add'] = str(self._wage_add)
-        out['wage_add_explain'] = self.wage_add_explain
-
-        return out
-
-    def to_json(self, indent=2, ensure_ascii=False):
-        """Convert all data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
-
-    @classmethod
-    def from_json(cls, js=None, keep_id=True):
-        """Convert all data from json format."""
-        if js is None:
-            return cls()
-
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
-
-        # create new entry object from json
-
-        # get ID if it's no preset_loading
-        if not keep_id:
-            id = None
-        elif keep_id is True:
-            if 'id' in js.keys():
-                id = js['id']
-            else:
-                id = None
-        else:
-            id = str(keep_id)
-
-        # get other values
-        if 'title' in js.keys():
-            title = js['title']
-        else:
-            title = None
-
-        if 'comment' in js.keys():
-            comment = js['comment']
-        else:
-            comment = None
-
-        if 'quantity' in js.keys():
-            quantity = js['quantity']
-        else:
-            quantity = None
-
-        if 'quantity_format' in js.keys():
-            quantity_format = js['quantity_format']
-        else:
-            quantity_format = None
-
-        if 'quantity_b' in js.keys():
-            quantity_b = js['quantity_b']
-        else:
-            quantity_b = None
-
-        if 'quantity_b_format' in js.keys():
-            quantity_b_format = js['quantity_b_format']
-        else:
-            quantity_b_format = None
-
-        if 'tax' in js.keys():
-            tax = js['tax']
-        else:
-            tax = None
-
-        if 'hour_rate' in js.keys():
-            hour_rate = js['hour_rate']
-        else:
-            hour_rate = None
-
-        if 'wage_add' in js.keys():
-            wage_add = js['wage_add']
-        else:
-            wage_add = None
-
-        if 'wage_add_explain' in js.keys():
-            wage_add_explain = js['wage_add_explain']
-        else:
-            wage_add_explain = None
-
-        return cls(
-            id=id,
-            title=title,
-            comment=comment,
-            quantity=quantity,
-            quantity_format=quantity_format,
-            quantity_b=quantity_b,
-            quantity_b_format=quantity_b_format,
-            tax=tax,
-            hour_rate=hour_rate,
-            wage_add=wage_add,
-            wage_add_explain=wage_add_explain
-        )
-
-    def copy(self, keep_id=True):
-        """Return a copy of this object."""
-        return MultiplyEntry().from_json(js=self.to_json(), keep_id=keep_id)
-
 
 class ConnectEntry(BaseEntry):
     """
@@ -695,6 +602,23 @@ class ConnectEntry(BaseEntry):
     entries multiplied by the own multiplicator.
     """
 
+    __slots__ = ('_is_time', '_multiplicator')
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('id', 'get_id', None),
+        ('title', 'title', None),
+        ('comment', 'comment', None),
+        ('quantity', '_quantity', 'str'),
+        ('quantity_format', 'quantity_format', None),
+        ('quantity_b', '_quantity_b', 'str'),
+        ('quantity_b_format', 'quantity_b_format', None),
+        ('tax', 'get_tax', 'float'),
+        ('is_time', 'get_is_time', None),
+        ('multiplicator', 'get_multiplicator', 'float'),
+        ('connected', '_connected', 'set')
+    )
+
     def __init__(
         self,
         id=None,
@@ -725,14 +649,14 @@ class ConnectEntry(BaseEntry):
 
         # new values for this class
         self._is_time = bool(is_time)
-        self._multiplicator = Decimal(0)    # set default
+        self._multiplicator = fixedpoint.ZERO   # set default
         self.set_multiplicator(multiplicator)   # try to set arguments value
 
     def set_time(self, value):
         """Disable the function."""
         pass
 
-    def get_time(self, entry_list=None, *args, **kwargs):
+    def get_time(self, entry_list=None, graph=None, *args, **kwargs):
         """
         Get time according to entry_list or zero.
 
@@ -741,25 +665,43 @@ class ConnectEntry(BaseEntry):
         entry_list. The ConnectEntry class is an entry for multiplying entries
         times or only prices (depenging on self.is_time()) - e.g. licences
         can cost x-times multiplied the original working time of a task.
-        This class can calculate it.
+        This class can calculate it. graph can be the EntryGraph of the
+        entry_list, so that several calls share its evaluation.
         """
+        return from_fixed(
+            self.get_time_fixed(entry_list=entry_list, graph=graph),
+            'time'
+        )
+
+    def get_time_fixed(self, entry_list=None, graph=None, *args, **kwargs):
+        """Get time according to entry_list or zero as fixed-point number."""
         # if is_time() == False or entry_list not a list, return 0
         if not self.get_is_time() or type(entry_list) is not list:
-            return QuantityTime('0:00')
+            return fixedpoint.ZERO
+
+        if graph is None:
+            graph = EntryGraph(entry_list)
+
+        # entries in or behind a cycle cannot be calculated
+        if graph.in_cycle(self):
+            return fixedpoint.ZERO
+
         # is_time() == True, calculate time respecting other entires
         else:
-            # otherwise iterate through entry_list and find
-            # entries which ids exist in the self._connected list
-            out = QuantityTime('0:00')
-            for entry in entry_list:
-                if entry.get_id() in self._connected:
-                    # if its in the list, multiply its time and add it
-                    out += (self.get_multiplicator() *
-                            entry.get_time(entry_list=entry_list))
+            # multiply the (already evaluated) times of the connected entries
+            out = fixedpoint.ZERO
+            for entry in graph.get_connected(self):
+                out = fixedpoint.add(out, fixedpoint.multiply(
+                    self._multiplicator,
+                    graph.get_time_fixed(entry)
+                ))
             # return the result
-            return out * self._quantity * self._quantity_b
+            return fixedpoint.multiply(
+                fixedpoint.multiply(out, self._quantity.fixed()),
+                self._quantity_b.fixed()
+            )
 
-    def get_average_wage(self, entry_list=None, wage=None, *args, **kwargs):
+    def get_average_wage(self, entry_list=None, wage=None, graph=None, *args, **kwargs):
         """
         Get average wage according to entry_list or wage.
 
@@ -773,29 +715,45 @@ class ConnectEntry(BaseEntry):
         the wage_add from connected ConnectEntries into account.
         """
         # if is_time() == False or entry_list not a list, return wage
+        if not self.get_is_time() or type(entry_list) is not list:
+            return wage
+
+        return fixedpoint.to_decimal(self.get_average_wage_fixed(
+            entry_list=entry_list,
+            wage=fixedpoint.from_decimal(wage),
+            graph=graph
+        ))
+
+    def get_average_wage_fixed(self, entry_list=None, wage=None, graph=None):
+        """Get average wage like get_average_wage() as fixed-point number."""
+        # if is_time() == False or entry_list not a list, return wage
         if not self.get_is_time() or type(entry_list) is not list:
             return wage
         # is_time() == True, calculate time respecting other entires
         else:
-            # otherwise iterate through entry_list and find
-            # entries which ids exist in the self._connected list
-            count = 0
-            wage_sum = 0
-            for entry in entry_list:
-                if entry.get_id() in self._connected:
-                    count += 1
+            if graph is None:
+                graph = EntryGraph(entry_list)
 
-                    # if its in the list, check type and if wage_add exists
-                    if type(entry) is MultiplyEntry:
-                        wage_sum += wage + entry.get_wage_add().get()
-                    else:
-                        wage_sum += wage
+            # iterate through the connected entries
+            count = 0
+            wage_sum = fixedpoint.ZERO
+            for entry in graph.get_connected(self):
+                count += 1
+
+                # check type and if wage_add exists
+                if type(entry) is MultiplyEntry:
+                    wage_sum = fixedpoint.add(
+                        wage_sum,
+                        fixedpoint.add(wage, entry.get_wage_add().fixed())
+                    )
+                else:
+                    wage_sum = fixedpoint.add(wage_sum, wage)
 
             # return the result
             try:
-                new_wage = round((wage_sum / count), 2)
+                new_wage = fixedpoint.divide_round(wage_sum, (count, 0), 2)
             except Exception as e:
-                new_wage = 0
+                new_wage = fixedpoint.ZERO
             return new_wage
 
     def set_price(self, value):
@@ -807,6 +765,7 @@ class ConnectEntry(BaseEntry):
         entry_list=None,
         wage=Decimal('0.00'),
         round_price=False,
+        graph=None,
         *args,
         **kwargs
     ):
@@ -819,47 +778,76 @@ class ConnectEntry(BaseEntry):
         but it just calculates the prices instead of the time_module.
         wage should be a Decimal() object.
         """
+        return fixedpoint.to_decimal(self.get_price_fixed(
+            entry_list=entry_list,
+            wage=fixedpoint.from_decimal(wage),
+            round_price=round_price,
+            graph=graph
+        ))
+
+    def get_price_fixed(self, entry_list=None, wage=None, round_price=False, graph=None):
+        """Get price like get_price() as fixed-point number."""
+        wage = fixedpoint.ZERO_PRICE if wage is None else wage
+
+        if graph is None:
+            graph = EntryGraph(entry_list)
+
         # set up rounder
         if round_price:
             rounder = 0
         else:
             rounder = 2
 
-        # if no list is given, return zero
-        if type(entry_list) is None:
-            return Decimal('0.00')
         # if self.is_time() == True, just multiply self.get_hours() * wage
         if self.get_is_time():
-            avg_wage = self.get_average_wage(entry_list=entry_list, wage=wage)
-            return round(self.get_time(entry_list=entry_list).get() * avg_wage, rounder)
+            avg_wage = self.get_average_wage_fixed(
+                entry_list=entry_list,
+                wage=wage,
+                graph=graph
+            )
+            return fixedpoint.round_places(
+                fixedpoint.multiply(
+                    self.get_time_fixed(entry_list=entry_list, graph=graph),
+                    avg_wage
+                ),
+                rounder
+            )
+
+        # entries in or behind a cycle cannot be calculated
+        elif graph.in_cycle(self):
+            return fixedpoint.round_places(fixedpoint.ZERO_PRICE, rounder)
+
         else:
-            # otherwise iterate through entry_list and find prices of
-            # entries which ids exist in the self._connected list
-            # and multiply them
-            out = Decimal('0.00')
-            for entry in entry_list:
-                if entry.get_id() in self._connected:
-                    # if its in the list, multiply its price and add it
-                    out += (self.get_multiplicator() *
-                            entry.get_price(
-                                entry_list=entry_list,
-                                wage=wage))
+            # otherwise multiply the (already evaluated) prices
+            # of the connected entries
+            out = fixedpoint.ZERO_PRICE
+            for entry in graph.get_connected(self):
+                out = fixedpoint.add(out, fixedpoint.multiply(
+                    self._multiplicator,
+                    graph.get_price_fixed(entry, wage)
+                ))
             # return the value
-            return round(out * self._quantity.get() * self._quantity_b.get(), rounder)
+            return fixedpoint.round_places(
+                fixedpoint.multiply(
+                    fixedpoint.multiply(out, self._quantity.fixed()),
+                    self._quantity_b.fixed()
+                ),
+                rounder
+            )
 
     def set_multiplicator(self, value):
         """Set multiplicator."""
         # try to set a new multiplicator
         try:
             # only works, if input is integer, float or string
-            self._multiplicator = Decimal(str(value))
+            self._multiplicator = fixedpoint.from_decimal(Decimal(str(value)))
         except Exception:
             # otherwise don't do anything
             pass
 
     def get_multiplicator(self):
         """Get multiplicator."""
-        return self._multiplicator
+        return fixedpoint.to_decimal(self._multiplicator)
 
     def set_is_time(self, value):
         """Set is_time value."""
@@ -874,9 +862,11 @@ class ConnectEntry(BaseEntry):
         Append entry to the self._connected set.
 
         This function searches for the entry with the ID == entry_id
-        in the entry_list. If it exists, it checks if the own ID does
-        not exists in the found entry.get_connected() set and appends
-        it to the own self._connected set then, if it.
+        in the entry_list. If it exists, it checks that the found entry
+        does not depend on this entry (directly or over other
+        ConnectEntries), since this would make a cycle, and appends
+        it to the own self._connected set then. Disconnecting skips
+        this check, so an existing cycle can always be broken.
         """
         one_not_set = type(entry_list) is not list or type(entry_id) is None
         is_own_id = entry_id == self.get_id()
@@ -886,12 +876,13 @@ class ConnectEntry(BaseEntry):
             return False
 
         # check if other entry id exists in entry_list
+        graph = None if disconnect else EntryGraph(entry_list)
         connection_possible = False
         for index, entry in enumerate(entry_list):
             if entry.get_id() == entry_id:
-                # and also check if the entry has self.get_id()
-                # in its get_connected() set.
-                if self.get_id() not in entry.get_connected():
+                # a disconnect is always possible; when connecting
+                # check if the entry does not depend on this entry already
+                if disconnect or not graph.depends_on(entry, self.get_id()):
                     connection_possible = True
 
         # cancel if nothing found
@@ -901,9 +892,9 @@ class ConnectEntry(BaseEntry):
         # append / "connect" id to _connected set
         # or remove / "discconnect" id to _connected set
         if disconnect:
-            self._connected -= set([entry_id])
+            self._connected = self._connected - set([entry_id])
         else:
-            self._connected |= set([entry_id])
+            self._connected = self._connected | set([entry_id])
 
         return True
 
@@ -915,131 +906,179 @@ class ConnectEntry(BaseEntry):
             disconnect=True
         )
 
-    def to_dict(self):
-        """Convert object to dict."""
-        out = {}
-
-        # fetch all important data for this entry type
-        out['type'] = self.__class__.__name__
-        out['id'] = self.get_id()
-        out['title'] = self.title
-        out['comment'] = self.comment
-        out['quantity'] = str(self._quantity)
-        out['quantity_format'] = self.quantity_format
-        out['quantity_b'] = str(self._quantity_b)
-        out['quantity_b_format'] = self.quantity_b_format
-        out['tax'] = float(self._tax)
-        out['is_time'] = self.get_is_time()
-        out['multiplicator'] = float(self._multiplicator)
-        out['connected'] = list(self._connected)
-
-        return out
-
     def disconnect_all_entries(self):
         """Delete all connections."""
         self._connected = set()
 
-    def to_json(self, indent=2, ensure_ascii=False):
-        """Convert all data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
-
-    @classmethod
-    def from_json(cls, js=None, keep_id=True):
-        """Convert all data from json format."""
-        if js is None:
-            return cls()
-
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
-
-        # create new entry object from json
 
-        # get ID, if it's no preset_loading
-        if not keep_id:
-            id = None
-        elif keep_id is True:
-            if 'id' in js.keys():
-                id = js['id']
-            else:
-                id = None
-        else:
-            id = str(keep_id)
-
-        # get other values
-        if 'title' in js.keys():
-            title = js['title']
-        else:
-            title = None
-
-        if 'comment' in js.keys():
-            comment = js['comment']
-        else:
-            comment = None
-
-        if 'quantity' in js.keys():
-            quantity = js['quantity']
-        else:
-            quantity = None
+class EntryGraph(object):
+    """
+    The connections of the ConnectEntries in an entry list.
 
-        if 'quantity_format' in js.keys():
-            quantity_format = js['quantity_format']
-        else:
-            quantity_format = None
+    The graph finds the connected entries of every ConnectEntry once and
+    orders the entries, so that connected entries come before the entries
+    using them. Times and prices get evaluated in this order, the first
+    time they are needed, and are remembered (prices per wage). This way
+    every entry gets calculated only once, no matter how many ConnectEntries
+    use it. Entries in a cycle or connected to one cannot be calculated,
+    they count as zero.
 
-        if 'quantity_b' in js.keys():
-            quantity_b = js['quantity_b']
-        else:
-            quantity_b = None
+    The graph is a snapshot: after changing the entries, create a new one.
+    """
 
-        if 'quantity_b_format' in js.keys():
-            quantity_b_format = js['quantity_b_format']
-        else:
-            quantity_b_format = None
+    __slots__ = (
+        '_entry_list', '_positions', '_connected', '_order', '_times', '_prices',
+        '_evaluated'
+    )
 
-        if 'tax' in js.keys():
-            tax = js['tax']
-        else:
-            tax = None
+    def __init__(self, entry_list=None):
+        """Initialize the class."""
+        self._entry_list = entry_list if type(entry_list) is list else []
+
+        # list positions of the ids, created when needed
+        self._positions = None
+
+        # connected entries: id() of the ConnectEntry: list of entries
+        self._connected = {}
+        for entry in self._entry_list:
+            if isinstance(entry, ConnectEntry):
+                self._connected[id(entry)] = self.find_connected(entry)
+
+        self._order = self.sort()
+        self._times = {}
+        self._prices = {}
+
+        # 'time' and the wages, for which all entries got evaluated
+        self._evaluated = set()
+
+    def find_connected(self, entry=None):
+        """Return the connected entries in the order of the entry list."""
+        # an id can exist more than once
+        if self._positions is None:
+            self._positions = {}
+            for index, e in enumerate(self._entry_list):
+                self._positions.setdefault(e.get_id(), []).append(index)
+
+        found = []
+        for entry_id in entry.get_connected():
+            found.extend(self._positions.get(entry_id, ()))
+        found.sort()
+        return [self._entry_list[index] for index in found]
+
+    def get_connected(self, entry=None):
+        """Get the connected entries of the entry."""
+        try:
+            return self._connected[id(entry)]
+        except KeyError:
+            # the entry is not in the list (or no ConnectEntry)
+            if isinstance(entry, ConnectEntry):
+                return self.find_connected(entry)
+            return []
+
+    def sort(self):
+        """Return dict of id(): entry in topological order, without cycles."""
+        # entries without connections come first, in list order
+        out = {id(e): e for e in self._entry_list if id(e) not in self._connected}
+
+        # count the unevaluated connections and find the users of every entry
+        waiting = {}
+        users = {}
+        ready = []
+        for entry in self._entry_list:
+            if id(entry) in out or id(entry) in waiting:
+                continue
+
+            waiting[id(entry)] = 0
+            for other in self._connected[id(entry)]:
+                if id(other) not in out:
+                    waiting[id(entry)] += 1
+                    users.setdefault(id(other), []).append(entry)
+
+            if waiting[id(entry)] == 0:
+                ready.append(entry)
+
+        while ready:
+            entry = ready.pop()
+            if id(entry) in out:
+                continue
+            out[id(entry)] = entry
+
+            for user in users.get(id(entry), ()):
+                waiting[id(user)] -= 1
+                if waiting[id(user)] == 0:
+                    ready.append(user)
 
-        if 'is_time' in js.keys():
-            is_time = js['is_time']
-        else:
-            is_time = None
+        return out
 
-        if 'multiplicator' in js.keys():
-            multiplicator = js['multiplicator']
-        else:
-            multiplicator = None
+    def in_cycle(self, entry=None):
+        """Check if the entry is in a cycle or connected to one."""
+        if id(entry) in self._order:
+            return False
+        if isinstance(entry, ConnectEntry):
+            # entries outside the list are fine, if their connections are
+            return not all(id(e) in self._order for e in self.find_connected(entry))
+        return False
+
+    def depends_on(self, entry=None, entry_id=None):
+        """Check if the entry uses the entry with the id (over ConnectEntries)."""
+        seen = set()
+        todo = [entry]
+        while todo:
+            for other in self.get_connected(todo.pop()):
+                if other.get_id() == entry_id:
+                    return True
+                if id(other) not in seen:
+                    seen.add(id(other))
+                    todo.append(other)
+        return False
+
+    def remember_times(self, times=None):
+        """Take dict of id(): time of entries, which got calculated elsewhere."""
+        self._times.update(times)
+
+    def remember_prices(self, wage=None, prices=None):
+        """Take dict of id(): price for the wage, like remember_times()."""
+        self._prices.setdefault(wage, {}).update(prices)
+
+    def get_time_fixed(self, entry=None):
+        """Get the time of the entry as fixed-point number."""
+        times = self._times
+        if 'time' not in self._evaluated:
+            self._evaluated.add('time')
+            for key, e in self._order.items():
+                if key not in times:
+                    times[key] = e.get_time_fixed(
+                        entry_list=self._entry_list,
+                        graph=self
+                    )
 
-        if 'connected' in js.keys():
-            connected = set(js['connected'])
-        else:
-            connected = None
+        try:
+            return times[id(entry)]
+        except KeyError:
+            return entry.get_time_fixed(entry_list=self._entry_list, graph=self)
+
+    def get_price_fixed(self, entry=None, wage=None):
+        """Get the price of the entry for the wage, both fixed-point numbers."""
+        prices = self._prices.setdefault(wage, {})
+        if wage not in self._evaluated:
+            self._evaluated.add(wage)
+            for key, e in self._order.items():
+                if key not in prices:
+                    prices[key] = e.get_price_fixed(
+                        entry_list=self._entry_list,
+                        wage=wage,
+                        graph=self
+                    )
 
-        return cls(
-            id=id,
-            title=title,
-            comment=comment,
-            quantity=quantity,
-            quantity_format=quantity_format,
-            quantity_b=quantity_b,
-            quantity_b_format=quantity_b_format,
-            tax=tax,
-            is_time=is_time,
-            multiplicator=multiplicator,
-            connected=connected
-        )
+        try:
+            return prices[id(entry)]
+        except KeyError:
+            return entry.get_price_fixed(
+                entry_list=self._entry_list,
+                wage=wage,
+                graph=self
+            )
 
-    def copy(self, keep_id=True):
-        """Return a copy of this object."""
-        return ConnectEntry().from_json(js=self.to_json(), keep_id=keep_id)
+schema.register(BaseEntry)
+schema.register(MultiplyEntry)
+schema.register(ConnectEntry)
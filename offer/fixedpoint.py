@@ -0,0 +1,138 @@
+"""
+Integer fixed-point arithmetic for times and prices.
+
+A fixed-point number is a tuple (units, places) of two ints, standing for
+units * 10 ** -places. So (12550, 2) is 125.50 and (15, 1) is 1.5. It is
+the coefficient and the negative exponent of the Decimal with the same
+value, so converting back gives the same Decimal again (trailing zeros
+included).
+
+Adding and multiplying is done with plain ints. Like in the default
+Decimal context, results with more than 28 digits are rounded to 28
+digits and all rounding is half-even. This way the results are exactly
+the ones the Decimal calculations had before (only a negative zero
+becomes a zero), without creating Decimal objects in the loops.
+"""
+
+from decimal import Decimal
+
+
+PRECISION = 28
+LIMIT = 10 ** PRECISION
+
+ZERO = (0, 0)
+ZERO_PRICE = (0, 2)
+
+# powers of ten, most shifts are small
+POWERS = [10 ** i for i in range(64)]
+
+
+def power(exponent=None):
+    """Return 10 ** exponent."""
+    try:
+        return POWERS[exponent]
+    except IndexError:
+        return 10 ** exponent
+
+
+def from_decimal(value=None):
+    """Convert the Decimal (or int) into a fixed-point number."""
+    if type(value) is int:
+        return (value, 0)
+
+    if type(value) is not Decimal:
+        value = Decimal(value)
+
+    places = -value.as_tuple().exponent
+    return (int(value.scaleb(places)), places)
+
+
+def to_decimal(value=None):
+    """Convert the fixed-point number into a Decimal."""
+    return Decimal(value[0]).scaleb(-value[1])
+
+
+def divide_half_even(units=None, divisor=None):
+    """Return units / divisor rounded half-even to an int (divisor > 0)."""
+    quotient, remainder = divmod(abs(units), divisor)
+    if 2 * remainder > divisor or (2 * remainder == divisor and quotient & 1):
+        quotient += 1
+    return quotient if units >= 0 else -quotient
+
+
+def limit(units=None, places=None):
+    """Round to the precision of the Decimal context."""
+    if -LIMIT < units < LIMIT:
+        return (units, places)
+
+    # count the digits without converting to str
+    digits = abs(units).bit_length() * 1233 >> 12
+    while abs(units) >= power(digits):
+        digits += 1
+
+    shift = digits - PRECISION
+    units = divide_half_even(units, power(shift))
+
+    # rounding up can give one digit more
+    if units == LIMIT or units == -LIMIT:
+        return (units // 10, places - shift - 1)
+    return (units, places - shift)
+
+
+def round_places(value=None, places=2):
+    """Round half-even to the places, like round(Decimal, places) does."""
+    units, have = value
+    if have <= places:
+        return (units * power(places - have), places)
+    return (divide_half_even(units, power(have - places)), places)
+
+
+def add(a=None, b=None):
+    """Return a + b."""
+    # the checks of limit() are inlined, since this runs in all the loops
+    if a[1] == b[1]:
+        units, places = a[0] + b[0], a[1]
+    elif a[1] > b[1]:
+        units, places = a[0] + b[0] * power(a[1] - b[1]), a[1]
+    else:
+        units, places = a[0] * power(b[1] - a[1]) + b[0], b[1]
+
+    if -LIMIT < units < LIMIT:
+        return (units, places)
+    return limit(units, places)
+
+
+def multiply(a=None, b=None):
+    """Return a * b."""
+    units = a[0] * b[0]
+    if -LIMIT < units < LIMIT:
+        return (units, a[1] + b[1])
+    return limit(units, a[1] + b[1])
+
+
+def divide_round(a=None, b=None, places=2):
+    """
+    Return a / b rounded to the places.
+
+    Like Decimal, the quotient gets rounded to the precision first
+    and to the places afterwards.
+    """
+    units_a, units_b = abs(a[0]), abs(b[0])
+    negative = (a[0] < 0) != (b[0] < 0)
+
+    # enough digits for the precision and the rounding after it
+    shift = max(0, PRECISION + 2 + len(str(units_b)) - len(str(units_a)))
+    quotient, remainder = divmod(units_a * power(shift), units_b)
+    quotient_places = a[1] - b[1] + shift
+
+    # round to the precision, the remainder decides the ties
+    digits = len(str(quotient))
+    if digits > PRECISION:
+        cut = power(digits - PRECISION)
+        quotient, rest = divmod(quotient, cut)
+        twice = 2 * (rest * units_b + remainder)
+        if twice > cut * units_b or (twice == cut * units_b and quotient & 1):
+            quotient += 1
+        quotient_places -= digits - PRECISION
+
+    return round_places((-quotient if negative else quotient, quotient_places), places)
@@ -1,23 +1,75 @@
 """The class holds a list of entries."""
 
 from datetime import date as ddate
-from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
 from general import check_objects
+from general import schema
 from general.replacer import replacer
 from general.replacer import ReplacementDict
-import json
+from general.tracking import Tracked
+from offer import columns
+from offer import fixedpoint
+from offer import workdays
 from offer.entries import BaseEntry
 from offer.entries import MultiplyEntry
 from offer.entries import ConnectEntry
-from offer.quantitytime import QuantityTime
+from offer.entries import EntryGraph
+from offer.quantitytime import from_fixed
 import os
 
 
-class OfferInvoice(object):
+# counts the changes of dates, due days, paid dates and invoice lists
+INVOICE_REVISION = 0
+
+
+def count_invoice_revision():
+    """Count up the revision of the invoices."""
+    global INVOICE_REVISION
+    INVOICE_REVISION += 1
+
+
+def get_invoice_revision():
+    """Get the revision of the invoices."""
+    return INVOICE_REVISION
+
+
+class OfferInvoice(Tracked):
     """A class holding a list of entries."""
 
+    __slots__ = (
+        'title', 'id', 'comment', 'comment_b', 'date_fmt', '_date',
+        '_due_days', '_paid_date', 'delivery', '_wage', 'commodity',
+        '_round_price', 'ledger_comment', '_entry_list', '_revision', '_totals'
+    )
+
+    # the cached totals are no changes
+    UNTRACKED = Tracked.UNTRACKED + ('_revision', '_totals')
+
+    CHILDREN = {
+        'BaseEntry': '_entry_list',
+        'MultiplyEntry': '_entry_list',
+        'ConnectEntry': '_entry_list'
+    }
+
+    # json key (and constructor argument), attribute, kind
+    FIELDS = (
+        ('title', 'title', None),
+        ('id', 'id', None),
+        ('comment', 'comment', None),
+        ('comment_b', 'comment_b', None),
+        ('date_fmt', 'date_fmt', None),
+        ('date', '_date', 'date'),
+        ('delivery', 'delivery', None),
+        ('due_days', '_due_days', None),
+        ('paid_date', '_paid_date', 'date'),
+        ('wage', '_wage', 'float'),
+        ('commodity', 'commodity', None),
+        ('round_price', '_round_price', None),
+        ('entry_list', '_entry_list', ('BaseEntry', 'MultiplyEntry', 'ConnectEntry')),
+        ('ledger_comment', 'ledger_comment', None)
+    )
+
     def __init__(
         self,
         title=None,
@@ -36,6 +88,8 @@ class OfferInvoice(object):
         ledger_comment=None
     ):
         """Initialize the class."""
+        self._revision = 0
+        self._totals = None
         self.title = '' if title is None else str(title)
         self.id = '' if id is None else str(id)
         self.comment = '' if comment is None else str(comment)
@@ -68,14 +122,13 @@ class OfferInvoice(object):
 
         # value is other string, try to fetch it to date object
         elif type(value) is str:
-            try:
-                self._date = datetime.strptime(value, '%Y-%m-%d').date()
-            except Exception:
-                self._date = None
+            self._date = schema.parse_date(value)
 
         else:
             self._date = None
 
+        count_invoice_revision()
+
     def get_date(self):
         """Get date."""
         return self._date
@@ -84,6 +137,7 @@ class OfferInvoice(object):
         """Set due_days."""
         try:
             self._due_days = int(value)
+            count_invoice_revision()
         except Exception:
             pass
 
@@ -110,14 +164,13 @@ class OfferInvoice(object):
 
         # value is other string, try to fetch it to date object
         elif type(value) is str:
-            try:
-                self._paid_date = datetime.strptime(value, '%Y-%m-%d').date()
-            except Exception:
-                self._paid_date = None
+            self._paid_date = schema.parse_date(value)
 
         else:
             self._paid_date = None
 
+        count_invoice_revision()
+
     def get_paid_date(self):
         """Get paid_date."""
         return self._paid_date
@@ -127,6 +180,7 @@ class OfferInvoice(object):
         try:
             # only works if value is convertable to Decimal
             self._wage = Decimal(str(value))
+            self.forget_totals()
         except Exception:
             pass
 
@@ -137,6 +191,7 @@ class OfferInvoice(object):
     def set_round_price(self, value):
         """Set round_price."""
         self._round_price = bool(value)
+        self.forget_totals()
 
     def get_wage(self, project=None):
         """Get wage."""
@@ -156,6 +211,7 @@ class OfferInvoice(object):
         """Set entry_list."""
         if type(value) is list:
             self._entry_list = value
+            self.forget_totals()
 
     def get_entry_list(self):
         """Get entry_list."""
@@ -169,95 +225,76 @@ class OfferInvoice(object):
         if not is_entry:
             return
 
-        self._entry_list.append(entry)
+        self.append_child('_entry_list', entry)
+        self.forget_totals()
 
-    def pop(self, index):
-        """Pop entry with the given index from list."""
+    def replace(self, index=None, entry=None):
+        """Replace the entry with the given index in the list."""
         try:
-            self._entry_list.pop(index)
+            self.replace_child('_entry_list', index, entry)
+            self.forget_totals()
         except Exception:
             pass
 
-    def to_dict(self):
-        """Convert object to dict."""
-        out = {}
-
-        # fetch the variables
-        out['type'] = self.__class__.__name__
-        out['title'] = self.title
-        out['id'] = self.id
-        out['comment'] = self.comment
-        out['comment_b'] = self.comment_b
-        out['date_fmt'] = self.date_fmt
-
+    def move(self, index=None, direction=None):
+        """Move entry with the given index up (1) or down (-1) and return its index."""
         try:
-            out['date'] = self._date.strftime('%Y-%m-%d')
+            new_index = self.move_child('_entry_list', index, direction)
+            self.forget_totals()
+            return new_index
         except Exception:
-            out['date'] = None
-
-        out['delivery'] = self.delivery
-
-        out['due_days'] = self._due_days
+            return None
 
+    def pop(self, index):
+        """Pop entry with the given index from list."""
         try:
-            out['paid_date'] = self._paid_date.strftime('%Y-%m-%d')
+            self.pop_child('_entry_list', index)
+            self.forget_totals()
         except Exception:
-            out['paid_date'] = None
-
-        out['wage'] = float(self._wage)
-        out['commodity'] = self.commodity
-        out['round_price'] = self._round_price
-
-        # fetch the jsons from the entries
-        out['entry_list'] = []
-        for entry in self._entry_list:
-            try:
-                out['entry_list'].append(entry.to_dict())
-            except Exception:
-                out['entry_list'].append(entry)
+            pass
 
-        out['ledger_comment'] = self.ledger_comment
+    def touch(self, name=None):
+        """Count the attribute as changed, the cached totals get outdated."""
+        self.forget_totals()
+        super(OfferInvoice, self).touch(name)
+
+    def forget_totals(self):
+        """Count the revision up, so that the cached totals get outdated."""
+        self._revision += 1
+
+    def get_totals(self):
+        """
+        Get dict with the cached totals of the entries.
+
+        They are kept for the revision of this offer / invoice, which gets
+        counted up by its setters and list methods (like append() or pop())
+        and by the changes of its entries (see Tracked.touch()).
+        """
+        if self._totals is None or self._totals['revision'] != self._revision:
+            self._totals = {'revision': self._revision}
+        return self._totals
+
+    def get_graph(self):
+        """Get the cached EntryGraph of the entries."""
+        totals = self.get_totals()
+        if 'graph' not in totals:
+            totals['graph'] = EntryGraph(self._entry_list)
+        return totals['graph']
+
+    def get_columns(self):
+        """Get the cached EntryColumns of the entries or None (see offer.columns)."""
+        totals = self.get_totals()
+        if 'columns' not in totals:
+            totals['columns'] = columns.get_columns(self._entry_list)
+        return totals['columns']
 
-        return out
+    def to_dict(self):
+        """Convert object to dict."""
+        return schema.encode(self, self.FIELDS)
 
     def to_json(self, indent=2, ensure_ascii=False):
         """Convert variables data to json format."""
-        return json.dumps(
-            self.to_dict(),
-            indent=indent,
-            ensure_ascii=ensure_ascii,
-            sort_keys=True
-        )
-
-    def load_entry_list_from_js(self, lis=None):
-        """Convert list to entry object list."""
-        entry_list = []
-        # cycle through the list of dicts
-        for entry in lis:
-            # it should have a type key
-            if 'type' in entry.keys():
-                # entry is BaseEntry
-                if entry['type'] == 'BaseEntry':
-                    # convert this dict to an offer objetc then!
-                    entry_list.append(BaseEntry().from_json(
-                        js=entry
-                    ))
-
-                # entry is MultiplyEntry
-                if entry['type'] == 'MultiplyEntry':
-                    # convert this dict to an offer objetc then!
-                    entry_list.append(MultiplyEntry().from_json(
-                        js=entry
-                    ))
-
-                # entry is ConnectEntry
-                if entry['type'] == 'ConnectEntry':
-                    # convert this dict to an offer objetc then!
-                    entry_list.append(ConnectEntry().from_json(
-                        js=entry
-                    ))
-
-        return entry_list
+        return schema.dumps(self.to_dict(), indent=indent, ensure_ascii=ensure_ascii)
 
     @classmethod
     def from_json(cls, js=None):
@@ -265,109 +302,13 @@ class OfferInvoice(object):
         if js is None:
             return cls()
 
-        # get js as dict
-        if type(js) is not dict:
-            try:
-                js = json.loads(js)
-            except Exception:
-                # return default object
-                return cls()
+        # get js as dict or return default object
+        js = schema.load_dict(js)
+        if js is None:
+            return cls()
 
         # create object from json
-        if 'title' in js.keys():
-            title = js['title']
-        else:
-            title = None
-
-        if 'id' in js.keys():
-            id = js['id']
-        else:
-            id = None
-
-        if 'comment' in js.keys():
-            comment = js['comment']
-        else:
-            comment = None
-
-        if 'comment_b' in js.keys():
-            comment_b = js['comment_b']
-        else:
-            comment_b = None
-
-        if 'date_fmt' in js.keys():
-            date_fmt = js['date_fmt']
-        else:
-            date_fmt = None
-
-        if 'date' in js.keys():
-            try:
-                date = datetime.strptime(js['date'], '%Y-%m-%d').date()
-            except Exception:
-                date = None
-        else:
-            date = None
-
-        if 'delivery' in js.keys():
-            delivery = js['delivery']
-        else:
-            delivery = None
-
-        if 'due_days' in js.keys():
-            due_days = js['due_days']
-        else:
-            due_days = None
-
-        if 'paid_date' in js.keys():
-            try:
-                paid_date = datetime.strptime(js['paid_date'], '%Y-%m-%d').date()
-            except Exception:
-                paid_date = None
-        else:
-            paid_date = None
-
-        if 'wage' in js.keys():
-            wage = js['wage']
-        else:
-            wage = None
-
-        if 'commodity' in js.keys():
-            commodity = js['commodity']
-        else:
-            commodity = None
-
-        if 'round_price' in js.keys():
-            round_price = js['round_price']
-        else:
-            round_price = None
-
-        if 'entry_list' in js.keys():
-            entry_list = js['entry_list']
-            entry_list = cls().load_entry_list_from_js(lis=entry_list)
-        else:
-            entry_list = None
-
-        if 'ledger_comment' in js.keys():
-            ledger_comment = js['ledger_comment']
-        else:
-            ledger_comment = None
-
-        # return new object
-        return cls(
-            title=title,
-            id=id,
-            comment=comment,
-            comment_b=comment_b,
-            date_fmt=date_fmt,
-            date=date,
-            delivery=delivery,
-            due_days=due_days,
-            paid_date=paid_date,
-            wage=wage,
-            commodity=commodity,
-            round_price=round_price,
-            entry_list=entry_list,
-            ledger_comment=ledger_comment
-        )
+        return cls(**schema.decode(js, cls.FIELDS))
 
     def get_price_total(self, wage=None, project=None, tax=False, round_price=None):
         """Get prices of entries summerized."""
@@ -377,25 +318,63 @@ class OfferInvoice(object):
         if round_price is None:
             round_price = self._round_price
 
-        # init output variable
-        out = Decimal(0)
-
-        # iterate through the entries and get its price
-        for e in self._entry_list:
-            out += e.get_price(
-                entry_list=self._entry_list,
-                wage=wage
-            ) if not tax else e.get_price_tax(
-                entry_list=self._entry_list,
-                wage=wage,
-                round_price=round_price
+        # sum up with fixed-point numbers and convert only the result
+        wage = fixedpoint.from_decimal(wage)
+
+        # calculate only, if the entries changed
+        totals = self.get_totals()
+        key = ('price', wage, bool(round_price), bool(tax))
+        if key in totals:
+            return totals[key]
+
+        # very large lists get calculated with numpy first
+        entry_columns = self.get_columns()
+        if entry_columns is None:
+            graph = self.get_graph()
+        elif entry_columns.is_complete():
+            # without ConnectEntries there is nothing to connect
+            graph = None
+        else:
+            # the graph only calculates the other entries then
+            graph = self.get_graph()
+            graph.remember_prices(wage, entry_columns.get_prices(wage))
+
+        # the prices of the entries, the tax with the price rounded or not
+        def value(entry):
+            if tax:
+                return entry.get_price_tax_fixed(
+                    entry_list=self._entry_list,
+                    wage=wage,
+                    round_price=round_price,
+                    graph=graph
+                )
+            elif graph is not None:
+                return graph.get_price_fixed(entry, wage)
+            return entry.get_price_fixed(entry_list=self._entry_list, wage=wage)
+
+        if entry_columns is None:
+            out = self.add_up(value)
+        else:
+            out = entry_columns.add_up(
+                entry_columns.calculate_taxes(wage, round_price) if tax
+                else entry_columns.calculate_prices(wage),
+                self._entry_list,
+                value
             )
 
-        # return it, check if rounded or not
+        # remember it, check if rounded or not
         if round_price and not tax:
-            return round(out)
+            totals[key] = round(fixedpoint.to_decimal(out))
         else:
-            return out
+            totals[key] = fixedpoint.to_decimal(out)
+        return totals[key]
+
+    def add_up(self, value=None):
+        """Return the sum of value(entry) of all entries as fixed-point number."""
+        out = fixedpoint.ZERO
+        for e in self._entry_list:
+            out = fixedpoint.add(out, value(e))
+        return out
 
     def get_price_tax_total(self, wage=None, project=None, round_price=None):
         """Get summerized total tax prices form entry_list."""
@@ -408,18 +387,123 @@ class OfferInvoice(object):
 
     def get_time_total(self):
         """Get times of entries summerized."""
-        # init output variable
-        out = QuantityTime('0:00')
+        # calculate only, if the entries changed
+        totals = self.get_totals()
+        if 'time' not in totals:
+            # very large lists get calculated with numpy first
+            entry_columns = self.get_columns()
+            if entry_columns is None:
+                totals['time'] = self.add_up(self.get_graph().get_time_fixed)
+            elif entry_columns.is_complete():
+                # without ConnectEntries there is nothing to connect
+                totals['time'] = entry_columns.add_up(
+                    entry_columns.calculate_times(),
+                    self._entry_list,
+                    lambda e: e.get_time_fixed()
+                )
+            else:
+                # the graph only calculates the other entries then
+                graph = self.get_graph()
+                graph.remember_times(entry_columns.get_times())
+                totals['time'] = entry_columns.add_up(
+                    entry_columns.calculate_times(),
+                    self._entry_list,
+                    graph.get_time_fixed
+                )
+
+        # return it as a new object, since QuantityTime can be changed
+        return from_fixed(totals['time'], 'time')
+
+    def evaluate_entries(self, wage=None, project=None, round_price=None):
+        """
+        Get list with a row dict for every entry in one pass.
+
+        The rows hold the entry and its calculated 'time', 'price',
+        'unit_price', 'tax', 'unit_tax', 'total' and 'unit_total', like
+        the single getters of the entries would return them. The rows get
+        cached like the totals, so they should not be changed.
+        """
+        if wage is None:
+            wage = self.get_wage(project=project)
+
+        if round_price is None:
+            round_price = self._round_price
+
+        wage = fixedpoint.from_decimal(wage)
 
-        # iterate through the entries and get its time
+        # calculate only, if the entries changed
+        totals = self.get_totals()
+        key = ('rows', wage, bool(round_price))
+        if key in totals:
+            return totals[key]
+
+        graph = self.get_graph()
+
+        # very large lists get calculated with numpy first
+        prices = {}
+        entry_columns = self.get_columns()
+        if entry_columns is not None:
+            prices = entry_columns.get_prices(wage, round_price)
+            if not round_price:
+                graph.remember_prices(wage, prices)
+            graph.remember_times(entry_columns.get_times())
+
+        out = []
         for e in self._entry_list:
-            out += e.get_time(
-                entry_list=self._entry_list
+            # the connected entries use the cent prices of the graph
+            if id(e) in prices:
+                price = prices[id(e)]
+            elif round_price:
+                price = e.get_price_fixed(
+                    entry_list=self._entry_list,
+                    wage=wage,
+                    round_price=round_price,
+                    graph=graph
+                )
+            else:
+                price = graph.get_price_fixed(e, wage)
+            tax = fixedpoint.round_places(
+                fixedpoint.multiply(e.get_tax_fixed(), price),
+                2
             )
 
-        # return it
+            # unit values are divided by the quantity, if its > 0
+            quantity = e.get_quantity().fixed()
+            if quantity[0] > 0:
+                unit_price = fixedpoint.divide_round(price, quantity, 2)
+                unit_tax = fixedpoint.divide_round(tax, quantity, 2)
+            else:
+                unit_price = fixedpoint.round_places(price, 2)
+                unit_tax = fixedpoint.round_places(tax, 2)
+
+            out.append({
+                'entry': e,
+                'time': e.get_time(entry_list=self._entry_list, graph=graph),
+                'price': fixedpoint.to_decimal(price),
+                'unit_price': fixedpoint.to_decimal(unit_price),
+                'tax': fixedpoint.to_decimal(tax),
+                'unit_tax': fixedpoint.to_decimal(unit_tax),
+                'total': fixedpoint.to_decimal(fixedpoint.add(price, tax)),
+                'unit_total': fixedpoint.to_decimal(fixedpoint.add(unit_price, unit_tax))
+            })
+
+        totals[key] = out
         return out
 
+    def get_entry_row(self, entry=None, wage=None, project=None, round_price=None):
+        """Get the row of evaluate_entries() for the entry or None."""
+        rows = self.evaluate_entries(
+            wage=wage,
+            project=project,
+            round_price=round_price
+        )
+
+        # index the rows for looking up single entries, once per rows list
+        key = ('index', id(rows))
+        if key not in self._totals:
+            self._totals[key] = {id(row['entry']): row for row in rows}
+        return self._totals[key].get(id(entry))
+
     def get_hourly_wage(self, wage=None, project=None, tax=False, round_price=None):
         """Calculate hourly wage according to price and time."""
         if wage is None:
@@ -468,100 +552,45 @@ class OfferInvoice(object):
         # return calculation
         return finish_days
 
-    def get_finish_date(self, project=None):
+    def get_finish_date(self, project=None, settings=None):
         """Calculate and return the finish date."""
-        # if no project is given, return 1987-15-10
-        if not check_objects.is_project(project) or self._date is None:
-            return ddate(1987, 10, 15)
-
-        # get time needed for this offer
-        time = self.get_time_total()
-
-        # get initial date
-        date = self._date
-
-        # get first workday
-        while date.weekday() not in project.get_work_days():
-            date += timedelta(days=1)
-
-        # add minimum_days
-        min_days = project.get_minimum_days()
-        while min_days > 0:
-            # add the day only, if it is a working day
-            if date.weekday() in project.get_work_days():
-                min_days -= 1
-
-            # add a day
-            date += timedelta(days=1)
-
-        # subtract hours_per_day from time on work_days, till time <= 0
-        while time > 0:
-            # it's a work day so subtract hours_per_day from time
-            if date.weekday() in project.get_work_days():
-                time -= project.get_hours_per_day()
+        return self.get_finish_date_and_days(project=project, settings=settings)[0]
 
-            # add a day
-            date += timedelta(days=1)
+    def get_finish_date_and_days(self, project=None, settings=None):
+        """
+        Calculate and return the finish date and finish days.
 
-        return date
-
-    def get_finish_date_and_days(self, project=None):
-        """Calculate and return the finish date and finish days."""
+        The holidays and vacations of the holiday files of the settings
+        and the project are no work days.
+        """
         # if no project is given, return 1987-15-10
         if not check_objects.is_project(project) or self._date is None:
             return ddate(1987, 10, 15), 0
 
-        # get time needed for this offer
-        time = self.get_time_total()
-
-        # get initial date
-        date = self._date
-
-        # initialize finish days output
-        days = 0
-
-        # get first workday
-        while date.weekday() not in project.get_work_days():
-            days += 1
-            date += timedelta(days=1)
-
-        # add minimum_days
-        min_days = project.get_minimum_days()
-        while min_days > 0:
-            # add the day only, if it is a working day
-            if date.weekday() in project.get_work_days():
-                min_days -= 1
-
-            # add a day
-            days += 1
-            date += timedelta(days=1)
-
-        # subtract hours_per_day from time on work_days, till time <= 0
-        while time > 0:
-            # t's a work day so subtract hours_per_day from time
-            if date.weekday() in project.get_work_days():
-                time -= project.get_hours_per_day()
-
-            # add a day
-            days += 1
-            date += timedelta(days=1)
+        # the minimum_days and the days for the time needed for this offer,
+        # starting on the first work day
+        days = max(project.get_minimum_days(), 0) + workdays.count_days(
+            self.get_time_total().fixed(),
+            project.get_hours_per_day()
+        )
+        calendar = workdays.get_calendar(
+            project.get_work_days(),
+            [
+                settings.holiday_file if check_objects.is_settings(settings) else '',
+                project.holiday_file
+            ]
+        )
+        date = calendar.add_work_days(self._date, days)
 
-        return date, days
+        return date, (date - self._date).days
 
     def get_project(self, global_list=None):
         """Get project of this offer/invoice."""
         if not check_objects.is_list(global_list):
             return False
 
-        # iter through the projects
-        for project in global_list.project_list:
-            # offer found, return its project
-            if self in project.get_offer_list():
-                return project
-
-            # invoice found, return its project
-            if self in project.get_invoice_list():
-                return project
+        # look it up in the lists reverse index
+        return global_list.get_owner(item=self)[0]
 
     def get_client(self, global_list=None, project=None):
         """Get client of this offer/invoice."""
@@ -653,39 +682,17 @@ class OfferInvoice(object):
         # get entries
         entries = []
         position = 0
-        for e in self._entry_list:
+        for row in self.evaluate_entries(project=project):
+            e = row['entry']
             position += 1
 
-            time = e.get_time(
-                entry_list=self._entry_list
-            )
-
-            price = e.get_price(
-                entry_list=self._entry_list,
-                wage=self.get_wage(project=project),
-                round_price=self._round_price
-            )
-
-            price_unit = e.get_unit_price(
-                entry_list=self._entry_list,
-                wage=self.get_wage(project=project),
-                round_price=self._round_price
-            )
-
-            tax = e.get_price_tax(
-                entry_list=self._entry_list,
-                wage=self.get_wage(project=project),
-                round_price=self._round_price
-            )
-
-            tax_unit = e.get_unit_price_tax(
-                entry_list=self._entry_list,
-                wage=self.get_wage(project=project),
-                round_price=self._round_price
-            )
-
-            total = price + tax
-            total_unit = price_unit + tax_unit
+            time = row['time']
+            price = row['price']
+            price_unit = row['unit_price']
+            tax = row['tax']
+            tax_unit = row['unit_tax']
+            total = row['total']
+            total_unit = row['unit_total']
 
             if type(e) is MultiplyEntry:
                 wage_add = str(e.get_wage_add())
@@ -698,9 +705,7 @@ class OfferInvoice(object):
                 'E_POSITION': position,
                 'E_TITLE': e.title,
                 'E_COMMENT': e.comment,
-                'E_TIME': e.get_time(
-                    entry_list=self._entry_list
-                ),
+                'E_TIME': time,
                 'E_QUANTITY': e.get_quantity_str(),
                 'E_QUANTITY_B': e.get_quantity_b_str(),
                 'E_PRICE': '{} {}'.format(price, replace_me['COMMODITY']),
@@ -765,14 +770,26 @@ class OfferInvoice(object):
 class Offer(OfferInvoice):
     """The offer object."""
 
+    __slots__ = ()
+
     def copy(self):
         """Copy the own offer into new offer object."""
-        return Offer().from_json(js=self.to_json())
+        out = self.structural_copy()
+        out.forget_totals()
+        return out
 
 
 class Invoice(OfferInvoice):
     """The invoice object."""
 
+    __slots__ = ()
+
     def copy(self):
-        """Copy the own offer into new offer object."""
-        return Invoice().from_json(js=self.to_json())
+        """Copy the own invoice into new invoice object."""
+        out = self.structural_copy()
+        out.forget_totals()
+        return out
+
+
+schema.register(Offer)
+schema.register(Invoice)
@@ -1,6 +1,67 @@
 """The class for the quantity of the entries."""
 
 from decimal import Decimal
+from offer import fixedpoint
+
+
+# parsed input strings: string: (full, type) or None, if it is invalid
+PARSED = {}
+PARSED_MAX = 10000
+
+
+def parse(i=None):
+    """Return (full, type) of the time string or decimal or None."""
+    try:
+        # it's directly convertable to Decimal
+        return (Decimal(str(i)), 'decimal')
+    except Exception:
+        # it has to be parsed
+        # split by ':'
+        full = Decimal(0)
+        for c, num in enumerate(str(i).split(':')):
+            try:
+                # convert to full hours / minutes / whatever
+                if c == 0:
+                    full += Decimal(num)
+
+                # convert to minutes and return new values
+                elif c == 1:
+                    full += Decimal(num) / Decimal(60)
+                    return (full, 'time')
+
+            except Exception:
+                # error, cancel
+                return None
+
+    return None
+
+
+def parse_cached(i=None):
+    """Like parse(), but remember the results for the strings."""
+    try:
+        return PARSED[i]
+    except KeyError:
+        out = parse(i)
+        # the entries repeat few strings like '1:00', so this rarely fills up
+        if len(PARSED) < PARSED_MAX:
+            PARSED[i] = out
+        return out
+
+
+def from_full(full=None, type='decimal'):
+    """Return new QuantityTime of the Decimal without parsing anything."""
+    out = QuantityTime.__new__(QuantityTime)
+    out._full = full
+    out._type = type
+    out._fixed = None
+    return out
+
+
+def from_fixed(value=None, type='decimal'):
+    """Return new QuantityTime of the fixed-point number."""
+    out = from_full(fixedpoint.to_decimal(value), type)
+    out._fixed = value
+    return out
 
 
 class QuantityTime(object):
@@ -11,10 +72,16 @@ class QuantityTime(object):
     like "1:45", if the internal value is 1.75, for example.
     """
 
+    __slots__ = ('_type', '_full', '_fixed')
+
+    # the cached fixed-point value is no change for general/tracking.py
+    UNTRACKED = ('_fixed',)
+
     def __init__(self, input=None):
         """Initialize the class."""
         self._type = 'decimal'      # decimal | time
         self._full = Decimal(0)     # set default
+        self._fixed = None          # _full as fixed-point number, if needed
         self.set(i=input)           # try to set arguments value
 
     def __str__(self):
@@ -35,14 +102,11 @@ class QuantityTime(object):
 
         # check if same type and calculate
         if type(other) is QuantityTime:
-            out += Decimal(other._full)
+            out += other._full
         else:
             out += Decimal(other)
 
-        out = QuantityTime(out)
-        out.type(self._type)
-
-        return out
+        return from_full(out, self._type)
 
     def __radd__(self, other):
         """Add."""
@@ -54,30 +118,24 @@ class QuantityTime(object):
 
         # check if same type and calculate
         if type(other) is QuantityTime:
-            out -= Decimal(other._full)
+            out -= other._full
         else:
             out -= Decimal(other)
 
-        out = QuantityTime(out)
-        out.type(self._type)
-
-        return out
+        return from_full(out, self._type)
 
     def __rsub__(self, other):
         """Sub."""
         # check if same type
         if type(other) is QuantityTime:
-            out = Decimal(other._full)
+            out = other._full
         else:
             out = Decimal(other)
 
         # calculate
-        out -= Decimal(self._full)
-
-        out = QuantityTime(out)
-        out.type(self._type)
+        out -= self._full
 
-        return out
+        return from_full(out, self._type)
 
     def __mul__(self, other):
         """Multiply."""
@@ -85,14 +143,11 @@ class QuantityTime(object):
 
         # check if same type and calculate
         if type(other) is QuantityTime:
-            out *= Decimal(other._full)
+            out *= other._full
         else:
             out *= Decimal(other)
 
-        out = QuantityTime(out)
-        out.type(self._type)
-
-        return out
+        return from_full(out, self._type)
 
     def __rmul__(self, other):
         """Multiply."""
@@ -104,30 +159,24 @@ class QuantityTime(object):
 
         # check if same type and calculate
         if type(other) is QuantityTime:
-            out /= Decimal(other._full)
+            out /= other._full
         else:
             out /= Decimal(other)
 
-        out = QuantityTime(out)
-        out.type(self._type)
-
-        return out
+        return from_full(out, self._type)
 
     def __rtruediv__(self, other):
         """Divide."""
         # check if same type
         if type(other) is QuantityTime:
-            out = Decimal(other._full)
+            out = other._full
         else:
             out = Decimal(other)
 
         # calculate
-        out /= Decimal(self._full)
-
-        out = QuantityTime(out)
-        out.type(self._type)
+        out /= self._full
 
-        return out
+        return from_full(out, self._type)
 
     def __lt__(self, other):
         """Lower than."""
@@ -174,43 +223,38 @@ class QuantityTime(object):
     def __round__(self, *args):
         """Round."""
         self._full = round(self._full, *args)
+        self._fixed = None
         return self
 
     def set(self, i=None):
         """Convert object from time string or decimal."""
-        try:
-            # it's directly convertable to Decimal
-            self._full = Decimal(str(i))
-            self._type = 'decimal'
-            return True
-        except Exception:
-            # it has to be parsed
-            # split by ':'
-            full = Decimal(0)
-            for c, num in enumerate(str(i).split(':')):
-                try:
-                    # convert to full hours / minutes / whatever
-                    if c == 0:
-                        full += Decimal(num)
-
-                    # convert to minutes and set new values
-                    elif c == 1:
-                        # convert to minutes
-                        full += Decimal(num) / Decimal(60)
-
-                        # set new values
-                        self._full = full
-                        self._type = 'time'
-                        return True
-
-                except Exception:
-                    # error, cancel
-                    return False
+        # Decimals and ints need no string parsing, strings are cached
+        if type(i) is Decimal:
+            parsed = (i, 'decimal')
+        elif type(i) is int:
+            parsed = (Decimal(i), 'decimal')
+        elif type(i) is str:
+            parsed = parse_cached(i)
+        else:
+            parsed = parse(i)
+
+        if parsed is None:
+            return False
+
+        self._full, self._type = parsed
+        self._fixed = None
+        return True
 
     def get(self):
         """Get decimal full as Decimal."""
         return self._full
 
+    def fixed(self):
+        """Get decimal full as fixed-point number (see offer/fixedpoint.py)."""
+        if self._fixed is None:
+            self._fixed = fixedpoint.from_decimal(self._full)
+        return self._fixed
+
     def full_remain(self):
         """Get (full, remain) tuple."""
         h, m = divmod(self._full, 1)
@@ -0,0 +1,368 @@
+"""
+Working day calendar for the finish dates.
+
+The working days repeat every week, so the date after a number of working
+days can be calculated with whole weeks and the remaining days of the
+last week, instead of walking through the calendar day by day.
+
+Holidays and vacations come from local iCalendar (.ics) or CSV files.
+WorkCalendar keeps a sorted list of the working days per year, which is
+searched with bisect. After the last year with holidays the weeks repeat
+again and the calculation above is used.
+"""
+
+from bisect import bisect_left
+from datetime import date as ddate
+from datetime import timedelta
+from general.schema import parse_date
+import os
+
+
+# loaded holiday files: path: (modification time, size, holidays)
+FILES = {}
+
+# calendars: (weekdays, holidays of the files): WorkCalendar
+CALENDARS = {}
+MAX_CALENDARS = 64
+
+# holidays are (frozenset of dates, tuple of yearly rules),
+# a yearly rule is (month, day, days, first year, last year or None)
+NO_HOLIDAYS = (frozenset(), ())
+
+
+def get_weekdays(work_days=None):
+    """Return sorted tuple of the valid weekdays (0 = monday) in work_days."""
+    try:
+        return tuple(sorted({d for d in work_days if d in range(7)}))
+    except Exception:
+        return ()
+
+
+def count_days(hours=None, hours_per_day=None):
+    """
+    Return the number of working days needed for the hours.
+
+    hours is a fixed-point number (units, places), every started day
+    counts as a whole day.
+    """
+    units, places = hours
+    if units <= 0:
+        return 0
+
+    if places < 0:
+        units, places = units * 10 ** -places, 0
+
+    # ceiling division with ints only
+    return -(-units // (max(hours_per_day, 1) * 10 ** places))
+
+
+def first_work_day(start=None, work_days=None):
+    """Return the first working day on or after start."""
+    weekdays = get_weekdays(work_days)
+    if not weekdays:
+        return start
+
+    offset = min((d - start.weekday()) % 7 for d in weekdays)
+    return start + timedelta(days=offset)
+
+
+def add_work_days(start=None, count=0, work_days=None):
+    """
+    Return the day after the count-th working day from start on.
+
+    start itself is counted, if it is a working day. For count <= 0 the
+    first working day on or after start is returned. Without any working
+    days start is returned, dates beyond the calendar give date.max.
+    """
+    weekdays = get_weekdays(work_days)
+    if not weekdays:
+        return start
+    if count <= 0:
+        return first_work_day(start, weekdays)
+
+    # days from start to the working days of the first week
+    offsets = sorted((d - start.weekday()) % 7 for d in weekdays)
+    weeks, rest = divmod(count - 1, len(offsets))
+
+    try:
+        return start + timedelta(days=weeks * 7 + offsets[rest] + 1)
+    except OverflowError:
+        return ddate.max
+
+
+def count_weekdays(year=None, weekdays=None):
+    """Return the number of days of the year with one of the weekdays."""
+    first = ddate(year, 1, 1)
+    last = ddate(year, 12, 31)
+    weeks, rest = divmod((last - first).days + 1, 7)
+    return weeks * len(weekdays) + sum(
+        1 for i in range(rest) if (first.weekday() + i) % 7 in weekdays
+    )
+
+
+def parse_ics_date(line=None):
+    """Return the date of the iCalendar line and if it has a time or None."""
+    value = line[line.rfind(':') + 1:].strip()
+    day = parse_date('{}-{}-{}'.format(value[0:4], value[4:6], value[6:8]))
+    if day is None:
+        return None, False
+    return day, 'T' in value and not value.endswith(('T000000', 'T000000Z'))
+
+
+def parse_rule(line=None):
+    """Return dict of the iCalendar RRULE line."""
+    out = {}
+    for part in line[line.find(':') + 1:].strip().split(';'):
+        key, _, value = part.partition('=')
+        out[key.upper()] = value
+    return out
+
+
+def parse_event(lines=None):
+    """Return holidays of the lines of one iCalendar VEVENT."""
+    start, end, rule = None, None, None
+    for line in lines:
+        name = line.split(':', 1)[0].split(';', 1)[0].upper()
+        if name == 'DTSTART':
+            start = parse_ics_date(line)[0]
+        elif name == 'DTEND':
+            end, end_time = parse_ics_date(line)
+            # the end is exclusive, unless it is a time during the day
+            if end is not None and end_time:
+                end += timedelta(days=1)
+        elif name == 'RRULE':
+            rule = parse_rule(line)
+
+    if start is None:
+        return NO_HOLIDAYS
+    days = max((end - start).days, 1) if end is not None else 1
+
+    # yearly repeating events (like public holidays), other rules
+    # only get their first date
+    if rule is not None and rule.get('FREQ') == 'YEARLY' and not any(
+        key.startswith('BY') and key != 'BYMONTH' for key in rule
+    ):
+        last = None
+        if rule.get('COUNT', '').isdigit():
+            last = start.year + int(rule['COUNT']) - 1
+        elif rule.get('UNTIL'):
+            until = parse_ics_date(rule['UNTIL'])[0]
+            if until is not None:
+                last = until.year - (
+                    (until.month, until.day) < (start.month, start.day)
+                )
+        days = min(days, 366)
+        return frozenset(), ((start.month, start.day, days, start.year, last),)
+
+    return frozenset(start + timedelta(days=i) for i in range(days)), ()
+
+
+def parse_ics(text=None):
+    """Return holidays of the events in the iCalendar text."""
+    # unfold the lines, which go on in the next line
+    lines = []
+    for line in text.splitlines():
+        if line[:1] in (' ', '\t') and lines:
+            lines[-1] += line[1:]
+        else:
+            lines.append(line)
+
+    dates = set()
+    rules = []
+    event = None
+    for line in lines:
+        if line.strip().upper() == 'BEGIN:VEVENT':
+            event = []
+        elif line.strip().upper() == 'END:VEVENT' and event is not None:
+            event_dates, event_rules = parse_event(event)
+            dates.update(event_dates)
+            rules.extend(event_rules)
+            event = None
+        elif event is not None:
+            event.append(line)
+
+    return frozenset(dates), tuple(rules)
+
+
+def parse_csv(text=None):
+    """
+    Return holidays of the CSV text.
+
+    Every row is 'YYYY-MM-DD' or 'YYYY-MM-DD,YYYY-MM-DD' for the first and
+    the last day of a vacation, more columns (like a title) are ignored.
+    Rows without a date (like a header) are skipped.
+    """
+    dates = set()
+    for line in text.splitlines():
+        row = [v.strip().strip('"') for v in line.replace(';', ',').split(',')]
+        start = parse_date(row[0])
+        if start is None:
+            continue
+
+        end = parse_date(row[1]) if len(row) > 1 else None
+        if end is None or end < start:
+            end = start
+        dates.update(start + timedelta(days=i) for i in range((end - start).days + 1))
+
+    return frozenset(dates), ()
+
+
+def load_holidays(path=None):
+    """Return holidays of the iCalendar or CSV file, loaded again only if it changed."""
+    try:
+        path = os.path.expanduser(str(path))
+        stat = os.stat(path)
+    except Exception:
+        return NO_HOLIDAYS
+
+    cached = FILES.get(path)
+    if cached is not None and cached[0:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except Exception:
+        return NO_HOLIDAYS
+
+    try:
+        if 'BEGIN:VCALENDAR' in text[:1000].upper():
+            holidays = parse_ics(text)
+        else:
+            holidays = parse_csv(text)
+    except Exception:
+        holidays = NO_HOLIDAYS
+
+    FILES[path] = (stat.st_mtime, stat.st_size, holidays)
+    return holidays
+
+
+def get_calendar(work_days=None, files=None):
+    """Return the WorkCalendar for the work_days and the holidays of the files."""
+    weekdays = get_weekdays(work_days)
+    holidays = tuple(load_holidays(f) for f in files or [] if f)
+
+    key = (weekdays, holidays)
+    if key not in CALENDARS:
+        if len(CALENDARS) >= MAX_CALENDARS:
+            CALENDARS.clear()
+
+        dates = set()
+        rules = []
+        for file_dates, file_rules in holidays:
+            dates.update(file_dates)
+            rules.extend(file_rules)
+        CALENDARS[key] = WorkCalendar(weekdays, dates, rules)
+
+    return CALENDARS[key]
+
+
+class WorkCalendar(object):
+    """The working days of the week without the holidays, indexed per year."""
+
+    __slots__ = ('_weekdays', '_dates', '_rules', '_last_year', '_years', '_counts')
+
+    def __init__(self, work_days=None, dates=None, rules=None):
+        """Initialize the class."""
+        self._weekdays = get_weekdays(work_days)
+        self._dates = frozenset(dates or [])
+        self._rules = tuple(rules or [])
+
+        # after this year the weeks repeat (None: never, 0: no holidays),
+        # the last yearly holidays can go on in the next year
+        years = [d.year for d in self._dates] + [
+            None if r[4] is None else r[4] + 1 for r in self._rules
+        ]
+        self._last_year = None if None in years else max(years + [0])
+
+        # sorted working days per year: year: list of ordinals,
+        # the number of working days of the other years: year: int
+        self._years = {}
+        self._counts = {}
+
+    def get_weekdays(self):
+        """Get the weekdays (0 = monday), which are working days."""
+        return self._weekdays
+
+    def get_holidays(self, year=None):
+        """Get set of the holidays in the year."""
+        out = {d for d in self._dates if d.year == year}
+
+        # the holidays of last year can go on in this year
+        for month, day, days, first, last in self._rules:
+            for y in (year - 1, year):
+                if y < first or (last is not None and y > last):
+                    continue
+                # ValueError: like february 29th in other years
+                try:
+                    start = ddate(y, month, day)
+                    out.update(
+                        d for d in (start + timedelta(days=i) for i in range(days))
+                        if d.year == year
+                    )
+                except (ValueError, OverflowError):
+                    continue
+        return out
+
+    def get_year(self, year=None):
+        """Get the sorted list of the ordinals of the working days in the year."""
+        if year not in self._years:
+            holidays = {d.toordinal() for d in self.get_holidays(year)}
+            first = ddate(year, 1, 1).toordinal()
+            last = ddate(year, 12, 31).toordinal()
+            self._years[year] = [
+                o for o in range(first, last + 1)
+                if (o - 1) % 7 in self._weekdays and o not in holidays
+            ]
+        return self._years[year]
+
+    def count_year(self, year=None):
+        """Count the working days of the year without building its index."""
+        if year in self._years:
+            return len(self._years[year])
+        if year not in self._counts:
+            self._counts[year] = count_weekdays(year, self._weekdays) - sum(
+                1 for d in self.get_holidays(year) if d.weekday() in self._weekdays
+            )
+        return self._counts[year]
+
+    def is_work_day(self, day=None):
+        """Check if the day is a working day."""
+        days = self.get_year(day.year)
+        i = bisect_left(days, day.toordinal())
+        return i < len(days) and days[i] == day.toordinal()
+
+    def add_work_days(self, start=None, count=0):
+        """Return the day after the count-th working day from start on."""
+        if not self._weekdays:
+            return start
+        if count <= 0:
+            end = self.add_work_days(start, 1)
+            return end if end == ddate.max else end - timedelta(days=1)
+
+        year = start.year
+        position = start.toordinal()
+        while year <= 9999:
+            # the weeks repeat without holidays
+            if self._last_year is not None and year > self._last_year:
+                begin = start if year == start.year else ddate(year, 1, 1)
+                return add_work_days(begin, count, self._weekdays)
+
+            # skip whole years without building their index
+            if year != start.year and count > self.count_year(year):
+                count -= self.count_year(year)
+                year += 1
+                continue
+
+            days = self.get_year(year)
+            i = bisect_left(days, position)
+            if count <= len(days) - i:
+                try:
+                    return ddate.fromordinal(days[i + count - 1] + 1)
+                except (ValueError, OverflowError):
+                    return ddate.max
+
+            count -= len(days) - i
+            year += 1
+
+        return ddate.max
@@ -4,6 +4,7 @@ from decimal import Decimal
 from offer.entries import BaseEntry
 from offer.entries import MultiplyEntry
 from offer.entries import ConnectEntry
+from offer.entries import EntryGraph
 from offer.quantitytime import QuantityTime
 
 
@@ -468,3 +469,91 @@ def test_connectentry_wage_add():
     #       2x 50 = 100 + 2x 75 = 150 == 250
     b.set_wage_add('25.00')
     assert c.get_price(liste, wage) == Decimal('250.00')
+
+
+def test_compact_entries():
+    """Keep the entries in slots and share the empty connections."""
+    a = BaseEntry(quantity=1)
+    b = ConnectEntry(quantity=1)
+    assert not hasattr(a, '__dict__')
+    assert not hasattr(a.get_quantity(), '__dict__')
+    assert a.get_connected() is b.get_connected()
+
+    # connecting replaces the shared set
+    b.connect_entry([a], a.get_id())
+    assert b.get_connected() == {a.get_id()}
+    assert a.get_connected() == set()
+
+    c = b.copy(keep_id=False)
+    assert c.get_connected() == b.get_connected()
+    assert c.get_id() != b.get_id()
+
+
+def test_quantitytime_parsing():
+    """Parse strings with the cache and keep the results independent."""
+    a = QuantityTime('1:30')
+    b = QuantityTime('1:30')
+    assert a.get() == Decimal('1.5')
+    assert str(a) == '1:30'
+
+    # changing one does not change the other or the cached result
+    a.set('0:15')
+    a.type('decimal')
+    assert str(b) == '1:30'
+    assert str(QuantityTime('1:30')) == '1:30'
+
+    # invalid strings keep the old value
+    assert b.set('no time') is False
+    assert b.set('no time') is False
+    assert str(b) == '1:30'
+
+    # decimals, ints and floats are kept like before
+    assert str(QuantityTime(Decimal('2.50'))) == '2.50'
+    assert str(QuantityTime(3)) == '3'
+    assert str(QuantityTime(0.1)) == '0.1'
+
+    # arithmetic results keep the type of the left operand
+    c = QuantityTime('0:30') + QuantityTime('1.25')
+    assert str(c) == '1:45'
+    assert str(QuantityTime('1.25') * 2) == '2.50'
+
+
+def test_connectentry_graph():
+    """Calculate connected ConnectEntries once and reject cycles."""
+    a = BaseEntry(quantity=1, price=100)
+    b = ConnectEntry(quantity=1, multiplicator='0.5')
+    c = ConnectEntry(quantity=1, multiplicator=2)
+    d = ConnectEntry(quantity=1, multiplicator=1)
+    liste = [a, b, c, d]
+
+    # d -> c -> b -> a
+    assert b.connect_entry(liste, a.get_id())
+    assert c.connect_entry(liste, b.get_id())
+    assert d.connect_entry(liste, c.get_id())
+    assert d.connect_entry(liste, a.get_id())
+
+    # connecting b to d or c would make a cycle
+    assert not b.connect_entry(liste, d.get_id())
+    assert not b.connect_entry(liste, c.get_id())
+    assert d.get_id() not in b.get_connected()
+
+    graph = EntryGraph(liste)
+    assert graph.depends_on(d, a.get_id())
+    assert not graph.depends_on(a, d.get_id())
+    assert d.get_price(liste, graph=graph) == Decimal('200.00')
+    assert d.get_price(liste) == Decimal('200.00')
+
+    # cycles from elsewhere (e.g. a file) count as zero
+    b._connected = set([a.get_id(), d.get_id()])
+    graph = EntryGraph(liste)
+    assert graph.in_cycle(b) and graph.in_cycle(d)
+    assert not graph.in_cycle(a)
+    assert d.get_price(liste) == Decimal('0.00')
+    assert graph.get_price_fixed(a, (0, 2)) == (10000, 2)
+
+    # disconnecting breaks the cycle again
+    b.disconnect_entry(liste, d.get_id())
+    assert d.get_id() not in b.get_connected()
+    graph = EntryGraph(liste)
+    assert not graph.in_cycle(b) and not graph.in_cycle(d)
+    assert d.get_price(liste) == Decimal('200.00')
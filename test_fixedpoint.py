@@ -0,0 +1,110 @@
+"""Testing the fixed-point numbers against the Decimal calculations."""
+
+from decimal import Decimal
+from offer import fixedpoint
+from offer.entries import BaseEntry
+from offer.entries import ConnectEntry
+from offer.entries import MultiplyEntry
+from offer.offerinvoice import Offer
+from offer.quantitytime import QuantityTime
+
+
+VALUES = [
+    Decimal('0'), Decimal('0.00'), Decimal('1'), Decimal('-2.5'), Decimal('0.005'),
+    Decimal('0.015'), Decimal('19.99'), Decimal('125.00'), Decimal('0.19'),
+    Decimal('1E+2'), Decimal('33.335'), Decimal(1) / Decimal(3),
+    Decimal(20) / Decimal(60), Decimal(7) / Decimal(60), Decimal('-1') / Decimal(7),
+    Decimal('123456789.123456789')
+]
+
+
+def same(a, b):
+    """Check if both Decimals have the same value and the same digits."""
+    # fixed-point numbers have no negative zero
+    return a == b and (a == 0 or str(a) == str(b))
+
+
+def test_fixedpoint_conversion():
+    """Convert Decimals and back without changing them."""
+    for value in VALUES:
+        assert same(fixedpoint.to_decimal(fixedpoint.from_decimal(value)), value)
+
+    assert fixedpoint.from_decimal(Decimal('125.50')) == (12550, 2)
+    assert fixedpoint.from_decimal(3) == (3, 0)
+
+
+def test_fixedpoint_like_decimal():
+    """Calculate exactly like the default Decimal context."""
+    for a in VALUES:
+        fa = fixedpoint.from_decimal(a)
+        for b in VALUES:
+            fb = fixedpoint.from_decimal(b)
+
+            assert same(fixedpoint.to_decimal(fixedpoint.multiply(fa, fb)), a * b)
+            assert same(fixedpoint.to_decimal(fixedpoint.add(fa, fb)), a + b)
+            assert same(
+                fixedpoint.to_decimal(
+                    fixedpoint.round_places(fixedpoint.multiply(fa, fb), 2)
+                ),
+                round(a * b, 2)
+            )
+            assert same(
+                fixedpoint.to_decimal(fixedpoint.round_places(fixedpoint.add(fa, fb), 0)),
+                round(a + b, 0)
+            )
+
+            if b != 0:
+                assert same(
+                    fixedpoint.to_decimal(fixedpoint.divide_round(fa, fb, 2)),
+                    round(a / b, 2)
+                )
+
+
+def test_fixedpoint_half_even():
+    """Round ties to the even digit."""
+    assert fixedpoint.round_places((125, 3), 2) == (12, 2)
+    assert fixedpoint.round_places((135, 3), 2) == (14, 2)
+    assert fixedpoint.round_places((-125, 3), 2) == (-12, 2)
+    assert fixedpoint.round_places((1251, 4), 2) == (13, 2)
+    assert fixedpoint.round_places((5, 0), 2) == (500, 2)
+
+
+def test_entry_prices_like_decimal():
+    """Get the prices and totals, the Decimal calculations gave before."""
+    wage = Decimal('62.50')
+    base = BaseEntry(quantity='1:20', quantity_b='3', time='0:45', price='19.99', tax=19)
+    multi = MultiplyEntry(quantity='0:07', hour_rate='1.5', wage_add='2.5', tax=7)
+    connect = ConnectEntry(quantity='2', is_time=False, multiplicator='0.15', tax='7.5')
+
+    offer = Offer(wage=wage)
+    offer.set_entry_list([base, multi, connect])
+    connect.connect_entry(entry_list=offer.get_entry_list(), entry_id=base.get_id())
+    connect.connect_entry(entry_list=offer.get_entry_list(), entry_id=multi.get_id())
+
+    q = QuantityTime('1:20').get()
+    base_price = round(Decimal('19.99') * q * Decimal('3'), 2)
+    assert same(base.get_price(), base_price)
+    assert same(base.get_price_tax(), round(Decimal('0.19') * base_price, 2))
+    assert same(base.get_time().get(), QuantityTime('0:45').get() * q * Decimal('3'))
+
+    multi_time = QuantityTime('0:07').get() * Decimal('1') * Decimal('1.5')
+    multi_price = round(multi_time * (wage + Decimal('2.5')), 2)
+    assert same(multi.get_price(wage=wage), multi_price)
+
+    connect_price = round(
+        (Decimal('0.00') + Decimal('0.15') * base_price + Decimal('0.15') * multi_price) *
+        Decimal('2') * Decimal('1'),
+        2
+    )
+    assert same(
+        connect.get_price(entry_list=offer.get_entry_list(), wage=wage),
+        connect_price
+    )
+
+    total = Decimal(0) + base_price + multi_price + connect_price
+    assert same(offer.get_price_total(), total)
+    assert offer.get_price_total(round_price=True) == round(total)
+    assert same(
+        offer.get_time_total().get(),
+        Decimal(0) + base.get_time().get() + multi.get_time().get() + Decimal(0)
+    )
@@ -0,0 +1,736 @@
+"""Testing app for the global list and its storage backends."""
+
+from clients.client import Client
+from clients.list import List
+from clients.project import Project
+from clients.storage import FileStorage
+from clients.storage import SQLiteStorage
+from clients.storage import migrate
+from datetime import date
+from decimal import Decimal
+from general.archive import Archive
+from general.archive import archive_list
+from general import journal
+from general.journal import atomic_write
+from general import snapshot
+from general.journal import Journal
+from general.lock import DataLock
+from general.reshard import resharder
+from general.snapshot import wait_for_snapshots
+from general.watcher import PollingWatcher
+from offer.entries import BaseEntry
+from offer.offerinvoice import Invoice
+from offer.offerinvoice import Offer
+import json
+import os
+
+
+def example_project():
+    """Return a project with an offer and an invoice."""
+    project = Project(client_id='ABC01', title='Project A', wage=50)
+
+    offer = Offer(title='Offer A', date=date(2017, 1, 1))
+    offer.append(BaseEntry(title='Entry A', quantity=2, time=1.5, price=100))
+    project.append_offer(offer)
+
+    invoice = Invoice(title='Invoice A', id='1', date=date(2017, 1, 15))
+    invoice.append(BaseEntry(title='Entry B', quantity=1, time=3, price=150))
+    project.append_invoice(invoice)
+
+    return project
+
+
+def check_storage(storage):
+    """Add, reload, rename and delete data with the given storage."""
+    data_path = storage.data_path
+
+    a = List(data_path=data_path, storage=storage)
+    assert a.add_client(client=Client(client_id='ABC01'), activate=True)
+    assert a.add_project(project=example_project())
+
+    # everything should come back from the storage
+    b = List(data_path=data_path, storage=storage)
+    assert [c.client_id for c in b.client_list] == ['ABC01']
+    assert b.project_list[0].title == 'Project A'
+    invoice = b.project_list[0].get_invoice_list()[0]
+    assert invoice.get_date() == date(2017, 1, 15)
+    assert invoice.get_price_total() == Decimal('150.00')
+
+    # renaming the client renames its projects as well
+    assert b.set_client_id(client=b.client_list[0], client_id='XYZ01')
+    c = List(data_path=data_path, storage=storage)
+    assert [cl.client_id for cl in c.client_list] == ['XYZ01']
+    assert [p.project_id() for p in c.project_list] == ['XYZ01_Project A']
+
+    # removing
+    assert c.remove_project(project=c.project_list[0])
+    d = List(data_path=data_path, storage=storage)
+    assert d.project_list == []
+
+
+def test_file_storage(tmpdir):
+    """Use the classic one file per client / project storage."""
+    check_storage(FileStorage(data_path=str(tmpdir)))
+    assert tmpdir.join('clients', 'XYZ01.flclient').check()
+
+
+def test_sqlite_storage(tmpdir):
+    """Use the single file database storage."""
+    check_storage(SQLiteStorage(data_path=str(tmpdir)))
+    assert tmpdir.join('freelance.sqlite').check()
+
+
+def test_sharded_file_storage(tmpdir):
+    """Keep the files in shard directories."""
+    check_storage(FileStorage(data_path=str(tmpdir), shard=2))
+    assert tmpdir.join('clients', '@XY', 'XYZ01.flclient').check()
+    assert not tmpdir.join('clients', 'XYZ01.flclient').check()
+
+
+def test_reshard(tmpdir):
+    """Move the files of a flat data_path into shard directories and back."""
+    flat = FileStorage(data_path=str(tmpdir))
+    for client_id in ['ABC01', 'ABD01', 'XYZ01']:
+        flat.save_client(folder='/clients', client=Client(client_id=client_id))
+    flat.save_project(folder='/projects/inactive', project=example_project())
+
+    # the sharded storage finds the flat files as well
+    sharded = FileStorage(data_path=str(tmpdir), shard=2)
+    assert len(sharded.load_clients(folder='/clients')) == 3
+
+    # and moves them into its own layout on saving
+    watcher = PollingWatcher(paths=[str(tmpdir.join('clients'))])
+    sharded.save_client(folder='/clients', client=Client(client_id='ABC01', company='X'))
+    assert not tmpdir.join('clients', 'ABC01.flclient').check()
+    assert [c.company for c in sharded.load_clients(folder='/clients')] == ['X', '', '']
+    assert sorted(kind for kind, filename in watcher.poll()) == ['added', 'removed']
+
+    assert resharder(data_path=str(tmpdir), shard=2) == 3
+    assert tmpdir.join('clients', '@AB', 'ABD01.flclient').check()
+    assert tmpdir.join('projects', 'inactive', '@AB', 'ABC01_Project_A.flproject').check()
+
+    # back into the flat layout, without empty shard directories
+    assert resharder(data_path=str(tmpdir), shard=0) == 4
+    assert len(flat.load_clients(folder='/clients')) == 3
+    assert not tmpdir.join('clients', '@AB').check()
+    assert not tmpdir.join('projects', 'inactive', '@AB').check()
+
+
+def test_migrate_storage(tmpdir):
+    """Move the data from the file storage into the database and back."""
+    files = FileStorage(data_path=str(tmpdir))
+    files.save_client(folder='/clients', client=Client(client_id='ABC01'))
+    files.save_project(folder='/projects', project=example_project())
+
+    database = SQLiteStorage(data_path=str(tmpdir))
+    count = migrate(
+        source=files,
+        target=database,
+        folders=[('/clients', '/projects')]
+    )
+    assert count == 2
+
+    # both storages should hold exactly the same project now
+    assert (
+        database.load_projects(folder='/projects')[0].to_json() ==
+        files.load_projects(folder='/projects')[0].to_json()
+    )
+
+
+def check_lazy(storage):
+    """Load projects from the index and hydrate them on demand."""
+    data_path = storage.data_path
+
+    a = List(data_path=data_path, storage=storage)
+    assert a.add_client(client=Client(client_id='ABC01'), activate=True)
+    assert a.add_project(project=example_project())
+
+    # the first lazy load builds the index, the second one uses it
+    List(data_path=data_path, storage=storage, lazy=True)
+    b = List(data_path=data_path, storage=storage, lazy=True)
+    project = b.project_list[0]
+    assert not project.is_hydrated()
+    assert project.get_offer_count() == 1
+    assert project.get_invoice_ids() == ['1']
+    assert project.has_unpaid_invoices()
+
+    # accessing the invoices loads the full project
+    assert b.get_unpaid_invoices()[0].get_price_total() == Decimal('150.00')
+    assert project.is_hydrated()
+    assert not project.is_changed()
+
+    # renaming a lazy project keeps its offers and invoices
+    c = List(data_path=data_path, storage=storage, lazy=True)
+    new_project = c.project_list[0].copy()
+    new_project.title = 'Project B'
+    assert c.update_project(old_project=c.project_list[0], new_project=new_project)
+    d = List(data_path=data_path, storage=storage)
+    assert d.project_list[0].title == 'Project B'
+    assert len(d.project_list[0].get_offer_list()) == 1
+
+
+def test_lazy_file_storage(tmpdir):
+    """Use the index of the file storage."""
+    check_lazy(FileStorage(data_path=str(tmpdir)))
+    assert tmpdir.join('projects', '.flindex').check()
+
+    # indexes of other versions get rebuilt
+    tmpdir.join('projects', '.flindex').write('{"Project_A.flproject": {}}')
+    projects = FileStorage(data_path=str(tmpdir)).load_projects(
+        folder='/projects',
+        lazy=True
+    )
+    assert [p.title for p in projects] == ['Project B']
+    assert '"version": 2' in tmpdir.join('projects', '.flindex').read()
+
+
+def test_lazy_load_failure(tmpdir):
+    """Report lazy projects, which cannot be loaded anymore, with their file."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    List(data_path=str(tmpdir), lazy=True)
+
+    # the file gets removed after the index was read
+    b = List(data_path=str(tmpdir), lazy=True)
+    filename = tmpdir.join('projects', 'ABC01_Project_A.flproject')
+    filename.remove()
+    try:
+        b.project_list[0].hydrate()
+        assert False
+    except IOError as err:
+        assert str(filename) in str(err)
+
+    # the unpaid view skips it and names it once
+    assert b.get_unpaid_invoices() == []
+    assert b.get_unpaid_invoices() == []
+    assert len(b.load_failures) == 1
+    assert str(filename) in b.load_failures[0]
+
+
+def test_lazy_sqlite_storage(tmpdir):
+    """Use the summary column of the database storage."""
+    check_lazy(SQLiteStorage(data_path=str(tmpdir)))
+
+
+def test_parallel_loading(tmpdir):
+    """Load many files with a pool and skip the broken ones."""
+    files = FileStorage(data_path=str(tmpdir), workers=4)
+    for i in range(20):
+        files.save_client(folder='/clients', client=Client(client_id='C{:02}'.format(i)))
+    tmpdir.join('clients', 'C05.flclient').write('{broken')
+
+    clients = files.load_clients(folder='/clients')
+    assert len(clients) == 19
+    assert [c.client_id for c in clients] == sorted(c.client_id for c in clients)
+    assert files.failed_files == [str(tmpdir.join('clients', 'C05.flclient'))]
+
+
+def test_incremental_save(tmpdir):
+    """Only write the clients and projects, which changed."""
+    storage = FileStorage(data_path=str(tmpdir))
+    a = List(data_path=str(tmpdir), storage=storage)
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    for title in ['Project A', 'Project B', 'Project C']:
+        project = example_project()
+        project.title = title
+        a.add_project(project=project)
+
+    b = List(data_path=str(tmpdir), storage=storage)
+    assert not any(p.is_changed() for p in b.project_list)
+
+    # count the saved projects
+    saved = []
+    save_project = storage.save_project
+    storage.save_project = lambda folder, project: (
+        saved.append(project.title) or save_project(folder=folder, project=project)
+    )
+
+    b.save_all()
+    assert saved == []
+
+    # changing an entry deep inside a project marks only this project,
+    # only the changed values get remembered for merging
+    entry = b.project_list[1].get_invoice_list()[0].get_entry_list()[0]
+    assert entry.get_changed_names() == []
+    entry.set_quantity(5)
+    assert entry.get_changed_names() == ['_quantity']
+    assert b.project_list[1].get_changed_names() == ['_invoice_list']
+    assert [p.is_changed() for p in b.project_list] == [False, True, False]
+    b.save_all()
+    assert saved == ['Project B']
+
+    # appending an offer is a change as well
+    b.project_list[2].append_offer(Offer(title='Offer B'))
+    b.save_all()
+    assert saved == ['Project B', 'Project C']
+    assert not b.project_list[2].is_changed()
+
+    # so are replacing and moving them
+    offer = b.project_list[2].get_offer_list()[0].copy()
+    offer.title = 'Offer C'
+    b.project_list[2].replace_offer(index=0, offer=offer)
+    assert b.project_list[2].get_changed_names() == ['_offer_list']
+    b.save_all()
+    assert not b.project_list[2].is_changed()
+    assert b.project_list[2].move_offer(index=0, direction=-1) == 1
+    assert [o.title for o in b.project_list[2].get_offer_list()] == ['Offer B', 'Offer C']
+    assert b.project_list[2].is_changed()
+
+
+def test_journal_recovery(tmpdir):
+    """Finish committed and throw away uncommitted transactions."""
+    journal = Journal(path=str(tmpdir.join('.fljournal')))
+    target = tmpdir.join('a.txt')
+    target.write('old')
+
+    # staged, but never committed
+    journal.write(filename=str(target), content='new')
+    Journal(path=journal.path)
+    assert target.read() == 'old'
+    assert tmpdir.join('.fljournal').listdir() == []
+
+    # committed, but interrupted before the renames
+    journal = Journal(path=journal.path)
+    journal.write(filename=str(target), content='new')
+    atomic_write(filename=journal.commit_file, content=json.dumps(journal.staged))
+    Journal(path=journal.path)
+    assert target.read() == 'new'
+    assert tmpdir.join('.fljournal').listdir() == []
+
+    # removals are part of the transaction as well
+    journal = Journal(path=journal.path)
+    journal.remove(filename=str(target))
+    atomic_write(filename=journal.commit_file, content=json.dumps(journal.staged))
+    Journal(path=journal.path)
+    assert not target.check()
+
+
+def test_atomic_write_mode(tmpdir):
+    """Keep the permissions of replaced files and give new ones the usual."""
+    new = tmpdir.join('new.txt')
+    atomic_write(filename=str(new), content='new')
+    assert os.stat(str(new)).st_mode & 0o777 == 0o666 & ~journal.UMASK
+
+    shared = tmpdir.join('shared.txt')
+    shared.write('old')
+    os.chmod(str(shared), 0o664)
+    atomic_write(filename=str(shared), content='new')
+    assert os.stat(str(shared)).st_mode & 0o777 == 0o664
+
+    # the journal renames its staged files into place the same way
+    staged = Journal(path=str(tmpdir.join('.fljournal')))
+    staged.write(filename=str(shared), content='newer')
+    staged.commit()
+    assert os.stat(str(shared)).st_mode & 0o777 == 0o664
+
+
+def test_save_all_transaction(tmpdir):
+    """Write all changes of save_all at once, without backup copies."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    a.client_list[0].company = 'Company'
+    a.project_list[0].set_wage(60)
+    assert a.save_all()
+
+    b = List(data_path=str(tmpdir))
+    assert b.client_list[0].company == 'Company'
+    assert b.project_list[0].get_wage() == Decimal('60')
+    assert not tmpdir.join('clients', 'ABC01.flclient_bu').check()
+
+
+def index_of(a):
+    """Return the ID dicts of the list for comparing."""
+    return (
+        dict(a.client_index), dict(a.client_positions), dict(a.project_index),
+        dict(a.project_positions),
+        {k: [id(p) for p in v] for k, v in a.client_projects.items()}
+    )
+
+
+def test_list_index_incremental(tmpdir):
+    """Update the ID dicts like rebuilding them would."""
+    a = List(data_path=str(tmpdir))
+    for client_id, titles in [('ABC01', 'ABC'), ('DEF01', 'DEF'), ('GHI01', 'GHI')]:
+        a.add_client(client=Client(client_id=client_id), activate=True)
+        for title in titles:
+            a.add_project(project=Project(client_id=client_id, title=title))
+
+    def check():
+        index = index_of(a)
+        a.rebuild_index()
+        assert index_of(a) == index
+
+    check()
+    assert a.remove_project(project=a.project_list[1])
+    check()
+    new_project = a.project_list[4].copy()
+    new_project.title = 'Z'
+    assert a.update_project(old_project=a.project_list[4], new_project=new_project)
+    check()
+    assert a.assign_project_to_client(project=a.project_list[0], client_id='GHI01')
+    check()
+    assert a.set_client_id(client=a.client_list[1], client_id='XYZ01')
+    check()
+    assert a.remove_client(client=a.client_list[0])
+    check()
+    assert [p.title for p in a.get_client_projects(a.client_list[1])] == ['A', 'G', 'H', 'I']
+
+
+def test_list_index(tmpdir):
+    """Keep the ID dicts consistent with the lists."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_client(client=Client(client_id='DEF01'), activate=True)
+    a.add_project(project=example_project())
+    assert a.get_client_index(Client(client_id='DEF01')) == 1
+    assert a.get_client_by_id('ABC01').client_id == 'ABC01'
+    assert [p.title for p in a.get_client_projects(a.client_list[0])] == ['Project A']
+
+    # the project moves to the other client
+    assert a.assign_project_to_client(project=a.project_list[0], client_id='DEF01')
+    assert a.get_client_projects(a.client_list[0]) == []
+    assert a.get_project_index(Project(client_id='DEF01', title='Project A')) == 0
+
+    # renaming and removing
+    assert a.set_client_id(client=a.client_list[1], client_id='XYZ01')
+    assert not a.client_exists(Client(client_id='DEF01'))
+    assert a.project_exists(Project(client_id='XYZ01', title='Project A'))
+    assert a.remove_client(client=a.client_list[0])
+    assert a.get_client_index(Client(client_id='XYZ01')) == 0
+
+    # changing the list from outside needs a rebuild
+    a.client_list.append(Client(client_id='GHI01'))
+    a.rebuild_index()
+    assert a.client_exists(Client(client_id='GHI01'))
+
+
+def test_owner_index(tmpdir):
+    """Find the project and client of offers and invoices."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    project = a.project_list[0]
+    invoice = project.get_invoice_list()[0]
+
+    assert a.get_owner(item=invoice) == (project, a.client_list[0])
+    assert invoice.get_project(global_list=a) is project
+
+    # appended and popped invoices are noticed
+    new_invoice = Invoice(title='Invoice B', id='2')
+    project.append_invoice(new_invoice)
+    assert a.get_owner(item=new_invoice)[0] is project
+    project.pop_invoice(0)
+    assert a.get_owner(item=invoice) == (None, None)
+
+    # so are offers, replaced ones and removed projects
+    offer = Offer(title='Offer B')
+    project.append_offer(offer)
+    assert a.get_owner(item=offer) == (project, a.client_list[0])
+    project.pop_offer(1)
+    assert a.get_owner(item=offer) == (None, None)
+    project.replace_invoice(index=0, invoice=invoice)
+    assert a.get_owner(item=new_invoice) == (None, None)
+    assert a.get_owner(item=invoice)[0] is project
+    a.remove_project(project=project)
+    assert a.get_owner(item=invoice) == (None, None)
+
+
+def test_shared_copy(tmpdir):
+    """Copy the lists only and share the clients and projects."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+
+    b = a.copy(shared=True)
+    assert b.project_list[0] is a.project_list[0]
+    b.project_list.pop(0)
+    assert len(a.project_list) == 1
+
+    c = a.copy()
+    assert c.project_list[0] is not a.project_list[0]
+    assert c.project_list[0].to_json() == a.project_list[0].to_json()
+
+
+def test_unpaid_view(tmpdir):
+    """Keep the unpaid invoices sorted by due date, while projects change."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    assert [i.id for i in a.get_unpaid_invoices()] == ['1']
+
+    # a new project with an earlier invoice
+    project = Project(client_id='ABC01', title='Project B')
+    project.append_invoice(Invoice(id='2', date=date(2016, 12, 1)))
+    a.add_project(project=project)
+    assert [i.id for i in a.get_unpaid_invoices()] == ['2', '1']
+
+    # paying and saving
+    a.project_list[0].get_invoice_list()[0].set_paid_date(date(2017, 2, 1))
+    a.save_project_to_file(project=a.project_list[0])
+    assert [i.id for i in a.get_unpaid_invoices()] == ['2']
+
+    # replacing the project with a changed copy
+    new_project = a.project_list[1].copy()
+    new_project.get_invoice_list()[0].set_date(date(2018, 1, 1))
+    new_project.append_invoice(Invoice(id='3', date=date(2017, 6, 1)))
+    assert a.update_project(old_project=a.project_list[1], new_project=new_project)
+    assert [i.id for i in a.get_unpaid_invoices()] == ['3', '2']
+
+    # changing the invoices without saving
+    unpaid = a.project_list[1].get_invoice_list()[0]
+    paid = a.project_list[0].get_invoice_list()[0]
+    unpaid.set_due_days(60)
+    paid.set_paid_date(None)
+    a.project_list[0].append_invoice(Invoice(id='4', date=date(2016, 1, 1)))
+    assert [i.id for i in a.get_unpaid_invoices()] == ['4', '1', '3', '2']
+    unpaid.set_date(date(2015, 1, 1))
+    a.project_list[0].pop_invoice(1)
+    assert [i.id for i in a.get_unpaid_invoices()] == ['2', '1', '3']
+
+    assert a.remove_project(project=a.project_list[1])
+    assert [i.id for i in a.get_unpaid_invoices()] == ['1']
+
+
+def test_file_changes(tmpdir):
+    """Patch the list with files changed by another program."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    watcher = PollingWatcher(paths=a.get_watch_paths())
+
+    # own saves are no changes
+    a.save_project_to_file(project=a.project_list[0])
+    assert not a.apply_file_changes(changes=watcher.poll())
+
+    # another program adds a client and changes the project
+    b = List(data_path=str(tmpdir))
+    b.add_client(client=Client(client_id='DEF01'), activate=True)
+    b.project_list[0].set_wage(99)
+    b.save_project_to_file(project=b.project_list[0])
+    assert a.apply_file_changes(changes=watcher.poll())
+    assert a.client_exists(Client(client_id='DEF01'))
+    assert a.project_list[0].get_wage() == Decimal('99')
+
+    # and removes the client again
+    b.remove_client(client=b.client_list[1])
+    assert a.apply_file_changes(changes=watcher.poll())
+    assert not a.client_exists(Client(client_id='DEF01'))
+
+    # unsaved edits of other values get merged
+    a.project_list[0].set_minimum_days(9)
+    b.project_list[0].set_wage(50)
+    b.save_project_to_file(project=b.project_list[0])
+    assert a.apply_file_changes(changes=watcher.poll())
+    assert a.project_list[0].get_minimum_days() == 9
+    assert a.project_list[0].get_wage() == Decimal('50')
+    assert a.project_list[0].is_changed()
+    assert a.file_conflicts == []
+
+    # unsaved edits of the same value are kept and reported
+    a.project_list[0].set_wage(60)
+    b.project_list[0].set_wage(70)
+    b.save_project_to_file(project=b.project_list[0])
+    assert not a.apply_file_changes(changes=watcher.poll())
+    assert a.project_list[0].get_wage() == Decimal('60')
+    assert len(a.file_conflicts) == 1
+
+
+def test_snapshot(tmpdir, monkeypatch):
+    """Decode only the files, which changed since the snapshot."""
+    files = FileStorage(data_path=str(tmpdir), snapshot=True)
+    for client_id in ['ABC01', 'DEF01', 'GHI01']:
+        files.save_client(folder='/clients', client=Client(client_id=client_id))
+
+    assert len(files.load_clients(folder='/clients')) == 3
+    wait_for_snapshots()
+    assert tmpdir.join('clients', '.flsnapshot').check()
+
+    # count the decoded files
+    decoded = []
+    load_files = snapshot.load_files
+
+    def counting_load_files(filenames=None, **kwargs):
+        decoded.extend(filenames)
+        return load_files(filenames=filenames, **kwargs)
+
+    monkeypatch.setattr(snapshot, 'load_files', counting_load_files)
+
+    clients = files.load_clients(folder='/clients')
+    assert [c.client_id for c in clients] == ['ABC01', 'DEF01', 'GHI01']
+    assert decoded == []
+
+    # change one, remove one
+    files.save_client(folder='/clients', client=Client(client_id='ABC01', company='X'))
+    files.delete_client(folder='/clients', client_id='GHI01')
+    clients = files.load_clients(folder='/clients')
+    assert [c.company for c in clients] == ['X', '']
+    assert decoded == [str(tmpdir.join('clients', 'ABC01.flclient'))]
+    wait_for_snapshots()
+
+    # a new field of a pickled class makes the old snapshot useless
+    del decoded[:]
+    monkeypatch.setattr(Client, 'FIELDS', Client.FIELDS + (('new', 'new', None),))
+    clients = files.load_clients(folder='/clients')
+    assert len(decoded) == 2
+    wait_for_snapshots()
+
+
+def test_archive(tmpdir):
+    """Move old paid invoices and offers into the archive segments."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    project = example_project()
+    project.get_invoice_list()[0].set_paid_date(date(2017, 2, 1))
+    project.append_invoice(Invoice(title='Unpaid', id='2', date=date(2017, 3, 1)))
+    project.append_offer(Offer(title='Offer B', date=date(2018, 1, 1)))
+    a.add_project(project=project)
+
+    archive = Archive(data_path=str(tmpdir))
+    assert archive_list(global_list=a, archive=archive, cutoff=date(2018, 1, 1)) == 2
+    assert archive_list(global_list=a, archive=archive, cutoff=date(2018, 1, 1)) == 0
+    assert tmpdir.join('archive', '2017.flarchive').check()
+
+    # the project keeps the rest and the counters
+    b = List(data_path=str(tmpdir), lazy=True)
+    project = b.project_list[0]
+    assert project.get_offer_count() == 2
+    assert project.get_invoice_ids() == ['1', '2']
+    assert [o.title for o in project.get_offer_list()] == ['Offer B']
+    assert [i.title for i in project.get_invoice_list()] == ['Unpaid']
+
+    # archived items come with their project values
+    invoices = archive.get_invoices(year=2017)
+    assert len(invoices) == 1
+    owner, invoice = invoices[0]
+    assert owner.title == 'Project A'
+    assert invoice.get_price_total(project=owner) == Decimal('150.00')
+    assert [item.title for owner, item in archive.search('offer a')] == ['Offer A']
+
+    # items appended twice by an interrupted run show up once
+    archive.append(project=owner, items=[invoice])
+    assert len(archive.get_invoices(year=2017)) == 1
+
+
+def test_concurrent_saves(tmpdir):
+    """Merge or reject saves of objects, which another program changed."""
+    a = List(data_path=str(tmpdir))
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    b = List(data_path=str(tmpdir))
+
+    # different values get merged
+    b.client_list[0].city = 'Berlin'
+    assert b.save_client_to_file(client=b.client_list[0])
+    a.client_list[0].company = 'Company'
+    assert a.save_client_to_file(client=a.client_list[0])
+    client = List(data_path=str(tmpdir)).client_list[0]
+    assert (client.company, client.city, client.get_version()) == ('Company', 'Berlin', 3)
+
+    b.project_list[0].append_offer(Offer(title='Offer B'))
+    assert b.save_project_to_file(project=b.project_list[0])
+    a.project_list[0].set_wage(99)
+    assert a.save_project_to_file(project=a.project_list[0])
+    project = List(data_path=str(tmpdir)).project_list[0]
+    assert project.get_wage() == Decimal('99')
+    assert [o.title for o in project.get_offer_list()] == ['Offer A', 'Offer B']
+
+    # the same value gets rejected, also in a transaction
+    b.client_list[0].company = 'Other'
+    assert not b.save_client_to_file(client=b.client_list[0])
+    assert not b.save_all()
+    assert List(data_path=str(tmpdir)).client_list[0].company == 'Company'
+
+    # writers count the generation up, so that readers can check it
+    lock = DataLock(path=str(tmpdir))
+    generation = lock.get_generation()
+    a.save_client_to_file(client=a.client_list[0])
+    assert lock.get_generation() == generation + 2
+
+    # readers fall back to the lock, if a writer died in the middle
+    lock.set_generation(generation + 1)
+    assert lock.read(load=lambda: 'loaded', retries=2, wait=0) == 'loaded'
+
+
+def check_client_rename(storage, monkeypatch):
+    """Rename a client with its projects at once or not at all."""
+    a = List(data_path=storage.data_path, storage=storage)
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    a.add_project(project=example_project())
+    second = example_project()
+    second.title = 'Project B'
+    a.add_project(project=second)
+
+    # a failing write in the middle leaves everything like it was
+    save_project = storage.save_project
+
+    def failing_save_project(folder=None, project=None):
+        if project.title == 'Project B':
+            raise IOError
+        return save_project(folder=folder, project=project)
+
+    monkeypatch.setattr(storage, 'save_project', failing_save_project)
+    assert not a.set_client_id(client=a.client_list[0], client_id='XYZ01')
+    assert a.client_list[0].client_id == 'ABC01'
+    b = List(data_path=storage.data_path, storage=storage)
+    assert [c.client_id for c in b.client_list] == ['ABC01']
+    assert sorted(p.project_id() for p in b.project_list) == [
+        'ABC01_Project A', 'ABC01_Project B'
+    ]
+
+    monkeypatch.setattr(storage, 'save_project', save_project)
+    assert a.set_client_id(client=a.client_list[0], client_id='XYZ01')
+    b = List(data_path=storage.data_path, storage=storage)
+    assert [c.client_id for c in b.client_list] == ['XYZ01']
+    assert sorted(p.project_id() for p in b.project_list) == [
+        'XYZ01_Project A', 'XYZ01_Project B'
+    ]
+    assert a.get_client_projects(client=a.client_list[0]) == a.project_list
+
+
+def test_client_rename_files(tmpdir, monkeypatch):
+    """Rename the client files in one journal transaction."""
+    check_client_rename(FileStorage(data_path=str(tmpdir)), monkeypatch)
+    assert not tmpdir.join('projects', 'ABC01_Project_A.flproject').check()
+
+
+def test_rename_rollback(tmpdir):
+    """Rename files in a transaction only, when it gets committed."""
+    storage = FileStorage(data_path=str(tmpdir))
+    a = List(data_path=str(tmpdir), storage=storage)
+    a.add_client(client=Client(client_id='ABC01'), activate=True)
+    projects = tmpdir.join('projects')
+    clients = tmpdir.join('clients')
+
+    # a rollback after the rename leaves the old file
+    storage.begin()
+    storage.rename_client(
+        folder=a.client_dir, old_client_id='ABC01', new_client_id='XYZ01'
+    )
+    assert clients.join('ABC01.flclient').check()
+    assert not clients.join('XYZ01.flclient').check()
+    storage.rollback()
+    assert clients.join('ABC01.flclient').check()
+    assert not clients.join('XYZ01.flclient').check()
+    assert os.listdir(str(tmpdir.join('.fljournal'))) == []
+
+    # a commit renames it
+    a.add_project(project=example_project())
+    storage.begin()
+    storage.rename_project(
+        folder=a.project_dir,
+        old_project_id='ABC01_Project A',
+        new_project_id='ABC01_Project C'
+    )
+    storage.commit()
+    assert not projects.join('ABC01_Project_A.flproject').check()
+    b = List(data_path=str(tmpdir), storage=storage)
+    assert [p.title for p in b.project_list] == ['Project A']
+    assert projects.join('ABC01_Project_C.flproject').check()
+
+
+def test_client_rename_sqlite(tmpdir, monkeypatch):
+    """Rename the client rows in one database transaction."""
+    check_client_rename(SQLiteStorage(data_path=str(tmpdir)), monkeypatch)
+
@@ -150,6 +150,42 @@ def test_price_total():
     assert off.get_price_tax_total(wage=wage) == Decimal('21.6')
 
 
+def test_cached_totals():
+    """Calculate the totals again only after changes."""
+    off = Offer(wage=50)
+    a = MultiplyEntry(quantity=1, hour_rate=1)
+    off.append(a)
+
+    assert off.get_price_total() == Decimal('50.00')
+    assert off.get_time_total() == QuantityTime('1:00')
+    assert off.get_graph() is off.get_graph()
+
+    # entry setters, the offer setters and the list are noticed
+    a.set_quantity(2)
+    assert off.get_price_total() == Decimal('100.00')
+    assert off.get_time_total() == QuantityTime('2:00')
+
+    off.set_wage(25)
+    assert off.get_price_total() == Decimal('50.00')
+
+    off.replace(index=0, entry=BaseEntry(quantity=1, price=10))
+    assert off.get_price_total() == Decimal('10.00')
+
+    # other entries and copies do not touch the cache
+    totals = off.get_totals()
+    MultiplyEntry(quantity=1, hour_rate=1).set_quantity(3)
+    off.copy().get_entry_list()[0].set_price(20)
+    assert off.get_totals() is totals
+
+    off.pop(0)
+    assert off.get_price_total() == Decimal('0')
+
+    # the cache is no change of the offer
+    off.mark_saved()
+    off.get_price_total(round_price=True)
+    assert not off.is_changed()
+
+
 def test_offer_wage_zero():
     """
     Normally you can get project as argument to get its wage, if own is 0.
@@ -164,3 +200,149 @@ def test_offer_wage_zero():
     # now test it with a project linked to it
     proj = Project(wage=10)
     assert offer_wage_test.get_wage(project=proj) == Decimal(10)
+
+
+def test_offer_json_compatibility():
+    """Load old or broken json and write it like before."""
+    js = {
+        'type': 'Invoice',
+        'title': 'Old invoice',
+        'date': '2017-1-5',
+        'paid_date': 'not a date',
+        'wage': 50.0,
+        'entry_list': [
+            {'type': 'BaseEntry', 'quantity': '2', 'time': '1:30', 'price': 100.0},
+            {'type': 'UnknownEntry', 'title': 'Skipped'},
+            {'title': 'Without type'},
+            {'type': 'ConnectEntry', 'connected': ['a', 'b']}
+        ]
+    }
+    offer = Offer().from_json(js=js)
+
+    assert offer.title == 'Old invoice'
+    assert offer.get_date() == date(2017, 1, 5)
+    assert offer.get_paid_date() is None
+    assert offer.get_wage() == Decimal('50.00')
+    assert offer.get_due_days() == 14
+    assert [type(e) for e in offer.get_entry_list()] == [BaseEntry, ConnectEntry]
+    assert offer.get_entry_list()[0].get_time() == QuantityTime('3:00')
+    assert offer.get_entry_list()[1].get_connected() == set(['a', 'b'])
+
+    # the written json has all keys and can be read again
+    out = offer.to_dict()
+    assert out['type'] == 'Offer'
+    assert out['date'] == '2017-01-05'
+    assert out['paid_date'] is None
+    assert out['entry_list'][0]['price'] == 100.0
+    assert out['entry_list'][1]['connected'] == ['a', 'b']
+    assert Offer().from_json(js=offer.to_json()).to_dict() == out
+
+    # broken json gives a default object
+    assert Offer().from_json(js='{broken').title == ''
+
+
+def test_evaluate_entries():
+    """Get the values of all entries at once, like their getters."""
+    a = BaseEntry(quantity=2, price='10.50', tax=19)
+    b = MultiplyEntry(quantity=3, hour_rate='0:20', tax=7)
+    c = ConnectEntry(quantity=1, multiplicator='0.1', tax=19)
+    off = Offer(wage=60, entry_list=[a, b, c])
+    c.connect_entry(off.get_entry_list(), a.get_id())
+    c.connect_entry(off.get_entry_list(), b.get_id())
+
+    for round_price in [False, True]:
+        rows = off.evaluate_entries(round_price=round_price)
+        assert [row['entry'] for row in rows] == [a, b, c]
+
+        for row in rows:
+            e = row['entry']
+            values = {
+                'entry_list': off.get_entry_list(),
+                'wage': off.get_wage(),
+                'round_price': round_price
+            }
+            assert row['time'] == e.get_time(entry_list=off.get_entry_list())
+            assert row['price'] == e.get_price(**values)
+            assert row['unit_price'] == e.get_unit_price(**values)
+            assert row['tax'] == e.get_price_tax(**values)
+            assert row['unit_tax'] == e.get_unit_price_tax(**values)
+            assert row['total'] == row['price'] + row['tax']
+            assert row['unit_total'] == row['unit_price'] + row['unit_tax']
+
+    assert off.get_entry_row(b)['price'] == Decimal('60.00')
+    assert off.get_entry_row(c)['unit_price'] == Decimal('8.10')
+    assert off.get_entry_row(BaseEntry()) is None
+
+    # the invoice form shows the unit price without the rounding of the offer
+    d = BaseEntry(quantity=1, price='10.40')
+    off = Offer(wage=60, entry_list=[d], round_price=True)
+    assert off.get_entry_row(d)['unit_price'] == Decimal('10.00')
+    assert off.get_entry_row(d, round_price=False)['unit_price'] == Decimal('10.40')
+
+
+def test_entry_columns(monkeypatch):
+    """Get the same totals and rows with the numpy columns as without."""
+    from offer import columns
+    if columns.numpy is None:
+        return
+
+    def make_offer():
+        entry_list = []
+        for i in range(40):
+            minutes = '0:{:02d}'.format(i)
+            entry_list.append(
+                BaseEntry(quantity=i % 7, time=minutes, price='1.{}5'.format(i), tax=19)
+            )
+            entry_list.append(
+                MultiplyEntry(quantity=minutes, hour_rate='1.5', wage_add=i % 3, tax=7)
+            )
+        # values with 28 digits do not fit the columns
+        entry_list.append(BaseEntry(quantity='1:20', price='19.99', time='0:45', tax=19))
+        entry_list.append(ConnectEntry(quantity=2, multiplicator='0.15', tax=19))
+        entry_list[-1].connect_entry(entry_list, entry_list[0].get_id())
+        entry_list[-1].connect_entry(entry_list, entry_list[-2].get_id())
+        return Offer(wage='62.50', entry_list=entry_list)
+
+    monkeypatch.setattr(columns, 'MIN_ENTRIES', 10 ** 9)
+    python = make_offer()
+    assert python.get_columns() is None
+
+    monkeypatch.setattr(columns, 'MIN_ENTRIES', 10)
+    vectorized = make_offer()
+    assert vectorized.get_columns() is not None
+
+    for round_price in [False, True]:
+        for tax in [False, True]:
+            values = {'round_price': round_price, 'tax': tax}
+            assert str(vectorized.get_price_total(**values)) == str(
+                python.get_price_total(**values)
+            )
+        rows_a = vectorized.evaluate_entries(round_price=round_price)
+        rows_b = python.evaluate_entries(round_price=round_price)
+        for a, b in zip(rows_a, rows_b):
+            assert str(a['price']) == str(b['price'])
+            assert str(a['tax']) == str(b['tax'])
+
+    assert vectorized.get_time_total().get() == python.get_time_total().get()
+
+
+def test_finish_date():
+    """Count the minimum days and the days for the time on work days only."""
+    project = Project(work_days=[0, 1, 2, 3, 4], hours_per_day=4, minimum_days=2)
+
+    # saturday 2024-01-06: first work day is monday, two minimum days,
+    # 10 hours are three more days, so it is finished on friday
+    off = Offer(date=date(2024, 1, 6), entry_list=[BaseEntry(quantity=10, time='1:00')])
+    assert off.get_finish_date(project=project) == date(2024, 1, 13)
+    assert off.get_finish_date_and_days(project=project) == (date(2024, 1, 13), 7)
+
+    # without time only the minimum days
+    off.set_entry_list([])
+    assert off.get_finish_date_and_days(project=project) == (date(2024, 1, 10), 4)
+
+    # 400 hours on mondays only: 51 mondays from 2024-01-08 on
+    project = Project(work_days=[0], hours_per_day=8, minimum_days=1)
+    off.set_entry_list([BaseEntry(quantity=400, time='1:00')])
+    assert off.get_finish_date(project=project) == date(2024, 12, 24)
+
+    assert Offer().get_finish_date() == date(1987, 10, 15)
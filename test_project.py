@@ -157,3 +157,10 @@ def test_project_copy():
 
     # both also should have one offer with the same title
     assert a.get_offer_list()[0].title == b.get_offer_list()[0].title
+
+    # the copy is independent, but has the same content
+    b.get_offer_list()[0].title = 'Offer B'
+    b.append_offer(Offer(title='Offer C'))
+    assert a.get_offer_list()[0].title == 'Offer A'
+    assert len(a.get_offer_list()) == 1
+    assert Project().from_json(js=a.to_json()).copy().to_json() == a.to_json()
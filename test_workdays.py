@@ -0,0 +1,98 @@
+"""Testing the working day calendar with holidays and vacations."""
+
+from clients.project import Project
+from datetime import date
+from offer import workdays
+from offer.entries import BaseEntry
+from offer.offerinvoice import Offer
+
+
+ICS = '\r\n'.join([
+    'BEGIN:VCALENDAR',
+    'VERSION:2.0',
+    'BEGIN:VEVENT',
+    'SUMMARY:Christmas',
+    'DTSTART;VALUE=DATE:20201224',
+    'DTEND;VALUE=DATE:20201227',
+    'RRULE:FREQ=YEARLY',
+    'END:VEVENT',
+    'BEGIN:VEVENT',
+    'SUMMARY:Vacation with a',
+    '  folded line',
+    'DTSTART;TZID=Europe/Berlin:20240715T090000',
+    'DTEND;TZID=Europe/Berlin:20240719T180000',
+    'END:VEVENT',
+    'END:VCALENDAR'
+])
+
+CSV = '\n'.join([
+    'date,end,title',
+    '2024-05-01,,Labour day',
+    '2024-08-05;2024-08-06;Vacation',
+    'broken row'
+])
+
+
+def test_holiday_files(tmpdir):
+    """Load the holidays of iCalendar and CSV files."""
+    ics = tmpdir.join('holidays.ics')
+    ics.write(ICS)
+    csv = tmpdir.join('vacation.csv')
+    csv.write(CSV)
+
+    dates, rules = workdays.load_holidays(str(ics))
+    assert rules == ((12, 24, 3, 2020, None),)
+    assert sorted(dates) == [date(2024, 7, d) for d in range(15, 20)]
+
+    dates, rules = workdays.load_holidays(str(csv))
+    assert sorted(dates) == [date(2024, 5, 1), date(2024, 8, 5), date(2024, 8, 6)]
+    assert rules == ()
+
+    assert workdays.load_holidays(str(tmpdir.join('missing.csv'))) == workdays.NO_HOLIDAYS
+
+    calendar = workdays.get_calendar([0, 1, 2, 3, 4], [str(ics), '', str(csv)])
+    assert calendar is workdays.get_calendar([4, 3, 2, 1, 0], [str(ics), str(csv)])
+    assert not calendar.is_work_day(date(2030, 12, 24))
+    assert not calendar.is_work_day(date(2024, 8, 6))
+    assert calendar.is_work_day(date(2024, 8, 7))
+    assert not calendar.is_work_day(date(2024, 8, 10))
+
+
+def test_work_calendar():
+    """Skip the holidays and use whole weeks after the last one."""
+    calendar = workdays.WorkCalendar(
+        [0, 1, 2, 3, 4],
+        [date(2024, 12, 31)],
+        [(12, 24, 3, 2020, None)]
+    )
+
+    # work days from monday 2024-12-23 on: 23rd, 27th, 30th, 2025-01-01, 2nd
+    assert calendar.add_work_days(date(2024, 12, 23), 2) == date(2024, 12, 28)
+    assert calendar.add_work_days(date(2024, 12, 23), 4) == date(2025, 1, 2)
+    assert calendar.add_work_days(date(2024, 12, 23), 5) == date(2025, 1, 3)
+    assert calendar.add_work_days(date(2024, 12, 24), 0) == date(2024, 12, 27)
+
+    # without holidays it is the same as add_work_days()
+    calendar = workdays.WorkCalendar([1, 3])
+    for count in range(20):
+        assert calendar.add_work_days(date(2024, 2, 2), count) == (
+            workdays.add_work_days(date(2024, 2, 2), count, [1, 3])
+        )
+
+    no_days = workdays.WorkCalendar([])
+    assert no_days.add_work_days(date(2024, 1, 1), 5) == date(2024, 1, 1)
+    assert calendar.add_work_days(date(9999, 12, 1), 100) == date.max
+
+
+def test_finish_date_holidays(tmpdir):
+    """Do not finish offers on holidays or in the vacation."""
+    csv = tmpdir.join('vacation.csv')
+    csv.write('2024-01-08,2024-01-12\n')
+
+    off = Offer(date=date(2024, 1, 5), entry_list=[BaseEntry(quantity=8, time='1:00')])
+    project = Project(work_days=[0, 1, 2, 3, 4], hours_per_day=4, minimum_days=1)
+    assert off.get_finish_date_and_days(project=project) == (date(2024, 1, 10), 5)
+
+    project.holiday_file = str(csv)
+    assert off.get_finish_date_and_days(project=project) == (date(2024, 1, 17), 12)
+    assert Project.from_json(js=project.to_json()).holiday_file == str(csv)